@@ -1,56 +1,646 @@
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+from collections import deque
 from tkinter import messagebox
 import customtkinter as ctk
+import argparse
 import datetime
-import shutil
 import json
+import time
 import os
 import sys
 
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("blue")
+from breadtasks_core import (
+    ChangeTracker,
+    Profiler,
+    QueryEngine,
+    SaveWorker,
+    SearchIndex,
+    Task,
+    TaskStats,
+    TaskStorage,
+    TaskStore,
+    __version__,
+    defaultDataPath,
+    History,
+    loadStore,
+    mergeRemoteRecords,
+    openStorage,
+)
 
-@dataclass
-class Task:
-    id: int
-    text: str
-    completed: bool = False
-    createdAt: Optional[str] = None
-    category: str = "Uncategorized"
-    lastModified: Optional[str] = None
-    
-    def __post_init__(self):
-        currentTime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-        if self.createdAt is None:
-            self.createdAt = currentTime
-        if self.lastModified is None:
-            self.lastModified = currentTime
+if TYPE_CHECKING:
+    from breadtasks_core import ExportFilter, Replica
+
+def installWidgetCounters(profiler: Profiler):
+    baseInit = ctk.CTkBaseClass.__init__
+    baseDestroy = ctk.CTkBaseClass.destroy
+    baseFontInit = ctk.CTkFont.__init__
+    
+    def countedFontInit(font, *args, **kwargs):
+        profiler.count("fontsCreated")
+        baseFontInit(font, *args, **kwargs)
+    
+    def countedInit(widget, *args, **kwargs):
+        profiler.count("widgetsCreated")
+        baseInit(widget, *args, **kwargs)
+    
+    def countedDestroy(widget):
+        profiler.count("widgetsDestroyed")
+        baseDestroy(widget)
+    
+    ctk.CTkBaseClass.__init__ = countedInit
+    ctk.CTkBaseClass.destroy = countedDestroy
+    ctk.CTkFont.__init__ = countedFontInit
+
+class LagMonitor:
+    INTERVAL_MS = 100
+    
+    def __init__(self, root, profiler: Profiler):
+        self.root = root
+        self.profiler = profiler
+        self.expected = 0.0
+    
+    def start(self):
+        self.expected = time.perf_counter() + self.INTERVAL_MS / 1000
+        self.root.after(self.INTERVAL_MS, self._tick)
+    
+    def _tick(self):
+        self.profiler.recordLag(time.perf_counter() - self.expected)
+        self.start()
+
+class DebugPanel(ctk.CTkToplevel):
+    REFRESH_MS = 1000
+    
+    def __init__(self, master, profiler: Profiler):
+        super().__init__(master)
+        self.title("BreadTasks Profiler")
+        self.geometry("860x520")
+        self.profiler = profiler
+        self.refreshJob = None
+        
+        self.textbox = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        self.textbox.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+        
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=10, pady=(0, 10))
+        ctk.CTkButton(buttons, text="Save JSON", width=110, command=self.saveJson).pack(side="left", padx=(0, 5))
+        ctk.CTkButton(
+            buttons,
+            text="Save pstats",
+            width=110,
+            command=self.saveStats,
+            state="normal" if profiler.cprofile is not None else "disabled"
+        ).pack(side="left", padx=5)
+        ctk.CTkButton(buttons, text="Reset", width=110, command=self.profiler.reset).pack(side="left", padx=5)
+        
+        self.refresh()
+    
+    def refresh(self):
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", self.profiler.formatReport())
+        self.textbox.configure(state="disabled")
+        self.refreshJob = self.after(self.REFRESH_MS, self.refresh)
+    
+    def saveJson(self):
+        from tkinter import filedialog
+        
+        filePath = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile="breadtasks_profile.json"
+        )
+        if filePath:
+            self.profiler.dumpJson(filePath)
+    
+    def saveStats(self):
+        from tkinter import filedialog
+        
+        filePath = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".pstats",
+            filetypes=[("pstats files", "*.pstats"), ("All files", "*.*")],
+            initialfile="breadtasks_profile.pstats"
+        )
+        if filePath:
+            self.profiler.dumpStats(filePath)
+    
+    def destroy(self):
+        if self.refreshJob is not None:
+            self.after_cancel(self.refreshJob)
+            self.refreshJob = None
+        super().destroy()
+
+class FontCache:
+    def __init__(self):
+        self.fonts: Dict[tuple, ctk.CTkFont] = {}
+    
+    def get(self, size: int, weight: str = "normal", family: Optional[str] = None) -> ctk.CTkFont:
+        key = (family, size, weight)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = ctk.CTkFont(family=family, size=size, weight=weight)
+        return font
+
+class TaskRow(ctk.CTkFrame):
+    def __init__(self, master, app, height: int):
+        super().__init__(master, fg_color="transparent", corner_radius=0, height=height)
+        self.app = app
+        self.task: Optional[Task] = None
+        self.index = -1
+        self.y = None
+        self.grid_propagate(False)
+        self.grid_columnconfigure(0, weight=1)
+        
+        colors = app.colors
+        self.completedVar = ctk.BooleanVar(value=False)
+        self.textFont = app.fonts.get(14, "bold")
+        self.completedTextFont = app.fonts.get(14)
+        
+        self.card = ctk.CTkFrame(
+            self,
+            fg_color=colors['secondary'],
+            corner_radius=10,
+            border_width=1,
+            border_color=colors['border']
+        )
+        self.card.grid(row=0, column=0, sticky="ew", pady=5)
+        self.card.grid_columnconfigure(1, weight=1)
+        self.selected = False
+        
+        checkboxFrame = ctk.CTkFrame(self.card, fg_color="transparent")
+        checkboxFrame.grid(row=0, column=0, padx=15, pady=15, sticky="n")
+        
+        self.checkbox = ctk.CTkCheckBox(
+            checkboxFrame,
+            text="",
+            width=24,
+            height=24,
+            command=lambda: self.app.toggleTask(self.task.id),
+            variable=self.completedVar
+        )
+        self.checkbox.pack()
+        
+        contentFrame = ctk.CTkFrame(self.card, fg_color="transparent")
+        contentFrame.grid(row=0, column=1, sticky="ew", padx=(0, 15), pady=15)
+        contentFrame.grid_columnconfigure(0, weight=1)
+        
+        self.taskText = ctk.CTkLabel(
+            contentFrame,
+            text="",
+            font=self.textFont,
+            text_color=colors['textPrimary'],
+            anchor="w",
+            wraplength=600
+        )
+        self.taskText.grid(row=0, column=0, sticky="w")
+        
+        metaFrame = ctk.CTkFrame(contentFrame, fg_color="transparent")
+        metaFrame.grid(row=1, column=0, sticky="w", pady=(10, 0))
+        
+        self.categoryBadge = ctk.CTkButton(
+            metaFrame,
+            text="",
+            width=80,
+            height=25,
+            font=app.fonts.get(11),
+            corner_radius=6,
+            command=lambda: self.app.changeTaskCategory(self.task)
+        )
+        
+        self.dateLabel = ctk.CTkLabel(
+            metaFrame,
+            text="",
+            font=app.fonts.get(11),
+            text_color=colors['textSecondary']
+        )
+        self.dateLabel.pack(side="left")
+        
+        for widget in (self.card, contentFrame, self.taskText, metaFrame, self.dateLabel):
+            widget.bind("<Button-1>", lambda e: self.app.onTaskClick(self.task, e))
+        
+        actionsFrame = ctk.CTkFrame(self.card, fg_color="transparent")
+        actionsFrame.grid(row=0, column=2, padx=15, pady=15, sticky="e")
+        
+        ctk.CTkButton(
+            actionsFrame,
+            text="✏️ Edit",
+            width=70,
+            height=30,
+            font=app.fonts.get(12),
+            fg_color=colors['accent'],
+            hover_color=colors['accentLight'],
+            corner_radius=6,
+            command=lambda: self.app.openEditTaskDialog(self.task)
+        ).pack(side="left", padx=(0, 5))
+        
+        ctk.CTkButton(
+            actionsFrame,
+            text="🗑️ Delete",
+            width=70,
+            height=30,
+            font=app.fonts.get(12),
+            fg_color=colors['danger'],
+            hover_color="#D32F2F",
+            corner_radius=6,
+            command=lambda: self.app.removeTask(self.task.id)
+        ).pack(side="left")
+    
+    def showTask(self, task: Task):
+        self.task = task
+        colors = self.app.colors
+        
+        self.card.configure(fg_color="#F1F8E9" if task.completed else colors['secondary'])
+        selected = task.id in self.app.selectedIds
+        if selected != self.selected:
+            self.card.configure(
+                border_width=2 if selected else 1,
+                border_color=colors['accent'] if selected else colors['border']
+            )
+            self.selected = selected
+        self.completedVar.set(task.completed)
+        self.taskText.configure(
+            text=task.text,
+            font=self.completedTextFont if task.completed else self.textFont,
+            text_color="#888888" if task.completed else colors['textPrimary']
+        )
+        
+        if task.category != "Uncategorized":
+            catColor = self.app.getCategoryColor(task.category)
+            self.categoryBadge.configure(text=task.category, fg_color=catColor, hover_color=catColor)
+            if not self.categoryBadge.winfo_manager():
+                self.categoryBadge.pack(side="left", padx=(0, 10), before=self.dateLabel)
+        elif self.categoryBadge.winfo_manager():
+            self.categoryBadge.pack_forget()
+        
+        self.dateLabel.configure(text=f"📅 {task.createdAt[:10] if task.createdAt else 'No date'}")
+
+class CategoryRow(ctk.CTkFrame):
+    def __init__(self, master, app):
+        super().__init__(master, fg_color="transparent", corner_radius=0)
+        self.app = app
+        self.category: Optional[str] = None
+        self.shown = None
+        
+        colors = app.colors
+        self.card = ctk.CTkFrame(self, corner_radius=8, border_width=1)
+        self.card.pack(fill="x", pady=2)
+        
+        contentFrame = ctk.CTkFrame(self.card, fg_color="transparent")
+        contentFrame.pack(fill="x", padx=15, pady=10)
+        
+        nameFrame = ctk.CTkFrame(contentFrame, fg_color="transparent")
+        nameFrame.pack(side="left", fill="x", expand=True)
+        
+        self.nameLabel = ctk.CTkLabel(
+            nameFrame,
+            text="",
+            font=app.fonts.get(13),
+            anchor="w",
+            cursor="hand2"
+        )
+        self.nameLabel.pack(side="left", fill="x", expand=True)
+        
+        self.countBadge = ctk.CTkLabel(
+            nameFrame,
+            text="",
+            font=app.fonts.get(10, "bold"),
+            text_color="#FFFFFF",
+            corner_radius=10,
+            width=25,
+            height=20
+        )
+        
+        for widget in (self.card, contentFrame, nameFrame, self.nameLabel, self.countBadge):
+            widget.bind("<Button-1>", lambda e: self.app.onCategoryClick(self.category))
+        for widget in (self.card, contentFrame, nameFrame):
+            widget.configure(cursor="hand2")
+        
+        self.buttonCard = ctk.CTkFrame(
+            self,
+            fg_color=colors['primary'],
+            corner_radius=5,
+            border_width=1,
+            border_color=colors['border']
+        )
+        
+        buttonContainer = ctk.CTkFrame(self.buttonCard, fg_color="transparent")
+        buttonContainer.pack(fill="x", padx=10, pady=8)
+        
+        ctk.CTkButton(
+            buttonContainer,
+            text="✏️ Edit",
+            width=80,
+            height=30,
+            font=app.fonts.get(12),
+            fg_color=colors['accent'],
+            hover_color=colors['accentLight'],
+            corner_radius=6,
+            command=lambda: self.app.openEditCategoryDialog(self.category)
+        ).pack(side="left", padx=(0, 10))
+        
+        self.deleteButton = ctk.CTkButton(
+            buttonContainer,
+            text="",
+            height=30,
+            corner_radius=6,
+            command=lambda: self.app.deleteCategory(self.category)
+        )
+        self.deleteButton.pack(side="left")
+    
+    def showCategory(self, category: str, color: str, isSelected: bool, count: int, showButtons: bool):
+        shown = (category, color, isSelected, count, showButtons)
+        if shown == self.shown:
+            return
+        self.shown = shown
+        self.category = category
+        colors = self.app.colors
+        fonts = self.app.fonts
+        
+        self.card.configure(
+            fg_color=color if isSelected else colors['primary'],
+            border_color=color if isSelected else colors['border']
+        )
+        self.nameLabel.configure(
+            text=f"📁 {category}" if category == "All" else f"📂 {category}",
+            font=fonts.get(13, "bold" if isSelected else "normal"),
+            text_color="#FFFFFF" if isSelected else "#333333"
+        )
+        self.countBadge.configure(text=str(count), fg_color=color if isSelected else "#666666")
+        if count > 0 and not self.countBadge.winfo_manager():
+            self.countBadge.pack(side="right", padx=(5, 0))
+        elif count == 0 and self.countBadge.winfo_manager():
+            self.countBadge.pack_forget()
+        
+        if showButtons:
+            if count == 0:
+                self.deleteButton.configure(text="🗑️ Delete", width=80, font=fonts.get(12), state="normal",
+                                            fg_color=colors['danger'], hover_color="#D32F2F")
+            else:
+                self.deleteButton.configure(text=f"🗑️ ({count} tasks)", width=100, font=fonts.get(11),
+                                            state="disabled", fg_color="#CCCCCC", hover_color="#CCCCCC")
+            if not self.buttonCard.winfo_manager():
+                self.buttonCard.pack(fill="x", padx=10, pady=(0, 2))
+        elif self.buttonCard.winfo_manager():
+            self.buttonCard.pack_forget()
+    
+    def updateCount(self, count: int):
+        category, color, isSelected, _, showButtons = self.shown
+        self.showCategory(category, color, isSelected, count, showButtons)
+
+class VirtualTaskList(ctk.CTkFrame):
+    ROW_HEIGHT = 120
+    OVERSCAN = 2
+    NEAR_END_ROWS = 20
+    
+    def __init__(self, master, rowFactory, taskLookup, orderKey, onNearEnd=None, scrollbar_button_color=None,
+                 scrollbar_button_hover_color=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.rowFactory = rowFactory
+        self.taskLookup = taskLookup
+        self.orderKey = orderKey
+        self.onNearEnd = onNearEnd
+        self.taskIds: List[int] = []
+        self.positions: Optional[Dict[int, int]] = None
+        self.descending = False
+        self.hasMore = False
+        self.nearEndJob = None
+        self.rows: List[TaskRow] = []
+        self.rowsById: Dict[int, TaskRow] = {}
+        self.offset = 0
+        
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.viewport.bind("<Configure>", lambda e: self.render())
+        
+        self.scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self._onScrollbar,
+            button_color=scrollbar_button_color,
+            button_hover_color=scrollbar_button_hover_color
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns", padx=(5, 0))
+        
+        toplevel = self.winfo_toplevel()
+        if sys.platform.startswith("linux"):
+            toplevel.bind_all("<Button-4>", self._onMouseWheel, add="+")
+            toplevel.bind_all("<Button-5>", self._onMouseWheel, add="+")
+        else:
+            toplevel.bind_all("<MouseWheel>", self._onMouseWheel, add="+")
+    
+    def setItems(self, taskIds: List[int], hasMore: bool = False, descending: bool = False):
+        self.taskIds = taskIds
+        self.positions = None
+        self.hasMore = hasMore
+        self.descending = descending
+        self.render(rebind=True)
+    
+    def appendItems(self, taskIds: List[int], hasMore: bool):
+        self.taskIds.extend(taskIds)
+        self.positions = None
+        self.hasMore = hasMore
+        self.render()
+    
+    def rowFor(self, taskId: int) -> Optional[TaskRow]:
+        return self.rowsById.get(taskId)
+    
+    def indexOf(self, taskId: int) -> int:
+        row = self.rowsById.get(taskId)
+        if row is not None:
+            return row.index
+        if self.positions is None:
+            self.positions = {itemId: index for index, itemId in enumerate(self.taskIds)}
+        return self.positions.get(taskId, -1)
+    
+    def _keyAt(self, index: int) -> tuple:
+        return self.orderKey(self.taskLookup(self.taskIds[index]))
+    
+    def _precedes(self, key: tuple, otherKey: tuple) -> bool:
+        return key > otherKey if self.descending else key < otherKey
+    
+    def refreshItem(self, task: Task):
+        index = self.indexOf(task.id)
+        if index < 0:
+            return
+        
+        key = self.orderKey(task)
+        before = index > 0 and self._precedes(key, self._keyAt(index - 1))
+        after = index + 1 < len(self.taskIds) and self._precedes(self._keyAt(index + 1), key)
+        if before or after:
+            del self.taskIds[index]
+            self.positions = None
+            self.insertItem(task)
+            return
+        
+        row = self.rowsById.get(task.id)
+        if row is not None:
+            row.showTask(task)
+    
+    def insertItem(self, task: Task):
+        key = self.orderKey(task)
+        if self.hasMore and (not self.taskIds or not self._precedes(key, self._keyAt(len(self.taskIds) - 1))):
+            self.render()
+            return
+        
+        low, high = 0, len(self.taskIds)
+        while low < high:
+            middle = (low + high) // 2
+            if self._precedes(self._keyAt(middle), key):
+                low = middle + 1
+            else:
+                high = middle
+        self.taskIds.insert(low, task.id)
+        self.positions = None
+        self.render()
+    
+    def removeItem(self, task: Task):
+        index = self.indexOf(task.id)
+        if index >= 0:
+            del self.taskIds[index]
+            self.positions = None
+            self.render()
+    
+    def scrollTo(self, offset: float):
+        offset = min(max(0, int(offset)), self._maxOffset())
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+    
+    def _viewportHeight(self) -> float:
+        return self._reverse_widget_scaling(self.viewport.winfo_height())
+    
+    def _maxOffset(self) -> int:
+        return max(0, int(len(self.taskIds) * self.ROW_HEIGHT - self._viewportHeight()))
+    
+    def render(self, rebind: bool = False):
+        height = self._viewportHeight()
+        totalHeight = len(self.taskIds) * self.ROW_HEIGHT
+        self.offset = min(max(0, self.offset), self._maxOffset())
+        
+        first = max(0, self.offset // self.ROW_HEIGHT - self.OVERSCAN)
+        last = min(len(self.taskIds), first + int(height // self.ROW_HEIGHT) + 2 + 2 * self.OVERSCAN)
+        
+        while len(self.rows) < last - first:
+            self.rows.append(self.rowFactory(self.viewport))
+        
+        self.rowsById = {}
+        for i, row in enumerate(self.rows):
+            index = first + i
+            if index < last:
+                task = self.taskLookup(self.taskIds[index])
+                if rebind or row.task is not task:
+                    row.showTask(task)
+                y = index * self.ROW_HEIGHT - self.offset
+                if row.y != y or not row.winfo_manager():
+                    row.place(x=0, y=y, relwidth=1.0)
+                    row.y = y
+                row.index = index
+                self.rowsById[task.id] = row
+            else:
+                row.index = -1
+                row.y = None
+                if row.winfo_manager():
+                    row.place_forget()
+        
+        if totalHeight > height:
+            self.scrollbar.set(self.offset / totalHeight, (self.offset + height) / totalHeight)
+        else:
+            self.scrollbar.set(0, 1)
+        
+        nearEnd = last >= len(self.taskIds) - self.NEAR_END_ROWS
+        if nearEnd and self.hasMore and self.onNearEnd is not None and self.nearEndJob is None:
+            self.nearEndJob = self.after_idle(self._nearEnd)
+    
+    def _nearEnd(self):
+        self.nearEndJob = None
+        if self.hasMore:
+            self.onNearEnd()
+    
+    def _onScrollbar(self, command, value, unit=None):
+        if command == "moveto":
+            self.scrollTo(float(value) * len(self.taskIds) * self.ROW_HEIGHT)
+        elif command == "scroll":
+            step = self._viewportHeight() if unit == "pages" else self.ROW_HEIGHT // 2
+            self.scrollTo(self.offset + int(value) * step)
+    
+    def _onMouseWheel(self, event):
+        if not str(event.widget).startswith(str(self.viewport)):
+            return
+        
+        if event.num == 4:
+            direction = -1
+        elif event.num == 5:
+            direction = 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        
+        self.scrollTo(self.offset + direction * self.ROW_HEIGHT // 2)
 
 class BreadTasks:
     APP_NAME = "BreadTasks"
-    VERSION = "1.0.0"
-    DEFAULT_FILE = "breadtasks_data.json"
+    VERSION = __version__
+    SEARCH_DEBOUNCE_MS = 150
+    MATERIALIZE_CHUNK = 2000
+    PAGE_SIZE = 200
+    REMOTE_REFRESH_LIMIT = 50
+    SORT_OPTIONS = {
+        "Order added": ("id", False),
+        "Newest added": ("id", True),
+        "Created: newest": ("created", True),
+        "Created: oldest": ("created", False),
+        "Modified: newest": ("modified", True),
+        "Modified: oldest": ("modified", False),
+        "Text: A to Z": ("text", False),
+        "Text: Z to A": ("text", True),
+        "Completed last": ("completed", False),
+        "Completed first": ("completed", True),
+        "Category: A to Z": ("category", False),
+        "Category: Z to A": ("category", True)
+    }
+    EXPORT_PUMP_MS = 10
+    EXPORT_FORMATS = {"JSON": ("json", ".json"), "NDJSON": ("ndjson", ".ndjson"), "CSV": ("csv", ".csv")}
+    IMPORT_PUMP_MS = 10
+    IMPORT_PREPARE_CHUNK = 50000
+    IMPORT_DEDUPE = {
+        "Keep all": "none",
+        "Skip same text and category": "text",
+        "Merge by id (newest wins)": "id"
+    }
+    PROFILED_METHODS = (
+        "displayTasks", "displayCategories", "createTaskWidget", "refreshTask", "updateCategoryCounts",
+        "updateStatistics", "loadData", "saveChanges", "toggleTask", "removeTask",
+        "changeTaskCategory", "deleteCategory", "clearCompleted", "exportTasks", "importTasks",
+        "bulkSetCompleted", "bulkMove", "bulkDelete", "loadNextPage", "changeSortOrder",
+        "pollSharedFile", "undo", "redo"
+    )
     
-    def __init__(self, root):
+    def __init__(self, root, profiler: Optional[Profiler] = None):
         self.root = root
         self.root.title(f"{self.APP_NAME} v{self.VERSION}")
         self.root.geometry("1200x800")
         self.root.minsize(1000, 600)
         
-        try:
-            self.root.iconbitmap(default=self._get_icon_path())
-        except:
-            pass
-        
         self.root.grid_rowconfigure(0, weight=1)
         self.root.grid_columnconfigure(1, weight=1)
         
-        self.tasks: List[Task] = []
-        self.categories: List[str] = ["All", "Uncategorized"]
-        self.nextId = 1
+        self.store = TaskStore()
         self.currentCategory = "Uncategorized"
         self.selectedCategoryForButtons = None
+        self.categoryRows: List[CategoryRow] = []
+        self.categoryRowsByName: Dict[str, CategoryRow] = {}
+        self.searchIndex = SearchIndex(self.store)
+        self.queryEngine = QueryEngine(self.store, self.searchIndex)
+        self.stats = TaskStats(self.store)
+        self.changeTracker = ChangeTracker(self.store)
+        self.history = History(self.store)
+        self.searchJob = None
+        self.selectedIds: Set[int] = set()
+        self.selectionAnchor: Optional[int] = None
+        self.storage = self.createStorage()
+        self.saveWorker = SaveWorker(self.storage)
         
         self.colors = {
             'primary': "#EDE9E3",
@@ -72,21 +662,73 @@ class BreadTasks:
             ]
         }
         
+        self.fonts = FontCache()
+        self.profiler = profiler or Profiler.fromSetting()
+        self.debugPanel = None
+        if self.profiler.enabled:
+            self.profiler.instrument(self, self.PROFILED_METHODS)
+            installWidgetCounters(self.profiler)
+            LagMonitor(self.root, self.profiler).start()
+            self.profiler.start()
+        
+        self.replica = None
+        self.startupMarks: Dict[str, float] = {}
+        self.startupReport = False
+        self.markStartup("start")
+        
         self.createSidebar()
         self.createMainContent()
-        
-        self.loadData()
+        self.startupControls = [self.newTaskButton, self.newCategoryButton, self.searchEntry, self.sortMenu,
+                                self.clearCompletedButton, self.importButton, self.exportButton]
+        self.setControlsState("disabled")
+        self.paintShell()
+        
+        self.startupSteps = deque([self.loadData, self.displayCategories, self.displayTasks, self.finishStartup,
+                                   self.installIcon])
+        self.root.after_idle(self.runStartupStep)
+    
+    def markStartup(self, name: str):
+        self.startupMarks[name] = time.time()
+        if self.profiler.enabled and name != "start":
+            self.profiler.record(f"startup:{name}", self.startupMarks[name] - self.startupMarks["start"])
+    
+    def paintShell(self):
+        self.root.update()
+        self.markStartup("firstPaint")
+    
+    def runStartupStep(self):
+        self.startupSteps.popleft()()
+        if self.startupSteps:
+            self.root.after_idle(self.runStartupStep)
+    
+    def setControlsState(self, state: str):
+        for control in self.startupControls:
+            control.configure(state=state)
+    
+    def finishStartup(self):
+        self.updateStatistics()
+        self.setControlsState("normal")
         self.bindShortcuts()
         self.bindEvents()
-        
-        self.updateStatistics()
+        self.replica = self.loadReplica()
+        self.root.after(self.storage.POLL_MS, self.pollSharedFile)
+        self.root.after_idle(self.materializeInBackground)
+        self.markStartup("interactive")
+        if self.startupReport:
+            print(json.dumps(self.startupMarks), flush=True)
+            self.root.after_idle(self.shutdown)
     
-    def _get_icon_path(self) -> Optional[str]:
-        filePath = os.path.join(os.getenv("LOCALAPPDATA") or "", "BreadTasks", "icon.ico")
-        if os.path.exists(filePath):
-            return filePath
-        else:
-            return None
+    def installIcon(self):
+        import shutil
+        
+        targetFile = os.path.join(os.getenv("LOCALAPPDATA") or "", "BreadTasks", "icon.ico")
+        try:
+            if not os.path.exists(targetFile):
+                basePath = getattr(sys, "_MEIPASS", "")
+                shutil.copy2(os.path.join(basePath or ".", "icon.ico"), targetFile)
+            self.root.iconbitmap(default=targetFile)
+        except:
+            pass
     
     def createSidebar(self):
         self.sidebar = ctk.CTkFrame(self.root, width=300, corner_radius=0)
@@ -99,34 +741,36 @@ class BreadTasks:
         ctk.CTkLabel(
             titleFrame,
             text="🍞 BreadTasks",
-            font=ctk.CTkFont(size=26, weight="bold"),
+            font=self.fonts.get(26, "bold"),
             text_color=self.colors['sidebarText']
         ).pack(anchor="w")
         
         buttonFrame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
         buttonFrame.pack(fill="x", padx=20, pady=(0, 20))
         
-        ctk.CTkButton(
+        self.newTaskButton = ctk.CTkButton(
             buttonFrame,
             text="➕ New Task",
             command=self.openAddTaskDialog,
             fg_color=self.colors['accent'],
             hover_color=self.colors['accentLight'],
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self.fonts.get(14, "bold"),
             height=40,
             corner_radius=8
-        ).pack(fill="x", pady=(0, 10))
+        )
+        self.newTaskButton.pack(fill="x", pady=(0, 10))
         
-        ctk.CTkButton(
+        self.newCategoryButton = ctk.CTkButton(
             buttonFrame,
             text="📁 New Category",
             command=self.openAddCategoryDialog,
             fg_color="#9575CD",
             hover_color="#B39DDB",
-            font=ctk.CTkFont(size=14),
+            font=self.fonts.get(14),
             height=40,
             corner_radius=8
-        ).pack(fill="x")
+        )
+        self.newCategoryButton.pack(fill="x")
         
         categoriesHeader = ctk.CTkFrame(self.sidebar, fg_color="transparent")
         categoriesHeader.pack(fill="x", padx=20, pady=(30, 10))
@@ -134,7 +778,7 @@ class BreadTasks:
         ctk.CTkLabel(
             categoriesHeader,
             text="CATEGORIES",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self.fonts.get(14, "bold"),
             text_color=self.colors['sidebarText']
         ).pack(side="left")
         
@@ -154,14 +798,14 @@ class BreadTasks:
         ctk.CTkLabel(
             statsFrame,
             text="STATISTICS",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self.fonts.get(14, "bold"),
             text_color=self.colors['sidebarText']
         ).pack(anchor="w", pady=(0, 15))
         
         self.totalLabel = ctk.CTkLabel(
             statsFrame,
             text="Total Tasks: 0",
-            font=ctk.CTkFont(size=12),
+            font=self.fonts.get(12),
             text_color=self.colors['sidebarText']
         )
         self.totalLabel.pack(anchor="w", pady=2)
@@ -169,7 +813,7 @@ class BreadTasks:
         self.completedLabel = ctk.CTkLabel(
             statsFrame,
             text="Completed: 0 (0%)",
-            font=ctk.CTkFont(size=12),
+            font=self.fonts.get(12),
             text_color=self.colors['sidebarText']
         )
         self.completedLabel.pack(anchor="w", pady=2)
@@ -177,7 +821,7 @@ class BreadTasks:
         self.categoryStatsLabel = ctk.CTkLabel(
             statsFrame,
             text="Current Category: Uncategorized",
-            font=ctk.CTkFont(size=12),
+            font=self.fonts.get(12),
             text_color=self.colors['sidebarText']
         )
         self.categoryStatsLabel.pack(anchor="w", pady=2)
@@ -188,7 +832,7 @@ class BreadTasks:
         ctk.CTkLabel(
             versionFrame,
             text=f"v{self.VERSION}",
-            font=ctk.CTkFont(size=10),
+            font=self.fonts.get(10),
             text_color="#7E8C9A"
         ).pack(side="right")
     
@@ -205,7 +849,7 @@ class BreadTasks:
         self.categoryTitle = ctk.CTkLabel(
             headerFrame,
             text="Uncategorized Tasks",
-            font=ctk.CTkFont(size=28, weight="bold"),
+            font=self.fonts.get(28, "bold"),
             text_color=self.colors['textPrimary']
         )
         self.categoryTitle.grid(row=0, column=0, sticky="w", pady=(0, 10))
@@ -221,341 +865,435 @@ class BreadTasks:
         searchFrame.grid_columnconfigure(0, weight=1)
         
         self.searchVar = ctk.StringVar()
-        self.searchVar.trace("w", lambda *args: self.displayTasks())
+        self.searchVar.trace("w", lambda *args: self.scheduleSearch())
         
         self.searchEntry = ctk.CTkEntry(
             searchFrame,
             textvariable=self.searchVar,
-            placeholder_text="🔍 Search tasks...",
+            placeholder_text="🔍 Search tasks, e.g. report cat:Work -done:yes",
             border_width=0,
             fg_color="transparent",
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             text_color=self.colors['textPrimary']
         )
         self.searchEntry.grid(row=0, column=0, sticky="ew", padx=15)
         
-        ctk.CTkButton(
+        self.sortMenu = ctk.CTkOptionMenu(
+            actionsFrame,
+            values=list(self.SORT_OPTIONS),
+            command=self.changeSortOrder,
+            fg_color=self.colors['secondary'],
+            button_color=self.colors['border'],
+            button_hover_color=self.colors['accentLight'],
+            text_color=self.colors['textPrimary'],
+            font=self.fonts.get(13),
+            height=40,
+            width=160,
+            corner_radius=8
+        )
+        self.sortMenu.grid(row=0, column=1, sticky="e", padx=(0, 10))
+        
+        self.clearCompletedButton = ctk.CTkButton(
             actionsFrame,
             text="🗑️ Clear Completed",
             command=self.clearCompleted,
             fg_color=self.colors['danger'],
             hover_color="#D32F2F",
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             height=40,
             width=140,
             corner_radius=8
-        ).grid(row=0, column=1, sticky="e", padx=(0, 10))
+        )
+        self.clearCompletedButton.grid(row=0, column=2, sticky="e", padx=(0, 10))
         
-        ctk.CTkButton(
+        self.importButton = ctk.CTkButton(
+            actionsFrame,
+            text="📥 Import",
+            command=self.importTasks,
+            fg_color=self.colors['accent'],
+            hover_color=self.colors['accentLight'],
+            font=self.fonts.get(13),
+            height=40,
+            width=100,
+            corner_radius=8
+        )
+        self.importButton.grid(row=0, column=3, sticky="e", padx=(10, 0))
+        
+        self.exportButton = ctk.CTkButton(
             actionsFrame,
             text="📤 Export",
             command=self.exportTasks,
             fg_color=self.colors['accent'],
             hover_color=self.colors['accentLight'],
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             height=40,
             width=100,
             corner_radius=8
-        ).grid(row=0, column=2, sticky="e", padx=(10, 0))
+        )
+        self.exportButton.grid(row=0, column=4, sticky="e", padx=(10, 0))
         
-        self.tasksFrame = ctk.CTkScrollableFrame(
+        self.tasksFrame = VirtualTaskList(
             self.mainContainer,
+            rowFactory=self.createTaskWidget,
+            taskLookup=self.store.get,
+            orderKey=self.store.sortKeyOf,
+            onNearEnd=self.loadNextPage,
             fg_color=self.colors['primary'],
             scrollbar_button_color=self.colors['border'],
             scrollbar_button_hover_color=self.colors['accent']
         )
         self.tasksFrame.grid(row=1, column=0, sticky="nsew")
-        self.tasksFrame.grid_columnconfigure(0, weight=1)
-    
-    def displayCategories(self):
-        for widget in self.categoriesContainer.winfo_children():
-            widget.destroy()
+        self.emptyFrame = None
         
-        rowIdx = 0
+        self.bulkBar = ctk.CTkFrame(self.mainContainer, fg_color=self.colors['secondary'], corner_radius=8)
+        self.bulkBar.grid(row=2, column=0, sticky="ew", pady=(10, 0))
+        self.bulkBar.grid_columnconfigure(0, weight=1)
         
-        for idx, category in enumerate(self.categories):
-            categoryColor = self.colors['categoryColors'][idx % len(self.colors['categoryColors'])]
+        self.selectionLabel = ctk.CTkLabel(
+            self.bulkBar,
+            text="",
+            font=self.fonts.get(13, "bold"),
+            text_color=self.colors['textPrimary']
+        )
+        self.selectionLabel.grid(row=0, column=0, sticky="w", padx=15, pady=8)
+        
+        bulkButtons = [
+            ("✔️ Complete", lambda: self.bulkSetCompleted(True), self.colors['success'], "#4CAF50"),
+            ("↩️ Reopen", lambda: self.bulkSetCompleted(False), self.colors['warning'], "#F57C00"),
+            ("🗑️ Delete", self.bulkDelete, self.colors['danger'], "#D32F2F"),
+            ("✖ Clear", self.clearSelection, self.colors['textSecondary'], self.colors['accentLight']),
+        ]
+        for column, (text, command, color, hoverColor) in enumerate(bulkButtons, start=1):
+            ctk.CTkButton(
+                self.bulkBar,
+                text=text,
+                command=command,
+                fg_color=color,
+                hover_color=hoverColor,
+                font=self.fonts.get(12),
+                height=32,
+                width=100,
+                corner_radius=6
+            ).grid(row=0, column=column + 1, padx=(0, 10), pady=8)
+        
+        self.moveMenu = ctk.CTkOptionMenu(
+            self.bulkBar,
+            values=["Uncategorized"],
+            command=self.bulkMove,
+            fg_color=self.colors['accent'],
+            button_color=self.colors['accent'],
+            button_hover_color=self.colors['accentLight'],
+            font=self.fonts.get(12),
+            height=32,
+            width=140
+        )
+        self.moveMenu.set("📁 Move to...")
+        self.moveMenu.grid(row=0, column=1, padx=(0, 10), pady=8)
+        self.bulkBar.grid_remove()
+    
+    def displayCategories(self):
+        categories = self.store.categories
+        while len(self.categoryRows) < len(categories):
+            self.categoryRows.append(CategoryRow(self.categoriesContainer, self))
+        
+        self.categoryRowsByName = {}
+        for idx, row in enumerate(self.categoryRows):
+            if idx >= len(categories):
+                if row.winfo_manager():
+                    row.grid_remove()
+                continue
             
+            category = categories[idx]
+            categoryColor = self.colors['categoryColors'][idx % len(self.colors['categoryColors'])]
             if category == "All":
                 categoryColor = "#7E8C9A"
             
-            isSelected = category == self.currentCategory
-            isShowingButtons = category == self.selectedCategoryForButtons
-            
-            categoryCard = ctk.CTkFrame(
-                self.categoriesContainer,
-                fg_color=categoryColor if isSelected else self.colors['primary'],
-                corner_radius=8,
-                border_width=1,
-                border_color=categoryColor if isSelected else self.colors['border']
-            )
-            categoryCard.grid(row=rowIdx, column=0, sticky="ew", pady=2)
-            categoryCard.grid_columnconfigure(0, weight=1)
-            rowIdx += 1
-            
-            contentFrame = ctk.CTkFrame(categoryCard, fg_color="transparent")
-            contentFrame.pack(fill="x", padx=15, pady=10)
-            
-            if category == "All":
-                count = len(self.tasks)
-                displayName = f"📁 {category}"
-            else:
-                count = sum(1 for task in self.tasks if task.category == category)
-                displayName = f"📂 {category}"
-            
-            nameFrame = ctk.CTkFrame(contentFrame, fg_color="transparent")
-            nameFrame.pack(side="left", fill="x", expand=True)
-            
-            def makeSelectFunc(cat):
-                def func(e=None):
-                    if self.selectedCategoryForButtons == cat:
-                        self.selectedCategoryForButtons = None
-                    else:
-                        self.selectedCategoryForButtons = cat
-                    self.selectCategory(cat)
-                return func
-            
-            selectFunc = makeSelectFunc(category)
-            
-            nameLabel = ctk.CTkLabel(
-                nameFrame,
-                text=displayName,
-                font=ctk.CTkFont(size=13, weight="bold" if isSelected else "normal"),
-                text_color="#FFFFFF" if isSelected else "#333333",
-                anchor="w",
-                cursor="hand2"
-            )
-            nameLabel.pack(side="left", fill="x", expand=True)
-            nameLabel.bind("<Button-1>", selectFunc)
-            
-            if count > 0:
-                countBadge = ctk.CTkLabel(
-                    nameFrame,
-                    text=str(count),
-                    font=ctk.CTkFont(size=10, weight="bold"),
-                    text_color="#FFFFFF",
-                    fg_color=categoryColor if isSelected else "#666666",
-                    corner_radius=10,
-                    width=25,
-                    height=20
-                )
-                countBadge.pack(side="right", padx=(5, 0))
-                countBadge.bind("<Button-1>", selectFunc)
-            
-            for widget in [categoryCard, contentFrame, nameFrame]:
-                widget.bind("<Button-1>", selectFunc)
-                widget.configure(cursor="hand2")
-            
-            if isShowingButtons and category not in ["All", "Uncategorized"]:
-                buttonCard = ctk.CTkFrame(
-                    self.categoriesContainer,
-                    fg_color=self.colors['primary'],
-                    corner_radius=5,
-                    border_width=1,
-                    border_color=self.colors['border']
-                )
-                buttonCard.grid(row=rowIdx, column=0, sticky="ew", pady=(0, 2), padx=10)
-                buttonCard.grid_columnconfigure(0, weight=1)
-                rowIdx += 1
-                
-                buttonContainer = ctk.CTkFrame(buttonCard, fg_color="transparent")
-                buttonContainer.pack(fill="x", padx=10, pady=8)
-                
-                editBtn = ctk.CTkButton(
-                    buttonContainer,
-                    text="✏️ Edit",
-                    width=80,
-                    height=30,
-                    font=ctk.CTkFont(size=12),
-                    fg_color=self.colors['accent'],
-                    hover_color=self.colors['accentLight'],
-                    corner_radius=6,
-                    command=lambda c=category: self.openEditCategoryDialog(c)
-                )
-                editBtn.pack(side="left", padx=(0, 10))
-                
-                if count == 0:
-                    deleteBtn = ctk.CTkButton(
-                        buttonContainer,
-                        text="🗑️ Delete",
-                        width=80,
-                        height=30,
-                        font=ctk.CTkFont(size=12),
-                        fg_color=self.colors['danger'],
-                        hover_color="#D32F2F",
-                        corner_radius=6,
-                        command=lambda c=category: self.deleteCategory(c)
-                    )
-                    deleteBtn.pack(side="left")
-                else:
-                    deleteBtn = ctk.CTkButton(
-                        buttonContainer,
-                        text=f"🗑️ ({count} tasks)",
-                        width=100,
-                        height=30,
-                        font=ctk.CTkFont(size=11),
-                        fg_color="#CCCCCC",
-                        hover_color="#CCCCCC",
-                        state="disabled",
-                        corner_radius=6
-                    )
-                    deleteBtn.pack(side="left")
+            showButtons = category == self.selectedCategoryForButtons and category not in ["All", "Uncategorized"]
+            row.showCategory(category, categoryColor, category == self.currentCategory,
+                             self.stats.count(category), showButtons)
+            if not row.winfo_manager():
+                row.grid(row=idx, column=0, sticky="ew")
+            self.categoryRowsByName[category] = row
+    
+    def onCategoryClick(self, category: str):
+        if self.selectedCategoryForButtons == category:
+            self.selectedCategoryForButtons = None
+        else:
+            self.selectedCategoryForButtons = category
+        self.selectCategory(category)
     
     def displayTasks(self):
-        for widget in self.tasksFrame.winfo_children():
-            widget.destroy()
-        
         if self.currentCategory == "All":
-            filteredTasks = self.tasks
             self.categoryTitle.configure(text="All Tasks")
         else:
-            filteredTasks = [t for t in self.tasks if t.category == self.currentCategory]
             self.categoryTitle.configure(text=f"{self.currentCategory} Tasks")
         
-        searchTerm = self.searchVar.get().lower()
+        searchTerm = self.searchVar.get().strip()
         if searchTerm:
-            filteredTasks = [t for t in filteredTasks if searchTerm in t.text.lower()]
+            taskIds = self.store.filterIds(self.currentCategory, self.queryEngine.search(searchTerm))
+            hasMore = False
+        else:
+            limit = self.PAGE_SIZE + self.tasksFrame.offset // VirtualTaskList.ROW_HEIGHT
+            taskIds = self.store.pageIds(self.currentCategory, None, limit)
+            hasMore = len(taskIds) == limit
+        
+        if self.selectedIds:
+            if hasMore:
+                self.selectedIds = {
+                    taskId for taskId in self.selectedIds if self.store.isInCategory(taskId, self.currentCategory)
+                }
+            else:
+                self.selectedIds.intersection_update(taskIds)
         
         self.updateStatistics()
-        
-        if not filteredTasks:
-            emptyFrame = ctk.CTkFrame(self.tasksFrame, fg_color="transparent")
-            emptyFrame.grid(row=0, column=0, pady=100)
-            
-            if searchTerm:
-                message = f"🔍 No tasks found for '{searchTerm}'"
-            else:
-                message = "📝 No tasks in this category"
-            
-            ctk.CTkLabel(
-                emptyFrame,
-                text=message,
-                font=ctk.CTkFont(size=24, weight="bold"),
-                text_color=self.colors['textSecondary']
-            ).pack()
-            
-            if not searchTerm and self.currentCategory != "All":
-                ctk.CTkButton(
-                    emptyFrame,
-                    text=f"➕ Add Task to {self.currentCategory}",
-                    command=self.openAddTaskDialog,
-                    fg_color=self.colors['accent'],
-                    hover_color=self.colors['accentLight'],
-                    font=ctk.CTkFont(size=14),
-                    height=40,
-                    corner_radius=8
-                ).pack(pady=20)
-            
+        self.tasksFrame.setItems(taskIds, hasMore, self.store.sortDescending)
+        self.updateBulkBar()
+        self.updateEmptyState()
+    
+    def changeSortOrder(self, label: str):
+        mode, descending = self.SORT_OPTIONS[label]
+        if (mode, descending) == (self.store.sortMode, self.store.sortDescending):
             return
-        
-        for idx, task in enumerate(filteredTasks):
-            frame = ctk.CTkFrame(self.tasksFrame, fg_color="transparent")
-            frame.grid(row=idx, column=0, sticky="ew", pady=5)
-            frame.grid_columnconfigure(0, weight=1)
-            
-            self.createTaskWidget(task, frame)
+        self.store.setSortOrder(mode, descending)
+        self.tasksFrame.offset = 0
+        self.displayTasks()
+        self.saveChanges(meta=True)
+    
+    def sortLabel(self) -> str:
+        current = (self.store.sortMode, self.store.sortDescending)
+        for label, order in self.SORT_OPTIONS.items():
+            if order == current:
+                return label
+        return "Order added"
     
-    def createTaskWidget(self, task: Task, parentFrame):
-        bgColor = self.colors['secondary']
-        if task.completed:
-            bgColor = "#F1F8E9"
+    def loadNextPage(self):
+        if self.searchVar.get():
+            return
         
-        taskCard = ctk.CTkFrame(
-            parentFrame,
-            fg_color=bgColor,
-            corner_radius=10,
-            border_width=1,
-            border_color=self.colors['border']
-        )
-        taskCard.grid(row=0, column=0, sticky="ew", pady=5)
-        taskCard.grid_columnconfigure(1, weight=1)
+        loadedIds = self.tasksFrame.taskIds
+        taskIds = self.store.pageIds(self.currentCategory, loadedIds[-1] if loadedIds else None, self.PAGE_SIZE)
+        self.tasksFrame.appendItems(taskIds, len(taskIds) == self.PAGE_SIZE)
+        if not self.tasksFrame.hasMore:
+            self.updateEmptyState()
+    
+    def onTaskClick(self, task: Task, event):
+        if task is None:
+            return
         
-        checkboxFrame = ctk.CTkFrame(taskCard, fg_color="transparent")
-        checkboxFrame.grid(row=0, column=0, padx=15, pady=15, sticky="n")
+        shift = event.state & 0x0001
+        control = event.state & (0x0008 if sys.platform == "darwin" else 0x0004)
+        anchorIndex = self.tasksFrame.indexOf(self.selectionAnchor) if self.selectionAnchor is not None else -1
         
-        checkbox = ctk.CTkCheckBox(
-            checkboxFrame,
-            text="",
-            width=24,
-            height=24,
-            command=lambda t=task: self.toggleTask(t.id),
-            variable=ctk.BooleanVar(value=task.completed)
-        )
-        checkbox.pack()
+        if shift and anchorIndex >= 0:
+            index = self.tasksFrame.indexOf(task.id)
+            low, high = sorted((anchorIndex, index))
+            rangeIds = self.tasksFrame.taskIds[low:high + 1]
+            if control:
+                self.selectedIds.update(rangeIds)
+            else:
+                self.selectedIds = set(rangeIds)
+        elif control:
+            if task.id in self.selectedIds:
+                self.selectedIds.discard(task.id)
+            else:
+                self.selectedIds.add(task.id)
+            self.selectionAnchor = task.id
+        else:
+            self.selectedIds = set() if self.selectedIds == {task.id} else {task.id}
+            self.selectionAnchor = task.id
         
-        contentFrame = ctk.CTkFrame(taskCard, fg_color="transparent")
-        contentFrame.grid(row=0, column=1, sticky="ew", padx=(0, 15), pady=15)
-        contentFrame.grid_columnconfigure(0, weight=1)
+        self.updateSelection()
+    
+    def typingInField(self) -> bool:
+        focused = self.root.focus_get()
+        return focused is not None and focused.winfo_class() in ("Entry", "Text")
+    
+    def selectAllVisible(self):
+        if self.typingInField():
+            return
+        if self.tasksFrame.hasMore:
+            self.selectedIds = set(self.store.idsInCategory(self.currentCategory))
+        else:
+            self.selectedIds = set(self.tasksFrame.taskIds)
+        self.updateSelection()
+    
+    def clearSelection(self):
+        self.selectedIds = set()
+        self.selectionAnchor = None
+        self.updateSelection()
+    
+    def deselect(self, taskId: int):
+        if taskId in self.selectedIds:
+            self.selectedIds.discard(taskId)
+            self.updateBulkBar()
+    
+    def updateSelection(self):
+        self.tasksFrame.render(rebind=True)
+        self.updateBulkBar()
+    
+    def updateBulkBar(self):
+        if not self.selectedIds:
+            if self.bulkBar.winfo_manager():
+                self.bulkBar.grid_remove()
+            return
         
-        taskText = ctk.CTkLabel(
-            contentFrame,
-            text=task.text,
-            font=ctk.CTkFont(size=14, weight="bold" if not task.completed else "normal"),
-            text_color=self.colors['textPrimary'] if not task.completed else "#888888",
-            anchor="w",
-            wraplength=600
-        )
-        taskText.grid(row=0, column=0, sticky="w")
+        self.selectionLabel.configure(text=f"{len(self.selectedIds)} selected")
+        self.moveMenu.configure(values=[cat for cat in self.store.categories if cat != "All"])
+        if not self.bulkBar.winfo_manager():
+            self.bulkBar.grid()
+    
+    def refreshView(self):
+        self.displayCategories()
+        self.displayTasks()
+    
+    def bulkSetCompleted(self, completed: bool):
+        changed = self.store.updateMany(sorted(self.selectedIds), completed=completed)
+        if changed:
+            self.refreshView()
+            self.saveChanges(changed=changed)
+    
+    def bulkMove(self, category: str):
+        self.moveMenu.set("📁 Move to...")
+        changed = self.store.updateMany(sorted(self.selectedIds), category=category)
+        if changed:
+            self.refreshView()
+            self.saveChanges(changed=changed)
+    
+    def bulkDelete(self):
+        count = len(self.selectedIds)
+        if not count or not messagebox.askyesno(
+            "Delete Tasks", f"Are you sure you want to delete {count} selected task(s)?"
+        ):
+            return
         
-        metaFrame = ctk.CTkFrame(contentFrame, fg_color="transparent")
-        metaFrame.grid(row=1, column=0, sticky="w", pady=(10, 0))
+        removed = self.store.removeMany(sorted(self.selectedIds))
+        self.selectedIds = set()
+        self.selectionAnchor = None
+        self.refreshView()
+        self.saveChanges(deleted=[task.id for task in removed])
+    
+    def undo(self):
+        if not self.typingInField():
+            self.applyHistory(self.history.undo())
+    
+    def redo(self):
+        if not self.typingInField():
+            self.applyHistory(self.history.redo())
+    
+    def applyHistory(self, result):
+        if result is None:
+            return
+        changed, removed, categoriesChanged = result
+        categoriesChanged = self.ensureCurrentCategory() or categoriesChanged
+        self.selectedIds.difference_update(task.id for task in removed)
+        if categoriesChanged or len(changed) + len(removed) > self.REMOTE_REFRESH_LIMIT:
+            self.refreshView()
+        else:
+            self.applyRemoteChanges(changed, removed)
+        self.saveChanges(changed=changed, deleted=[task.id for task in removed], meta=categoriesChanged)
+    
+    def ensureCurrentCategory(self) -> bool:
+        if self.currentCategory in self.store.categories:
+            return False
+        self.currentCategory = "All"
+        return True
+    
+    def scheduleSearch(self):
+        if self.searchJob is not None:
+            self.root.after_cancel(self.searchJob)
+        self.searchJob = self.root.after(self.SEARCH_DEBOUNCE_MS, self.runSearch)
+    
+    def runSearch(self):
+        self.searchJob = None
+        self.displayTasks()
+    
+    def updateEmptyState(self):
+        if self.tasksFrame.taskIds or self.tasksFrame.hasMore:
+            if self.emptyFrame is not None and self.emptyFrame.winfo_manager():
+                self.emptyFrame.place_forget()
+            return
         
-        if task.category != "Uncategorized":
-            catIndex = self.categories.index(task.category) if task.category in self.categories else 0
-            catColor = self.colors['categoryColors'][catIndex % len(self.colors['categoryColors'])]
-            
-            categoryBadge = ctk.CTkButton(
-                metaFrame,
-                text=task.category,
-                width=80,
-                height=25,
-                font=ctk.CTkFont(size=11),
-                fg_color=catColor,
-                hover_color=catColor,
-                corner_radius=6,
-                command=lambda t=task: self.changeTaskCategory(t)
+        if self.emptyFrame is None:
+            self.emptyFrame = ctk.CTkFrame(self.tasksFrame.viewport, fg_color="transparent")
+            self.emptyLabel = ctk.CTkLabel(
+                self.emptyFrame,
+                text="",
+                font=self.fonts.get(24, "bold"),
+                text_color=self.colors['textSecondary']
+            )
+            self.emptyLabel.pack()
+            self.emptyAddButton = ctk.CTkButton(
+                self.emptyFrame,
+                text="",
+                command=self.openAddTaskDialog,
+                fg_color=self.colors['accent'],
+                hover_color=self.colors['accentLight'],
+                font=self.fonts.get(14),
+                height=40,
+                corner_radius=8
             )
-            categoryBadge.pack(side="left", padx=(0, 10))
-        
-        ctk.CTkLabel(
-            metaFrame,
-            text=f"📅 {task.createdAt[:10] if task.createdAt else 'No date'}",
-            font=ctk.CTkFont(size=11),
-            text_color=self.colors['textSecondary']
-        ).pack(side="left")
         
-        actionsFrame = ctk.CTkFrame(taskCard, fg_color="transparent")
-        actionsFrame.grid(row=0, column=2, padx=15, pady=15, sticky="e")
+        searchTerm = self.searchVar.get().strip()
+        if searchTerm:
+            message = f"🔍 No tasks found for '{searchTerm}'"
+        else:
+            message = "📝 No tasks in this category"
+        self.emptyLabel.configure(text=message)
+        
+        if not searchTerm and self.currentCategory != "All":
+            self.emptyAddButton.configure(text=f"➕ Add Task to {self.currentCategory}")
+            if not self.emptyAddButton.winfo_manager():
+                self.emptyAddButton.pack(pady=20)
+        elif self.emptyAddButton.winfo_manager():
+            self.emptyAddButton.pack_forget()
+        
+        if not self.emptyFrame.winfo_manager():
+            self.emptyFrame.place(relx=0.5, y=100, anchor="n")
+    
+    def createTaskWidget(self, parentFrame) -> TaskRow:
+        return TaskRow(parentFrame, self, height=VirtualTaskList.ROW_HEIGHT)
+    
+    def matchesCurrentView(self, task: Task) -> bool:
+        if self.currentCategory != "All" and task.category != self.currentCategory:
+            return False
+        searchTerm = self.searchVar.get().strip()
+        return not searchTerm or self.queryEngine.matches(task, searchTerm)
+    
+    def refreshTask(self, task: Task):
+        isListed = self.tasksFrame.indexOf(task.id) >= 0
         
-        editBtn = ctk.CTkButton(
-            actionsFrame,
-            text="✏️ Edit",
-            width=70,
-            height=30,
-            font=ctk.CTkFont(size=12),
-            fg_color=self.colors['accent'],
-            hover_color=self.colors['accentLight'],
-            corner_radius=6,
-            command=lambda t=task: self.openEditTaskDialog(t)
-        )
-        editBtn.pack(side="left", padx=(0, 5))
+        if self.matchesCurrentView(task):
+            if isListed:
+                self.tasksFrame.refreshItem(task)
+            else:
+                self.tasksFrame.insertItem(task)
+        elif isListed:
+            self.tasksFrame.removeItem(task)
+            self.deselect(task.id)
         
-        deleteBtn = ctk.CTkButton(
-            actionsFrame,
-            text="🗑️ Delete",
-            width=70,
-            height=30,
-            font=ctk.CTkFont(size=12),
-            fg_color=self.colors['danger'],
-            hover_color="#D32F2F",
-            corner_radius=6,
-            command=lambda t=task: self.removeTask(t.id)
-        )
-        deleteBtn.pack(side="left")
+        self.updateEmptyState()
+    
+    def dropTask(self, task: Task):
+        self.tasksFrame.removeItem(task)
+        self.deselect(task.id)
+        self.updateEmptyState()
+    
+    def updateCategoryCounts(self, *categories: str):
+        for category in {"All", *categories}:
+            row = self.categoryRowsByName.get(category)
+            if row is None:
+                self.displayCategories()
+                return
+            row.updateCount(self.stats.count(category))
+    
+    def getCategoryColor(self, category: str) -> str:
+        categories = self.store.categories
+        catIndex = categories.index(category) if category in categories else 0
+        return self.colors['categoryColors'][catIndex % len(self.colors['categoryColors'])]
     
     def updateStatistics(self):
-        total = len(self.tasks)
-        completed = sum(1 for t in self.tasks if t.completed)
+        total = self.stats.count()
+        completed = self.stats.completedCount()
         percentage = (completed / total * 100) if total > 0 else 0
         
         self.totalLabel.configure(text=f"Total Tasks: {total}")
@@ -565,15 +1303,16 @@ class BreadTasks:
             catTotal = total
             catCompleted = completed
         else:
-            catTasks = [t for t in self.tasks if t.category == self.currentCategory]
-            catTotal = len(catTasks)
-            catCompleted = sum(1 for t in catTasks if t.completed)
+            catTotal = self.stats.count(self.currentCategory)
+            catCompleted = self.stats.completedCount(self.currentCategory)
         
         self.categoryStatsLabel.configure(
             text=f"Current Category: {self.currentCategory} ({catCompleted}/{catTotal} completed)"
         )
     
     def selectCategory(self, category: str):
+        if category != self.currentCategory:
+            self.tasksFrame.offset = 0
         self.currentCategory = category
         self.displayCategories()
         self.displayTasks()
@@ -584,7 +1323,7 @@ class BreadTasks:
         ctk.CTkLabel(
             dialog,
             text="Add New Task",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=self.fonts.get(20, "bold")
         ).pack(pady=(30, 20))
         
         taskEntry = ctk.CTkEntry(
@@ -592,7 +1331,7 @@ class BreadTasks:
             placeholder_text="Enter task description...",
             width=400,
             height=40,
-            font=ctk.CTkFont(size=14)
+            font=self.fonts.get(14)
         )
         taskEntry.pack(pady=10)
         taskEntry.focus()
@@ -603,7 +1342,7 @@ class BreadTasks:
         ctk.CTkLabel(
             categoryFrame,
             text="Category:",
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=self.fonts.get(14, "bold")
         ).pack(side="left", padx=(0, 10))
         
         defaultCategory = self.currentCategory if self.currentCategory != "All" else "Uncategorized"
@@ -611,10 +1350,10 @@ class BreadTasks:
         
         categoryDropdown = ctk.CTkComboBox(
             categoryFrame,
-            values=[c for c in self.categories if c != "All"],
+            values=[c for c in self.store.categories if c != "All"],
             variable=categoryVar,
             width=150,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             state="readonly"
         )
         categoryDropdown.pack(side="left")
@@ -625,17 +1364,16 @@ class BreadTasks:
                 messagebox.showwarning("Warning", "Task description cannot be empty!")
                 return
             
-            task = Task(
-                id=self.nextId, 
-                text=text, 
-                category=categoryVar.get()
-            )
-            self.tasks.append(task)
-            self.nextId += 1
+            try:
+                task = self.store.createTask(text, categoryVar.get())
+            except OSError as e:
+                messagebox.showerror("Sync Error", f"Failed to add the task: {str(e)}")
+                return
             
-            self.displayTasks()
-            self.displayCategories()
-            self.saveData()
+            self.refreshTask(task)
+            self.updateCategoryCounts(task.category)
+            self.updateStatistics()
+            self.saveChanges(changed=[task], meta=True)
             dialog.destroy()
         
         buttonFrame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -647,7 +1385,7 @@ class BreadTasks:
             command=dialog.destroy,
             width=100,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -659,7 +1397,7 @@ class BreadTasks:
             hover_color=self.colors['accentLight'],
             width=100,
             height=35,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.fonts.get(13, "bold"),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -671,7 +1409,7 @@ class BreadTasks:
         ctk.CTkLabel(
             dialog,
             text="Edit Task",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=self.fonts.get(20, "bold")
         ).pack(pady=(30, 20))
         
         taskEntry = ctk.CTkEntry(
@@ -679,7 +1417,7 @@ class BreadTasks:
             placeholder_text="Enter task description...",
             width=400,
             height=40,
-            font=ctk.CTkFont(size=14)
+            font=self.fonts.get(14)
         )
         taskEntry.pack(pady=10)
         taskEntry.insert(0, task.text)
@@ -691,17 +1429,17 @@ class BreadTasks:
         ctk.CTkLabel(
             categoryFrame,
             text="Category:",
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=self.fonts.get(14, "bold")
         ).pack(side="left", padx=(0, 10))
         
         categoryVar = ctk.StringVar(value=task.category)
         
         categoryDropdown = ctk.CTkComboBox(
             categoryFrame,
-            values=[c for c in self.categories if c != "All"],
+            values=[c for c in self.store.categories if c != "All"],
             variable=categoryVar,
             width=150,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             state="readonly"
         )
         categoryDropdown.pack(side="left")
@@ -712,16 +1450,14 @@ class BreadTasks:
                 messagebox.showwarning("Warning", "Task description cannot be empty!")
                 return
             
-            for t in self.tasks:
-                if t.id == task.id:
-                    t.text = text
-                    t.category = categoryVar.get()
-                    t.lastModified = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-                    break
+            oldCategory = task.category
+            self.store.update(task, text=text, category=categoryVar.get())
             
-            self.displayTasks()
-            self.displayCategories()
-            self.saveData()
+            self.refreshTask(task)
+            if task.category != oldCategory:
+                self.updateCategoryCounts(oldCategory, task.category)
+            self.updateStatistics()
+            self.saveChanges(changed=[task])
             dialog.destroy()
         
         buttonFrame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -733,7 +1469,7 @@ class BreadTasks:
             command=dialog.destroy,
             width=100,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -745,7 +1481,7 @@ class BreadTasks:
             hover_color="#388E3C",
             width=120,
             height=35,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.fonts.get(13, "bold"),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -757,7 +1493,7 @@ class BreadTasks:
         ctk.CTkLabel(
             dialog,
             text="Add New Category",
-            font=ctk.CTkFont(size=18, weight="bold")
+            font=self.fonts.get(18, "bold")
         ).pack(pady=(30, 20))
         
         categoryEntry = ctk.CTkEntry(
@@ -765,7 +1501,7 @@ class BreadTasks:
             placeholder_text="Enter category name...",
             width=300,
             height=40,
-            font=ctk.CTkFont(size=14)
+            font=self.fonts.get(14)
         )
         categoryEntry.pack(pady=10)
         categoryEntry.focus()
@@ -776,13 +1512,13 @@ class BreadTasks:
                 messagebox.showwarning("Warning", "Category name cannot be empty!")
                 return
             
-            if categoryName in self.categories:
+            if categoryName in self.store.categories:
                 messagebox.showwarning("Warning", "Category already exists!")
                 return
             
-            self.categories.append(categoryName)
+            self.store.addCategory(categoryName)
             self.displayCategories()
-            self.saveData()
+            self.saveChanges(meta=True)
             dialog.destroy()
         
         buttonFrame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -794,7 +1530,7 @@ class BreadTasks:
             command=dialog.destroy,
             width=100,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -806,7 +1542,7 @@ class BreadTasks:
             hover_color="#B39DDB",
             width=120,
             height=35,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.fonts.get(13, "bold"),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -820,7 +1556,7 @@ class BreadTasks:
         ctk.CTkLabel(
             dialog,
             text="Edit Category",
-            font=ctk.CTkFont(size=18, weight="bold")
+            font=self.fonts.get(18, "bold")
         ).pack(pady=(30, 20))
         
         categoryEntry = ctk.CTkEntry(
@@ -828,7 +1564,7 @@ class BreadTasks:
             placeholder_text="Enter new category name...",
             width=300,
             height=40,
-            font=ctk.CTkFont(size=14)
+            font=self.fonts.get(14)
         )
         categoryEntry.pack(pady=10)
         categoryEntry.insert(0, categoryName)
@@ -840,23 +1576,22 @@ class BreadTasks:
                 messagebox.showwarning("Warning", "Category name cannot be empty!")
                 return
             
-            if newName in self.categories and newName != categoryName:
+            if newName in self.store.categories and newName != categoryName:
                 messagebox.showwarning("Warning", "Category already exists!")
                 return
             
-            index = self.categories.index(categoryName)
-            self.categories[index] = newName
+            if newName == categoryName:
+                dialog.destroy()
+                return
             
-            for task in self.tasks:
-                if task.category == categoryName:
-                    task.category = newName
+            renamedTasks = self.store.renameCategory(categoryName, newName)
             
             if self.currentCategory == categoryName:
                 self.currentCategory = newName
             
             self.displayCategories()
             self.displayTasks()
-            self.saveData()
+            self.saveChanges(changed=renamedTasks, meta=True)
             dialog.destroy()
         
         buttonFrame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -868,7 +1603,7 @@ class BreadTasks:
             command=dialog.destroy,
             width=100,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -880,7 +1615,7 @@ class BreadTasks:
             hover_color="#B39DDB",
             width=120,
             height=35,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.fonts.get(13, "bold"),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -892,13 +1627,13 @@ class BreadTasks:
         ctk.CTkLabel(
             dialog,
             text="Move Task to Another Category",
-            font=ctk.CTkFont(size=18, weight="bold")
+            font=self.fonts.get(18, "bold")
         ).pack(pady=(30, 20))
         
         ctk.CTkLabel(
             dialog,
             text=f"Task: {task.text[:50]}{'...' if len(task.text) > 50 else ''}",
-            font=ctk.CTkFont(size=12),
+            font=self.fonts.get(12),
             text_color=self.colors['textSecondary']
         ).pack()
         
@@ -908,17 +1643,17 @@ class BreadTasks:
         ctk.CTkLabel(
             categoryFrame,
             text="New Category:",
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=self.fonts.get(14, "bold")
         ).pack(side="left", padx=(0, 10))
         
         categoryVar = ctk.StringVar(value=task.category)
         
         categoryDropdown = ctk.CTkComboBox(
             categoryFrame,
-            values=[c for c in self.categories if c != "All"],
+            values=[c for c in self.store.categories if c != "All"],
             variable=categoryVar,
             width=150,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             state="readonly"
         )
         categoryDropdown.pack(side="left")
@@ -929,11 +1664,12 @@ class BreadTasks:
                 dialog.destroy()
                 return
             
-            task.category = newCategory
-            task.lastModified = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-            self.displayTasks()
-            self.displayCategories()
-            self.saveData()
+            oldCategory = task.category
+            self.store.update(task, category=newCategory)
+            self.refreshTask(task)
+            self.updateCategoryCounts(oldCategory, newCategory)
+            self.updateStatistics()
+            self.saveChanges(changed=[task])
             dialog.destroy()
         
         buttonFrame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -945,7 +1681,7 @@ class BreadTasks:
             command=dialog.destroy,
             width=100,
             height=35,
-            font=ctk.CTkFont(size=13),
+            font=self.fonts.get(13),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -957,7 +1693,7 @@ class BreadTasks:
             hover_color=self.colors['accentLight'],
             width=100,
             height=35,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=self.fonts.get(13, "bold"),
             corner_radius=8
         ).pack(side="left", padx=10)
         
@@ -970,7 +1706,7 @@ class BreadTasks:
             messagebox.showwarning("Warning", "Cannot delete this category!")
             return
         
-        taskCount = sum(1 for task in self.tasks if task.category == categoryName)
+        taskCount = self.stats.count(categoryName)
         
         if taskCount > 0:
             response = messagebox.askyesno(
@@ -979,12 +1715,6 @@ class BreadTasks:
                 f"All tasks will be moved to 'Uncategorized'.\n"
                 f"Do you want to continue?"
             )
-            
-            if response:
-                for task in self.tasks:
-                    if task.category == categoryName:
-                        task.category = "Uncategorized"
-                        task.lastModified = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
         else:
             response = messagebox.askyesno(
                 "Delete Category",
@@ -992,36 +1722,37 @@ class BreadTasks:
             )
         
         if response:
-            self.categories.remove(categoryName)
+            movedTasks = self.store.removeCategory(categoryName)
             
             if self.currentCategory == categoryName:
                 self.currentCategory = "Uncategorized"
             
             self.displayCategories()
             self.displayTasks()
-            self.saveData()
+            self.saveChanges(changed=movedTasks, meta=True)
     
     def removeTask(self, taskId: int):
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this task?"):
-            self.tasks = [task for task in self.tasks if task.id != taskId]
-            self.displayTasks()
-            self.displayCategories()
-            self.saveData()
+            task = self.store.remove(taskId)
+            if task is None:
+                return
+            
+            self.dropTask(task)
+            self.updateCategoryCounts(task.category)
+            self.updateStatistics()
+            self.saveChanges(deleted=[taskId])
     
     def toggleTask(self, taskId: int):
-        for task in self.tasks:
-            if task.id == taskId:
-                task.completed = not task.completed
-                task.lastModified = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-                break
-        self.displayTasks()
-        self.saveData()
+        task = self.store.toggle(taskId)
+        if task is None:
+            return
+        
+        self.refreshTask(task)
+        self.updateStatistics()
+        self.saveChanges(changed=[task])
     
     def clearCompleted(self):
-        if self.currentCategory == "All":
-            tasksToClear = [t for t in self.tasks if t.completed]
-        else:
-            tasksToClear = [t for t in self.tasks if t.completed and t.category == self.currentCategory]
+        tasksToClear = self.store.completedTasks(self.currentCategory)
         
         if not tasksToClear:
             messagebox.showinfo("Info", "No completed tasks to clear!")
@@ -1032,117 +1763,410 @@ class BreadTasks:
             f"Are you sure you want to clear {len(tasksToClear)} completed task(s) "
             f"from '{self.currentCategory}'?"
         ):
-            self.tasks = [t for t in self.tasks if t not in tasksToClear]
+            self.store.removeMany(task.id for task in tasksToClear)
             self.displayTasks()
             self.displayCategories()
-            self.saveData()
+            self.saveChanges(deleted=[task.id for task in tasksToClear])
     
     def exportTasks(self):
-        try:
+        dialog = self._create_dialog("Export Tasks", 500, 420)
+        
+        ctk.CTkLabel(
+            dialog,
+            text="Export Tasks",
+            font=self.fonts.get(20, "bold")
+        ).pack(pady=(30, 20))
+        
+        optionsFrame = ctk.CTkFrame(dialog, fg_color="transparent")
+        optionsFrame.pack(pady=10)
+        
+        formatVar = ctk.StringVar(value="JSON")
+        categoryVar = ctk.StringVar(value="All")
+        statusVar = ctk.StringVar(value="All tasks")
+        compressVar = ctk.BooleanVar(value=False)
+        
+        fields = [
+            ("Format:", ctk.CTkComboBox(optionsFrame, values=list(self.EXPORT_FORMATS), variable=formatVar,
+                                        width=200, font=self.fonts.get(13), state="readonly")),
+            ("Category:", ctk.CTkComboBox(optionsFrame, values=self.store.categories, variable=categoryVar,
+                                          width=200, font=self.fonts.get(13), state="readonly")),
+            ("Tasks:", ctk.CTkComboBox(optionsFrame, values=["All tasks", "Open only", "Completed only"],
+                                       variable=statusVar, width=200, font=self.fonts.get(13),
+                                       state="readonly")),
+            ("Created from:", ctk.CTkEntry(optionsFrame, placeholder_text="YYYY-MM-DD", width=200)),
+            ("Created to:", ctk.CTkEntry(optionsFrame, placeholder_text="YYYY-MM-DD", width=200)),
+        ]
+        for row, (label, widget) in enumerate(fields):
+            ctk.CTkLabel(
+                optionsFrame,
+                text=label,
+                font=self.fonts.get(14, "bold")
+            ).grid(row=row, column=0, sticky="w", padx=(0, 10), pady=5)
+            widget.grid(row=row, column=1, sticky="w", pady=5)
+        
+        ctk.CTkCheckBox(
+            optionsFrame,
+            text="Compress (gzip)",
+            variable=compressVar,
+            font=self.fonts.get(13)
+        ).grid(row=len(fields), column=1, sticky="w", pady=5)
+        
+        def startFromDialog():
+            from breadtasks_core import ExportFilter
+            
+            try:
+                exportFilter = ExportFilter(
+                    categoryVar.get(),
+                    {"Open only": False, "Completed only": True}.get(statusVar.get()),
+                    fields[3][1].get().strip() or None,
+                    fields[4][1].get().strip() or None
+                )
+            except ValueError as e:
+                messagebox.showwarning("Warning", f"{e}!")
+                return
+            
+            fmt, extension = self.EXPORT_FORMATS[formatVar.get()]
+            if compressVar.get():
+                extension += ".gz"
+            
             from tkinter import filedialog
             
             filePath = filedialog.asksaveasfilename(
-                defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-                initialfile="breadtasks_export.json"
+                parent=dialog,
+                defaultextension=extension,
+                filetypes=[(f"{formatVar.get()} files", f"*{extension}"), ("All files", "*.*")],
+                initialfile=f"breadtasks_export{extension}"
             )
+            if filePath:
+                dialog.destroy()
+                self.startExport(filePath, fmt, compressVar.get(), exportFilter)
+        
+        buttonFrame = ctk.CTkFrame(dialog, fg_color="transparent")
+        buttonFrame.pack(pady=20)
+        
+        ctk.CTkButton(
+            buttonFrame,
+            text="Cancel",
+            command=dialog.destroy,
+            width=100,
+            height=35,
+            font=self.fonts.get(13),
+            corner_radius=8
+        ).pack(side="left", padx=10)
+        
+        ctk.CTkButton(
+            buttonFrame,
+            text="Export",
+            command=startFromDialog,
+            fg_color=self.colors['accent'],
+            hover_color=self.colors['accentLight'],
+            width=100,
+            height=35,
+            font=self.fonts.get(13, "bold"),
+            corner_radius=8
+        ).pack(side="left", padx=10)
+    
+    def startExport(self, filePath: str, fmt: str, compress: bool, exportFilter: "ExportFilter"):
+        from breadtasks_core import ExportCursor, ExportJob
+        
+        try:
+            job = ExportJob(filePath, fmt, compress, self.VERSION, self.store.categories)
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export tasks: {str(e)}")
+            return
+        
+        cursor = ExportCursor(self.store, exportFilter)
+        
+        progressWindow = ctk.CTkToplevel(self.root)
+        progressWindow.title("Exporting")
+        progressWindow.geometry("420x160")
+        progressWindow.resizable(False, False)
+        
+        statusLabel = ctk.CTkLabel(progressWindow, text=f"Exporting 0 of {cursor.total} tasks...",
+                                   font=self.fonts.get(14))
+        statusLabel.pack(pady=(25, 10))
+        progressBar = ctk.CTkProgressBar(progressWindow, width=360)
+        progressBar.set(0)
+        progressBar.pack(pady=5)
+        ctk.CTkButton(
+            progressWindow,
+            text="Cancel",
+            command=job.cancel,
+            width=100,
+            height=32,
+            font=self.fonts.get(13),
+            corner_radius=8
+        ).pack(pady=15)
+        progressWindow.protocol("WM_DELETE_WINDOW", job.cancel)
+        
+        pending = []
+        closed = []
+        
+        def pump():
+            if not job.cancelled and job.error is None:
+                while pending or not cursor.done():
+                    if not pending:
+                        pending.append(cursor.nextChunk())
+                    if not job.offer(pending[0]):
+                        break
+                    pending.pop()
+                
+                progressBar.set(cursor.position / cursor.total if cursor.total else 1)
+                statusLabel.configure(text=f"Exporting {cursor.position} of {cursor.total} tasks...")
+                if pending or not cursor.done():
+                    self.root.after(self.EXPORT_PUMP_MS, pump)
+                    return
+            
+            if not closed and job.offer(None):
+                closed.append(True)
+            if not closed or not job.finished.is_set():
+                self.root.after(self.EXPORT_PUMP_MS, pump)
+                return
             
+            progressWindow.destroy()
+            if job.error is not None:
+                messagebox.showerror("Export Error", f"Failed to export tasks: {str(job.error)}")
+            elif not job.cancelled:
+                messagebox.showinfo("Export Successful", f"{job.writer.count} task(s) exported to:\n{filePath}")
+        
+        pump()
+    
+    def importTasks(self):
+        dialog = self._create_dialog("Import Tasks", 460, 260)
+        
+        ctk.CTkLabel(
+            dialog,
+            text="Import Tasks",
+            font=self.fonts.get(20, "bold")
+        ).pack(pady=(30, 10))
+        
+        ctk.CTkLabel(
+            dialog,
+            text="JSON, NDJSON or CSV, optionally gzipped",
+            font=self.fonts.get(13),
+            text_color=self.colors['textSecondary']
+        ).pack(pady=(0, 10))
+        
+        optionsFrame = ctk.CTkFrame(dialog, fg_color="transparent")
+        optionsFrame.pack(pady=10)
+        
+        dedupeVar = ctk.StringVar(value="Keep all")
+        ctk.CTkLabel(
+            optionsFrame,
+            text="Duplicates:",
+            font=self.fonts.get(14, "bold")
+        ).grid(row=0, column=0, sticky="w", padx=(0, 10))
+        ctk.CTkComboBox(
+            optionsFrame,
+            values=list(self.IMPORT_DEDUPE),
+            variable=dedupeVar,
+            width=240,
+            font=self.fonts.get(13),
+            state="readonly"
+        ).grid(row=0, column=1, sticky="w")
+        
+        def chooseFile():
+            from tkinter import filedialog
+            
+            filePath = filedialog.askopenfilename(
+                parent=dialog,
+                filetypes=[
+                    ("Task files", "*.json *.ndjson *.jsonl *.csv *.gz"),
+                    ("All files", "*.*")
+                ]
+            )
             if filePath:
-                exportData = {
-                    'exportDate': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'appVersion': self.VERSION,
-                    'tasks': [asdict(task) for task in self.tasks],
-                    'categories': self.categories,
-                    'statistics': {
-                        'totalTasks': len(self.tasks),
-                        'completedTasks': sum(1 for t in self.tasks if t.completed),
-                        'categoriesCount': len([c for c in self.categories if c not in ["All", "Uncategorized"]])
-                    }
-                }
+                dialog.destroy()
+                self.startImport(filePath, self.IMPORT_DEDUPE[dedupeVar.get()])
+        
+        buttonFrame = ctk.CTkFrame(dialog, fg_color="transparent")
+        buttonFrame.pack(pady=20)
+        
+        ctk.CTkButton(
+            buttonFrame,
+            text="Cancel",
+            command=dialog.destroy,
+            width=100,
+            height=35,
+            font=self.fonts.get(13),
+            corner_radius=8
+        ).pack(side="left", padx=10)
+        
+        ctk.CTkButton(
+            buttonFrame,
+            text="Choose File...",
+            command=chooseFile,
+            fg_color=self.colors['accent'],
+            hover_color=self.colors['accentLight'],
+            width=120,
+            height=35,
+            font=self.fonts.get(13, "bold"),
+            corner_radius=8
+        ).pack(side="left", padx=10)
+    
+    def startImport(self, filePath: str, dedupe: str):
+        from breadtasks_core import ImportJob, ImportMerger
+        
+        try:
+            job = ImportJob(filePath)
+        except OSError as e:
+            messagebox.showerror("Import Error", f"Failed to import tasks: {str(e)}")
+            return
+        
+        merger = ImportMerger(self.store, dedupe)
+        
+        progressWindow = ctk.CTkToplevel(self.root)
+        progressWindow.title("Importing")
+        progressWindow.geometry("420x160")
+        progressWindow.resizable(False, False)
+        
+        statusLabel = ctk.CTkLabel(progressWindow, text=f"Reading {os.path.basename(filePath)}...",
+                                   font=self.fonts.get(14))
+        statusLabel.pack(pady=(25, 10))
+        progressBar = ctk.CTkProgressBar(progressWindow, width=360)
+        progressBar.set(0)
+        progressBar.pack(pady=5)
+        ctk.CTkButton(
+            progressWindow,
+            text="Cancel",
+            command=job.cancel,
+            width=100,
+            height=32,
+            font=self.fonts.get(13),
+            corner_radius=8
+        ).pack(pady=15)
+        progressWindow.protocol("WM_DELETE_WINDOW", job.cancel)
+        waiting = []
+        
+        def pump():
+            if not job.cancelled:
+                if merger.prepare(self.IMPORT_PREPARE_CHUNK):
+                    statusLabel.configure(text="Checking existing tasks for duplicates...")
+                    self.root.after(self.IMPORT_PUMP_MS, pump)
+                    return
                 
-                with open(filePath, 'w', encoding='utf-8') as f:
-                    json.dump(exportData, f, indent=2, ensure_ascii=False)
+                finished = job.finished.is_set()
+                chunk = waiting.pop() if waiting else job.poll()
+                if chunk is not None and not self.saveWorker.hasIds(len(chunk)):
+                    self.saveWorker.requestIds(len(chunk), self.store.nextId)
+                    waiting.append(chunk)
+                    self.root.after(self.IMPORT_PUMP_MS, pump)
+                    return
+                if chunk is not None:
+                    added, updated = merger.apply(chunk)
+                    self.saveChanges(changed=added + updated, meta=True)
+                    self.updateStatistics()
+                    progressBar.set(job.reader.progress)
+                    statusLabel.configure(text=f"Imported {merger.added} tasks...")
+                if chunk is not None or not finished:
+                    self.root.after(self.IMPORT_PUMP_MS, pump)
+                    return
                 
-                messagebox.showinfo("Export Successful", 
-                                  f"Tasks exported successfully to:\n{filePath}")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export tasks: {str(e)}")
+                if job.error is None:
+                    merger.registerCategories(job.reader.categories)
+                    self.saveChanges(meta=True)
+            
+            progressWindow.destroy()
+            self.refreshView()
+            summary = merger.summary(job.reader.invalid)
+            if job.cancelled:
+                messagebox.showinfo(
+                    "Import Cancelled",
+                    f"Import cancelled. {summary['added']} task(s) were already imported."
+                )
+            elif job.error is not None:
+                messagebox.showerror(
+                    "Import Error",
+                    f"Failed to import tasks: {str(job.error)}\n{summary['added']} task(s) were imported before the error."
+                )
+            else:
+                messagebox.showinfo(
+                    "Import Successful",
+                    f"Imported {summary['added']} task(s), updated {summary['updated']}.\n"
+                    f"Skipped {summary['skipped']} duplicate(s) and {summary['invalid']} invalid record(s)."
+                )
+        
+        pump()
     
     def get_data_path(self) -> str:
-        filePath = os.path.join(os.getenv("LOCALAPPDATA") or "", "BreadTasks", self.DEFAULT_FILE)
-        return filePath
+        return defaultDataPath()
     
-    def saveData(self):
-        try:
-            tasksData = []
-            for task in self.tasks:
-                taskDict = asdict(task)
-                tasksData.append(taskDict)
-            
-            data = {
-                'version': self.VERSION,
-                'lastSaved': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'tasks': tasksData,
-                'categories': self.categories,
-                'nextId': self.nextId,
-                'currentCategory': self.currentCategory
+    def createStorage(self) -> TaskStorage:
+        return openStorage(self.get_data_path())
+    
+    def saveChanges(self, changed: Iterable[Task] = (), deleted: Iterable[int] = (), meta: bool = False):
+        metaData = None
+        if meta:
+            metaData = {
+                'categories': list(self.store.categories),
+                'nextId': self.store.nextId,
+                'currentCategory': self.currentCategory,
+                'sortMode': self.store.sortMode,
+                'sortDescending': self.store.sortDescending
             }
-            
-            filePath = self.get_data_path()
-            with open(filePath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            pass
+        
+        self.saveWorker.submit(self.changeTracker.records(changed), deleted, metaData)
     
     def loadData(self):
         try:
-            filePath = self.get_data_path()
+            data = loadStore(self.storage, self.store)
             
-            if os.path.exists(filePath):
-                with open(filePath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                self.tasks = []
-                
-                for taskDict in data.get('tasks', []):
-                    if 'priority' in taskDict:
-                        taskDict.pop('priority')
-                    if 'category' not in taskDict:
-                        taskDict['category'] = "Uncategorized"
-                    if 'lastModified' not in taskDict:
-                        taskDict['lastModified'] = taskDict.get('createdAt')
-                    
-                    task = Task(**taskDict)
-                    self.tasks.append(task)
-                
-                self.categories = data.get('categories', ["All", "Uncategorized"])
-                
-                if "All" not in self.categories:
-                    self.categories.insert(0, "All")
-                if "Uncategorized" not in self.categories:
-                    self.categories.append("Uncategorized")
-                
-                self.nextId = data.get('nextId', len(self.tasks) + 1)
+            if data is not None:
                 self.currentCategory = data.get('currentCategory', "Uncategorized")
                 
-                seen = set()
-                self.categories = [cat for cat in self.categories if not (cat in seen or seen.add(cat))]
-                
             else:
                 self.createDefaultDataFile()
             
-            self.displayCategories()
-            self.displayTasks()
-            
-        except json.JSONDecodeError:
-            self.createDefaultDataFile()
-            self.displayCategories()
-            self.displayTasks()
-            
         except Exception as e:
-            self.createDefaultDataFile()
-            self.displayCategories()
-            self.displayTasks()
+            messagebox.showerror(
+                "Load Error",
+                f"Failed to load tasks: {str(e)}\nNothing was overwritten. Tasks appear once the data can be read again."
+            )
+        
+        self.store.idReserver = self.saveWorker.takeIds
+        self.saveWorker.requestIds(floor=self.store.nextId)
+        self.sortMenu.set(self.sortLabel())
+    
+    def loadReplica(self) -> "Replica":
+        from breadtasks_core import Replica, replicaPath
+        
+        try:
+            return Replica.load(self.store, self.get_data_path())
+        except (OSError, ValueError):
+            replica = Replica(self.store)
+            replica.path = replicaPath(self.get_data_path())
+            return replica
+    
+    def pollSharedFile(self):
+        try:
+            records, pending = self.saveWorker.pollChanges()
+        except (OSError, ValueError):
+            records = None
+        
+        if records:
+            with self.changeTracker.paused(), self.history.paused(), self.replica.paused():
+                changed, removed, categoriesChanged = mergeRemoteRecords(self.store, records, pending)
+            categoriesChanged = self.ensureCurrentCategory() or categoriesChanged
+            if categoriesChanged or len(changed) + len(removed) > self.REMOTE_REFRESH_LIMIT:
+                self.selectedIds.difference_update(task.id for task in removed)
+                self.refreshView()
+            elif changed or removed:
+                self.applyRemoteChanges(changed, removed)
+        
+        self.root.after(self.storage.POLL_MS, self.pollSharedFile)
+    
+    def applyRemoteChanges(self, changed: List[Task], removed: List[Task]):
+        for task in removed:
+            self.dropTask(task)
+        for task in changed:
+            if self.store.get(task.id) is task:
+                self.refreshTask(task)
+        self.updateCategoryCounts(*self.store.categories)
+        self.updateStatistics()
+    
+    def materializeInBackground(self):
+        if self.store.materializeSome(self.MATERIALIZE_CHUNK):
+            self.root.after_idle(self.materializeInBackground)
     
     def createDefaultDataFile(self):
         try:
@@ -1152,16 +2176,14 @@ class BreadTasks:
                 'tasks': [],
                 'categories': ["All", "Uncategorized"],
                 'nextId': 1,
-                'currentCategory': "Uncategorized"
+                'currentCategory': "Uncategorized",
+                'sortMode': "id",
+                'sortDescending': False
             }
             
-            filePath = self.get_data_path()
-            with open(filePath, 'w', encoding='utf-8') as f:
-                json.dump(defaultData, f, indent=2, ensure_ascii=False)
+            self.storage.saveAll(defaultData)
             
-            self.tasks = []
-            self.categories = ["All", "Uncategorized"]
-            self.nextId = 1
+            self.store.reset([], TaskStore.DEFAULT_CATEGORIES, 1)
             self.currentCategory = "Uncategorized"
             
         except Exception as e:
@@ -1186,39 +2208,90 @@ class BreadTasks:
         self.root.bind('<Delete>', lambda e: self.clearCompleted())
         self.root.bind('<Control-f>', lambda e: self.searchEntry.focus())
         self.root.bind('<Control-c>', lambda e: self.openAddCategoryDialog())
-        self.root.bind('<Escape>', lambda e: self.searchVar.set(""))
+        self.root.bind('<Escape>', lambda e: self.clearSelection() if self.selectedIds else self.searchVar.set(""))
+        self.root.bind('<Control-a>', lambda e: self.selectAllVisible())
         self.root.bind('<Control-e>', lambda e: self.exportTasks())
+        self.root.bind('<Control-i>', lambda e: self.importTasks())
+        self.root.bind('<Control-z>', lambda e: self.undo())
+        self.root.bind('<Control-y>', lambda e: self.redo())
+        self.root.bind('<Control-Z>', lambda e: self.redo())
+        if self.profiler.enabled:
+            self.root.bind('<F12>', lambda e: self.openDebugPanel())
+    
+    def openDebugPanel(self):
+        if self.debugPanel is not None and self.debugPanel.winfo_exists():
+            self.debugPanel.lift()
+            self.debugPanel.focus()
+            return
+        self.debugPanel = DebugPanel(self.root, self.profiler)
+    
+    def dumpProfile(self):
+        self.profiler.stop()
+        basePath = os.path.join(os.path.dirname(self.get_data_path()), "breadtasks_profile")
+        try:
+            self.profiler.dumpJson(basePath + ".json")
+            self.profiler.dumpStats(basePath + ".pstats")
+        except OSError:
+            pass
     
     def bindEvents(self):
         self.root.protocol("WM_DELETE_WINDOW", self.onClosing)
     
     def onClosing(self):
         if messagebox.askokcancel("Quit", "Do you want to quit BreadTasks?"):
-            self.saveData()
-            self.root.destroy()
+            self.shutdown()
             sys.exit(0)
+    
+    def shutdown(self):
+        self.saveChanges(meta=True)
+        unused = self.store.unusedIds()
+        if unused is not None:
+            self.saveWorker.returnIds(*unused)
+        self.saveWorker.close()
+        while self.saveWorker.hasPending():
+            if not messagebox.askretrycancel(
+                "Save Error",
+                f"Failed to save your last changes: {self.saveWorker.lastError}\nRetry, or quit without saving them?"
+            ):
+                break
+            try:
+                self.saveWorker.writePending()
+            except Exception as e:
+                self.saveWorker.lastError = e
+        self.storage.close()
+        if self.replica is not None:
+            try:
+                self.replica.save()
+            except OSError:
+                pass
+        if self.profiler.enabled:
+            self.dumpProfile()
+        self.root.destroy()
 
 def main():
-    targetDir = os.path.join(os.getenv("LOCALAPPDATA") or "", "BreadTasks")
-    os.makedirs(targetDir, exist_ok=True)
+    parser = argparse.ArgumentParser(prog="BreadTasks")
+    parser.add_argument("--profile", nargs="?", const="on", default=None,
+                        help="record timings (on) or timings plus cProfile (full); also BREADTASKS_PROFILE")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print the startup timings as JSON once the window is interactive, then quit")
+    args, _ = parser.parse_known_args()
 
-    basePath = getattr(sys, "_MEIPASS", "")
-    sourceFile = os.path.join(basePath, "icon.ico") if basePath else os.path.join(".", "icon.ico")
-    targetFile = os.path.join(targetDir, "icon.ico")
+    ctk.set_appearance_mode("dark")
+    ctk.set_default_color_theme("blue")
 
-    if not os.path.exists(targetFile):
-        shutil.copy2(sourceFile, targetFile)
+    targetDir = os.path.join(os.getenv("LOCALAPPDATA") or "", "BreadTasks")
+    os.makedirs(targetDir, exist_ok=True)
 
     root = ctk.CTk()
-    app = BreadTasks(root)
-
-    root.update_idletasks()
     width = 1200
     height = 800
     x = (root.winfo_screenwidth() // 2) - (width // 2)
     y = (root.winfo_screenheight() // 2) - (height // 2)
     root.geometry(f"{width}x{height}+{x}+{y}")
 
+    app = BreadTasks(root, profiler=Profiler.fromSetting(args.profile))
+    app.startupReport = args.startup_report
+
     root.mainloop()
 
 if __name__ == "__main__":
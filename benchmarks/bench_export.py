@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import ExportFilter, Task, TaskStore, exportToFile
+
+CATEGORIES = ["Work", "Home", "Errands", "Reading", "Uncategorized"]
+
+def inMemoryExport(filePath: str, store: TaskStore):
+    exportData = {
+        'appVersion': "1.0.0",
+        'tasks': [task.toDict() for task in store],
+        'categories': store.categories
+    }
+    with open(filePath, 'w', encoding='utf-8') as f:
+        json.dump(exportData, f, indent=2, ensure_ascii=False)
+
+def measure(export) -> tuple:
+    start = time.perf_counter()
+    export()
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    export()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory and time of in-memory vs streaming export")
+    parser.add_argument("--tasks", type=int, default=1000000)
+    args = parser.parse_args()
+    
+    store = TaskStore()
+    store.reset(
+        [Task(id=i, text=f"task number {i}", completed=i % 3 == 0, category=CATEGORIES[i % len(CATEGORIES)],
+              createdAt="2026-03-14 09:30") for i in range(1, args.tasks + 1)],
+        TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        args.tasks + 1
+    )
+    
+    with tempfile.TemporaryDirectory() as tempDir:
+        cases = [
+            ("in-memory json.dump", lambda: inMemoryExport(os.path.join(tempDir, "old.json"), store)),
+            ("streaming json", lambda: exportToFile(os.path.join(tempDir, "new.json"), store, "1.0.0")),
+            ("streaming ndjson", lambda: exportToFile(os.path.join(tempDir, "new.ndjson"), store, "1.0.0")),
+            ("streaming csv", lambda: exportToFile(os.path.join(tempDir, "new.csv"), store, "1.0.0")),
+            ("streaming json.gz", lambda: exportToFile(os.path.join(tempDir, "new.json.gz"), store, "1.0.0")),
+            ("streaming, Work + done", lambda: exportToFile(os.path.join(tempDir, "work.json"), store, "1.0.0",
+                                                            ExportFilter("Work", True))),
+        ]
+        
+        print(f"tasks: {args.tasks}")
+        for name, export in cases:
+            elapsed, peak = measure(export)
+            print(f"  {name:<24} {elapsed * 1000:9.1f} ms   peak {peak / 1e6:8.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import History, Task, TaskStore
+from tests.helpers import CATEGORIES
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of undoing and redoing a large clear")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    store = TaskStore()
+    store.reset(
+        [Task(id=i, text=f"task {i}", category=rng.choice(CATEGORIES), completed=i % 10 == 0)
+         for i in range(1, args.tasks + 1)],
+        TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        args.tasks + 1
+    )
+    history = History(store)
+    commits = []
+    store.subscribe(lambda event, task, changes: commits.append(event) if event == "commit" else None)
+    
+    completed = store.completedTasks("All")
+    start = time.perf_counter()
+    store.removeMany(task.id for task in completed)
+    clearTime = time.perf_counter() - start
+    
+    del commits[:]
+    start = time.perf_counter()
+    restored, _, _ = history.undo()
+    undoTime = time.perf_counter() - start
+    undoCommits = len(commits)
+    
+    start = time.perf_counter()
+    history.redo()
+    redoTime = time.perf_counter() - start
+    
+    print(f"tasks: {args.tasks}, cleared: {len(completed)}, history holds {history.size} inverse operation(s)")
+    print(f"clear: {clearTime * 1000:.1f} ms, undo: {undoTime * 1000:.1f} ms "
+          f"({len(restored)} task(s) restored in {undoCommits} batch), redo: {redoTime * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import ImportMerger, ImportReader, Task, TaskStore, exportToFile, importFromFile
+
+CATEGORIES = ["Work", "Home", "Errands", "Reading", "Uncategorized"]
+
+def inMemoryRead(filePath: str):
+    with open(filePath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return len(data['tasks'])
+
+def streamingRead(filePath: str):
+    reader = ImportReader(filePath)
+    count = 0
+    while True:
+        chunk = reader.nextChunk()
+        if chunk is None:
+            break
+        count += len(chunk)
+    reader.close()
+    return count
+
+def measure(read) -> tuple:
+    start = time.perf_counter()
+    read()
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    read()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def batchLatencies(filePath: str, dedupe: str) -> list:
+    store = TaskStore()
+    store.reset([Task(id=i, text=f"task number {i}") for i in range(1, 1001)], TaskStore.DEFAULT_CATEGORIES, 1001)
+    merger = ImportMerger(store, dedupe)
+    reader = ImportReader(filePath)
+    latencies = []
+    while True:
+        chunk = reader.nextChunk()
+        if chunk is None:
+            break
+        start = time.perf_counter()
+        merger.apply(chunk)
+        latencies.append(time.perf_counter() - start)
+    reader.close()
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of reading an import, and main-thread time per batch")
+    parser.add_argument("--tasks", type=int, default=300000)
+    args = parser.parse_args()
+    
+    source = TaskStore()
+    source.reset(
+        [Task(id=i, text=f"task number {i}", completed=i % 3 == 0, category=CATEGORIES[i % len(CATEGORIES)],
+              createdAt="2026-03-14 09:30") for i in range(1, args.tasks + 1)],
+        TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        args.tasks + 1
+    )
+    
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePaths = {}
+        for extension in ("json", "ndjson", "csv", "json.gz"):
+            filePaths[extension] = os.path.join(tempDir, f"tasks.{extension}")
+            exportToFile(filePaths[extension], source, "1.0.0")
+        del source
+        
+        print(f"tasks: {args.tasks}")
+        cases = [("json.load whole file", lambda: inMemoryRead(filePaths["json"]))]
+        cases += [(f"streaming {extension}", lambda path=path: streamingRead(path)) for extension, path in filePaths.items()]
+        for name, read in cases:
+            elapsed, peak = measure(read)
+            print(f"  read {name:<22} {elapsed * 1000:9.1f} ms   peak {peak / 1e6:8.1f} MB")
+        
+        start = time.perf_counter()
+        importFromFile(filePaths["json"], TaskStore())
+        print(f"  importFromFile json          {(time.perf_counter() - start) * 1000:9.1f} ms")
+        
+        for dedupe in ("none", "text", "id"):
+            latencies = batchLatencies(filePaths["json"], dedupe)
+            print(f"  apply batch, dedupe={dedupe:<5}    mean {sum(latencies) / len(latencies) * 1000:6.2f} ms"
+                  f"   max {max(latencies) * 1000:6.2f} ms   ({ImportReader.CHUNK_SIZE} tasks per batch)")
+
+if __name__ == "__main__":
+    main()
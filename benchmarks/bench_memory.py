@@ -0,0 +1,71 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import Task, TaskColumns
+
+CATEGORIES = ["Work", "Home", "Errands", "Reading", "Uncategorized"]
+
+@dataclass
+class LegacyTask:
+    id: int
+    text: str
+    completed: bool = False
+    createdAt: Optional[str] = None
+    category: str = "Uncategorized"
+    lastModified: Optional[str] = None
+
+def generateRawTasks(count: int, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    return json.dumps([
+        {
+            'id': i,
+            'text': f"task number {i}",
+            'completed': rng.random() < 0.3,
+            'createdAt': f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 09:30",
+            'category': rng.choice(CATEGORIES),
+            'lastModified': f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 17:45"
+        }
+        for i in range(1, count + 1)
+    ])
+
+def measure(build, rawJson: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    taskDicts = json.loads(rawJson)
+    result = build(taskDicts)
+    del taskDicts
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = len(result)
+    del result
+    return retained / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per task for each task representation")
+    parser.add_argument("--sizes", default="100000,1000000")
+    args = parser.parse_args()
+    
+    representations = [
+        ("dataclass (legacy)", lambda dicts: [LegacyTask(**d) for d in dicts]),
+        ("slotted Task", lambda dicts: [Task(**d) for d in dicts]),
+        ("TaskColumns", lambda dicts: TaskColumns.fromTasks(Task(**d) for d in dicts)),
+    ]
+    
+    for size in (int(value) for value in args.sizes.split(",")):
+        rawJson = generateRawTasks(size)
+        print(f"{size} tasks")
+        for name, build in representations:
+            print(f"  {name:<20} {measure(build, rawJson):8.1f} bytes/task")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.helpers import buildBoard, fork, mutate
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of merging offline edits as a delta against the full state")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--edits", type=int, default=100, help="offline edits merged into the large board")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    base = buildBoard(random.Random(args.seed), args.tasks)
+    mutate(base.store, rng, 0, "base ")
+    laptop = fork(base, "laptop")
+    for step in range(args.edits):
+        mutate(laptop.store, rng, step, "laptop ", bulkOps=False)
+    
+    start = time.perf_counter()
+    delta = laptop.delta(base.seen)
+    deltaTime = time.perf_counter() - start
+    start = time.perf_counter()
+    changed, removed, _ = base.merge(delta)
+    mergeTime = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    fullDelta = laptop.delta()
+    fullDeltaTime = time.perf_counter() - start
+    start = time.perf_counter()
+    fork(base, "check").merge(fullDelta)
+    fullMergeTime = time.perf_counter() - start
+    
+    print(f"tasks: {args.tasks}, offline edits: {args.edits}")
+    print(f"delta since last merge: {len(delta['tasks']) + len(delta['deleted'])} task(s), "
+          f"{deltaTime * 1000:.2f} ms to build, {mergeTime * 1000:.2f} ms to merge "
+          f"({len(changed)} changed, {len(removed)} removed)")
+    print(f"full state: {len(fullDelta['tasks'])} task(s), {fullDeltaTime * 1000:.0f} ms to build, "
+          f"{fullMergeTime * 1000:.0f} ms to merge")
+
+if __name__ == "__main__":
+    main()
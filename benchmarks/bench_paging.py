@@ -0,0 +1,52 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import Task, TaskStore
+
+CATEGORIES = ["Work", "Home"]
+PAGE_SIZE = 200
+
+def buildStore(size: int, seed: int = 5) -> TaskStore:
+    rng = random.Random(seed)
+    store = TaskStore()
+    store.reset(
+        [Task(id=i, text="task", category=rng.choice(CATEGORIES), createdAt="2026-03-14 09:30")
+         for i in range(1, size + 1)],
+        TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        size + 1
+    )
+    for taskId in rng.sample(range(1, size + 1), size // 10):
+        store.update(store.get(taskId), category=rng.choice(CATEGORIES))
+    return store
+
+def best(func, repeats: int = 5) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Task ids needed for the first screen after switching category")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    args = parser.parse_args()
+    
+    for size in (int(value) for value in args.sizes.split(",")):
+        store = buildStore(size)
+        category = CATEGORIES[0]
+        sortAll = best(lambda: sorted(store.categoryIds[category]))
+        firstPage = best(lambda: store.pageIds(category, None, PAGE_SIZE))
+        allPages = best(lambda: store.idsInCategory(category))
+        print(f"{size} tasks ({store.count(category)} in {category})")
+        print(f"  sort whole category        {sortAll * 1000:9.3f} ms")
+        print(f"  first page of {PAGE_SIZE}          {firstPage * 1000:9.3f} ms")
+        print(f"  ordered index, all ids     {allPages * 1000:9.3f} ms")
+
+if __name__ == "__main__":
+    main()
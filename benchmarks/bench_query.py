@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import QueryEngine, Task, TaskStore, parseQuery
+
+CATEGORIES = [f"Category {i:02d}" for i in range(1, 41)]
+WORDS = [
+    "review", "quarterly", "report", "email", "client", "invoice", "fix", "bug",
+    "deploy", "server", "groceries", "bread", "call", "dentist", "plan", "trip",
+    "update", "docs", "meeting", "notes", "budget", "design", "draft", "proposal"
+]
+QUERIES = [
+    'report',
+    'cat:"Category 07" -done:yes',
+    'cat:"Category 07" created:>2026-06-01 report',
+    'done:no modified:<2026-03-01 (invoice OR budget)',
+    '"quarterly report" -cat:"Category 01"',
+    'created:2026-05-14 OR created:2026-05-15',
+]
+
+def randomStamp(rng: random.Random) -> str:
+    return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+
+def buildStore(size: int, seed: int = 11) -> TaskStore:
+    rng = random.Random(seed)
+    store = TaskStore()
+    store.reset(
+        [Task(id=i, text=" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))),
+              category=rng.choice(CATEGORIES), completed=rng.random() < 0.3,
+              createdAt=randomStamp(rng), lastModified=randomStamp(rng))
+         for i in range(1, size + 1)],
+        TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        size + 1
+    )
+    return store
+
+def main():
+    parser = argparse.ArgumentParser(description="Planned queries vs scanning every task")
+    parser.add_argument("--tasks", type=int, default=100000)
+    args = parser.parse_args()
+    
+    store = buildStore(args.tasks)
+    engine = QueryEngine(store)
+    for query in QUERIES:
+        engine.search(query)
+        engine.search("x")
+    
+    print(f"tasks: {args.tasks}")
+    for query in QUERIES:
+        plan = parseQuery(query)
+        
+        start = time.perf_counter()
+        expected = {task.id for task in store if plan.matches(task)}
+        scanTime = time.perf_counter() - start
+        
+        store.toggle(1)
+        start = time.perf_counter()
+        results = engine.search(query)
+        planTime = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        engine.search(query)
+        cachedTime = time.perf_counter() - start
+        
+        expected = {task.id for task in store if plan.matches(task)}
+        assert results == expected, query
+        print(f"  {query}")
+        print(f"    {len(results):7d} hits   scan {scanTime * 1000:8.2f} ms"
+              f"   plan {planTime * 1000:8.2f} ms   cached {cachedTime * 1e6:7.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import JsonStorage, SaveWorker, Task, TaskStore
+
+def makeStore(count: int) -> TaskStore:
+    store = TaskStore()
+    store.reset([Task(id=i, text=f"task {i}") for i in range(1, count + 1)], TaskStore.DEFAULT_CATEGORIES, 1)
+    return store
+
+def clickThrough(store: TaskStore, save, clicks: int, interval: float):
+    latencies = []
+    for taskId in range(1, clicks + 1):
+        task = store.toggle(taskId)
+        start = time.perf_counter()
+        save(task)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(interval)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapid checkbox toggling: synchronous saves vs the save worker")
+    parser.add_argument("--clicks", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tempDir:
+        storage = JsonStorage(os.path.join(tempDir, "sync.json"))
+        store = makeStore(args.clicks)
+        syncLatencies = clickThrough(
+            store, lambda task: storage.applyChanges([task.toDict()], [], None), args.clicks, args.interval
+        )
+        
+        storage = JsonStorage(os.path.join(tempDir, "worker.json"))
+        storage.saveAll({'tasks': [], 'categories': TaskStore.DEFAULT_CATEGORIES, 'nextId': 1})
+        worker = SaveWorker(storage)
+        store = makeStore(args.clicks)
+        workerLatencies = clickThrough(store, lambda task: worker.submit([task.toDict()]), args.clicks, args.interval)
+        worker.close()
+        
+        saved = JsonStorage(storage.snapshotPath).load()
+        assert len(saved['tasks']) == args.clicks
+        assert all(taskDict['completed'] for taskDict in saved['tasks'])
+    
+    print(f"{args.clicks} toggles, {args.interval * 1000:.0f} ms apart")
+    print(f"  synchronous: {args.clicks} writes, UI thread mean {statistics.mean(syncLatencies) * 1000:.2f} ms, "
+          f"max {max(syncLatencies) * 1000:.2f} ms")
+    print(f"  save worker: {worker.writes} writes, UI thread mean {statistics.mean(workerLatencies) * 1000:.3f} ms, "
+          f"max {max(workerLatencies) * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
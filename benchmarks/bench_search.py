@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import SearchIndex, Task, TaskStore
+
+WORDS = [
+    "review", "quarterly", "report", "email", "client", "invoice", "fix", "bug",
+    "deploy", "server", "groceries", "bread", "call", "dentist", "plan", "trip",
+    "update", "docs", "meeting", "notes", "budget", "design", "draft", "proposal"
+]
+
+def generateTasks(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [
+        Task(id=i, text=" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))))
+        for i in range(1, count + 1)
+    ]
+
+def linearSearch(tasks, query: str):
+    return [t for t in tasks if query in t.text.lower()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-keystroke search latency")
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--query", default="quarterly report")
+    args = parser.parse_args()
+    
+    tasks = generateTasks(args.tasks)
+    store = TaskStore()
+    index = SearchIndex(store)
+    
+    start = time.perf_counter()
+    store.reset(tasks, TaskStore.DEFAULT_CATEGORIES, 1)
+    index.search(args.query[:SearchIndex.GRAM_SIZE])
+    buildTime = time.perf_counter() - start
+    
+    lookups = []
+    indexed = []
+    linear = []
+    for length in range(1, len(args.query) + 1):
+        prefix = args.query[:length]
+        
+        start = time.perf_counter()
+        matches = index.search(prefix)
+        lookups.append(time.perf_counter() - start)
+        store.filterIds("All", matches)
+        indexed.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        expected = linearSearch(tasks, prefix)
+        linear.append(time.perf_counter() - start)
+        
+        assert len(expected) == len(matches), prefix
+    
+    print(f"tasks: {args.tasks}, keystrokes: {len(args.query)}")
+    print(f"index build (texts + grams): {buildTime * 1000:.1f} ms")
+    print(f"index lookup per keystroke: mean {statistics.mean(lookups) * 1000:.2f} ms, max {max(lookups) * 1000:.2f} ms")
+    print(f"indexed + filter per keystroke: mean {statistics.mean(indexed) * 1000:.2f} ms, max {max(indexed) * 1000:.2f} ms")
+    print(f"linear scan per keystroke: mean {statistics.mean(linear) * 1000:.2f} ms, max {max(linear) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import SORT_MODES, Task, TaskStore
+from breadtasks_core.store import sortKey
+
+CATEGORIES = ["Work", "Home"]
+WORDS = ["review", "report", "email", "invoice", "deploy", "bread", "dentist", "budget", "draft"]
+PAGE_SIZE = 200
+EDITS = 200
+
+def randomStamp(rng: random.Random) -> str:
+    return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+
+def buildStore(size: int, seed: int = 9) -> TaskStore:
+    rng = random.Random(seed)
+    store = TaskStore()
+    store.reset(
+        [Task(id=i, text=" ".join(rng.choice(WORDS) for _ in range(3)), category=rng.choice(CATEGORIES),
+              completed=rng.random() < 0.3, createdAt=randomStamp(rng), lastModified=randomStamp(rng))
+         for i in range(1, size + 1)],
+        TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        size + 1
+    )
+    return store
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintained sorted index vs re-sorting a category after each edit")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--modes", default="created,modified,text")
+    args = parser.parse_args()
+    
+    for size in (int(value) for value in args.sizes.split(",")):
+        store = buildStore(size)
+        category = CATEGORIES[0]
+        print(f"{size} tasks ({store.count(category)} in {category})")
+        for mode in args.modes.split(","):
+            if mode not in SORT_MODES:
+                parser.error(f"unknown sort mode: {mode}")
+            store.setSortOrder(mode)
+            rng = random.Random(size)
+            
+            start = time.perf_counter()
+            store.pageIds(category, None, PAGE_SIZE)
+            buildTime = time.perf_counter() - start
+            
+            taskIds = rng.sample(range(1, size + 1), EDITS)
+            start = time.perf_counter()
+            for taskId in taskIds:
+                task = store.get(taskId)
+                store.update(task, text=task.text + " x", category=category)
+                store.pageIds(category, None, PAGE_SIZE)
+            maintained = (time.perf_counter() - start) / EDITS
+            
+            tasksById = store.tasksById
+            start = time.perf_counter()
+            for _ in range(5):
+                sorted(store.categoryIds[category], key=lambda taskId: sortKey(mode, tasksById[taskId]))[:PAGE_SIZE]
+            resort = (time.perf_counter() - start) / 5
+            
+            print(f"  {mode:<10} index build {buildTime * 1000:9.2f} ms"
+                  f"   edit + first page {maintained * 1000:8.3f} ms"
+                  f"   re-sort per edit {resort * 1000:9.2f} ms")
+
+if __name__ == "__main__":
+    main()
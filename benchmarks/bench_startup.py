@@ -0,0 +1,45 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_widgets import hasDisplay, writeData
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "BreadTasks.py")
+
+def launch(workDir: str) -> dict:
+    env = dict(os.environ, LOCALAPPDATA=workDir)
+    launchedAt = time.time()
+    result = subprocess.run([sys.executable, APP_PATH, "--startup-report"], cwd=os.path.dirname(APP_PATH),
+                            env=env, capture_output=True, text=True, timeout=600)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode or not lines:
+        raise RuntimeError(f"BreadTasks exited with {result.returncode}: {result.stderr.strip()}")
+    marks = json.loads(lines[-1])
+    return {name: marks[name] - launchedAt for name in ("start", "firstPaint", "interactive")}
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first paint and time to interactive of the app")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    
+    if not hasDisplay():
+        print("bench_startup needs a display (set DISPLAY, e.g. under Xvfb)")
+        return
+    
+    print(f"{'tasks':>8}  {'app start':>9}  {'first paint':>11}  {'interactive':>11}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as workDir:
+            writeData(os.path.join(workDir, "BreadTasks", "breadtasks_data.json"), size)
+            launch(workDir)
+            runs = [launch(workDir) for _ in range(args.repeats)]
+        median = {name: statistics.median(run[name] for run in runs) * 1000 for name in runs[0]}
+        print(f"{size:>8}  {median['start']:>7.0f}ms  {median['firstPaint']:>9.0f}ms  {median['interactive']:>9.0f}ms")
+
+if __name__ == "__main__":
+    main()
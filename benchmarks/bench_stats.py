@@ -0,0 +1,49 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import TaskStats, TaskStore
+from tests.helpers import CATEGORIES, buildStore
+
+def bruteForceStatistics(store: TaskStore, category: str):
+    total = len(store)
+    completed = sum(1 for t in store if t.completed)
+    catTotal = sum(1 for t in store if t.category == category)
+    catCompleted = sum(1 for t in store if t.category == category and t.completed)
+    return total, completed, catTotal, catCompleted
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintained statistics vs brute-force recount")
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    store = buildStore(random.Random(args.seed), args.tasks)
+    stats = TaskStats(store)
+    
+    start = time.perf_counter()
+    for category in CATEGORIES:
+        bruteForceStatistics(store, category)
+    bruteTime = (time.perf_counter() - start) / len(CATEGORIES)
+    
+    start = time.perf_counter()
+    for category in CATEGORIES:
+        (stats.count(), stats.completedCount(), stats.count(category), stats.completedCount(category))
+    statsTime = (time.perf_counter() - start) / len(CATEGORIES)
+    
+    start = time.perf_counter()
+    for taskId in range(1, 1001):
+        store.toggle(taskId)
+    toggleTime = (time.perf_counter() - start) / 1000
+    
+    print(f"tasks: {args.tasks}")
+    print(f"updateStatistics recount: {bruteTime * 1000:.2f} ms")
+    print(f"updateStatistics maintained: {statsTime * 1e6:.2f} us")
+    print(f"toggle incl. aggregate upkeep: {toggleTime * 1e6:.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import SyncServer, Task, TaskStore, currentStamp, formatTimestamp, mergeRemoteRecords, parseJson
+from breadtasks_core.sync import encodeMessage
+from tests.helpers import CATEGORIES, stateOf
+
+def runServer(tasks: int, seed: int, channel, stop):
+    rng = random.Random(seed)
+    store = TaskStore()
+    store.reset(
+        [Task(id=i, text=f"task {i}", category=rng.choice(CATEGORIES)) for i in range(1, tasks + 1)],
+        TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        tasks + 1
+    )
+    server = SyncServer(store)
+    
+    async def serve():
+        channel.put(await server.start("127.0.0.1", 0))
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+        channel.put({'batches': server.batches, 'dropped': server.dropped})
+        await server.stop()
+    
+    asyncio.run(serve())
+
+class SimulatedClient:
+    def __init__(self, index: int, seed: int, tasks: int, checked: bool):
+        self.index = index
+        self.rng = random.Random(seed * 1000 + index)
+        self.tasks = tasks
+        self.store = TaskStore() if checked else None
+        self.category = f"Client {index}"
+        self.ownIds = []
+        self.clientId = None
+        self.seq = 0
+        self.nextRef = 1
+        self.sentAt = {}
+        self.waiting = {}
+        self.latencies = []
+        self.delivered = 0
+        self.lastAck = 0
+        self.caughtUp = asyncio.Event()
+        self.target = None
+    
+    async def connect(self, address):
+        self.reader, self.writer = await asyncio.open_connection(*address, limit=1 << 24)
+        self.writer.write(encodeMessage({'op': "hello", 'since': None}))
+        welcome = parseJson(await self.reader.readline())
+        self.clientId = welcome['client']
+        self.seq = welcome['seq']
+        if self.store is not None:
+            data = welcome['data']
+            self.store.loadRaw(data['tasks'], data['categories'], data['nextId'])
+    
+    async def receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            message = parseJson(line)
+            if message['op'] == "batch":
+                self.delivered += 1
+                self.seq = message['records'][-1]['seq']
+                if self.store is not None:
+                    mergeRemoteRecords(self.store, message['records'])
+                if message['client'] == self.clientId:
+                    self.latencies.append(time.perf_counter() - self.sentAt.pop(message['ref']))
+                    self.lastAck = self.seq
+            elif message['ref'] in self.waiting:
+                self.waiting.pop(message['ref']).set_result(message)
+            if self.target is not None and self.seq >= self.target:
+                self.caughtUp.set()
+    
+    def _send(self, message: dict) -> int:
+        ref = self.nextRef
+        self.nextRef += 1
+        message['ref'] = ref
+        self.writer.write(encodeMessage(message))
+        return ref
+    
+    async def reserve(self) -> int:
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[self._send({'op': "reserve", 'count': 1, 'floor': 1})] = future
+        return (await future)['start']
+    
+    def sendBatch(self, records: list):
+        ref = self._send({'op': "batch", 'records': records})
+        self.sentAt[ref] = time.perf_counter()
+    
+    async def nextRecords(self, step: int) -> list:
+        rng = self.rng
+        stamp = formatTimestamp(currentStamp())
+        taskId = rng.randint(1, self.tasks)
+        action = rng.random()
+        if action < 0.3:
+            return [{'op': "patch", 'id': taskId, 'fields': {'completed': rng.random() < 0.5, 'lastModified': stamp}}]
+        if action < 0.5:
+            return [{'op': "patch", 'id': taskId, 'fields': {'text': f"edited by {self.index} at {step}", 'lastModified': stamp}}]
+        if action < 0.65:
+            return [{'op': "patch", 'id': taskId, 'fields': {'category': rng.choice(CATEGORIES), 'lastModified': stamp}}]
+        if action < 0.75:
+            return [{'op': "del", 'ids': [taskId]}]
+        if action < 0.9 or not self.ownIds:
+            newId = await self.reserve()
+            self.ownIds.append(newId)
+            return [{'op': "put", 'task': {'id': newId, 'text': f"added by {self.index}", 'completed': False,
+                                           'createdAt': stamp, 'category': self.category, 'lastModified': stamp}}]
+        self.category = f"Client {self.index} renamed at {step}"
+        return [{'op': "patch", 'id': ownId, 'fields': {'category': self.category}} for ownId in self.ownIds]
+    
+    async def run(self, ops: int, intervalMs: float):
+        for step in range(ops):
+            await asyncio.sleep(self.rng.expovariate(1000 / intervalMs))
+            self.sendBatch(await self.nextRecords(step))
+            await self.writer.drain()
+    
+    def close(self):
+        self.writer.close()
+
+async def fetchState(address) -> tuple:
+    reader, writer = await asyncio.open_connection(*address, limit=1 << 24)
+    writer.write(encodeMessage({'op': "hello", 'since': None}))
+    welcome = parseJson(await reader.readline())
+    writer.close()
+    data = welcome['data']
+    store = TaskStore()
+    store.loadRaw(data['tasks'], data['categories'], data['nextId'])
+    return welcome['seq'], stateOf(store)
+
+async def drive(address, args, indexes, barrier) -> dict:
+    loop = asyncio.get_running_loop()
+    clients = [SimulatedClient(index, args.seed, args.tasks, index < args.checked) for index in indexes]
+    await asyncio.gather(*(client.connect(address) for client in clients))
+    receivers = [asyncio.create_task(client.receive()) for client in clients]
+    await loop.run_in_executor(None, barrier.wait)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client.run(args.ops, args.interval_ms) for client in clients))
+    while any(client.sentAt for client in clients):
+        await asyncio.sleep(0.01)
+    await loop.run_in_executor(None, barrier.wait)
+    finalSeq, serverState = await fetchState(address)
+    for client in clients:
+        client.target = finalSeq
+        if client.seq >= finalSeq:
+            client.caughtUp.set()
+    await asyncio.wait_for(asyncio.gather(*(client.caughtUp.wait() for client in clients)), 60)
+    elapsed = time.perf_counter() - start
+    
+    diverged = [client.index for client in clients if client.store is not None and stateOf(client.store) != serverState]
+    for client in clients:
+        client.close()
+    for receiver in receivers:
+        receiver.cancel()
+    
+    return {
+        'elapsed': elapsed,
+        'delivered': sum(client.delivered for client in clients),
+        'latencies': [latency for client in clients for latency in client.latencies],
+        'diverged': diverged,
+        'tasks': len(serverState)
+    }
+
+def runClients(address, args, indexes, barrier, results):
+    results.put(asyncio.run(drive(address, args, indexes, barrier)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated clients against the sync server")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--ops", type=int, default=20, help="mutations per client")
+    parser.add_argument("--interval-ms", type=float, default=1000, help="mean pause between a client's mutations")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--checked", type=int, default=5,
+                        help="clients that apply every delta to their own store and are compared with the server")
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1),
+                        help="processes the simulated clients are spread over")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context("spawn")
+    channel = context.Queue()
+    stop = context.Event()
+    serverProcess = context.Process(target=runServer, args=(args.tasks, args.seed, channel, stop))
+    serverProcess.start()
+    address = tuple(channel.get())
+    
+    processCount = max(1, min(args.processes, args.clients))
+    barrier = context.Barrier(processCount)
+    results = context.Queue()
+    clientProcesses = [
+        context.Process(target=runClients, args=(address, args, range(offset, args.clients, processCount), barrier, results))
+        for offset in range(processCount)
+    ]
+    try:
+        for process in clientProcesses:
+            process.start()
+        reports = [results.get() for _ in clientProcesses]
+        for process in clientProcesses:
+            process.join()
+    finally:
+        stop.set()
+        serverStats = channel.get()
+        serverProcess.join()
+    
+    result = {
+        'elapsed': max(report['elapsed'] for report in reports),
+        'delivered': sum(report['delivered'] for report in reports),
+        'latencies': sorted(latency for report in reports for latency in report['latencies']),
+        'diverged': [index for report in reports for index in report['diverged']],
+        'tasks': reports[0]['tasks']
+    }
+    result['batches'] = len(result['latencies'])
+    latencies = result['latencies']
+    quantile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"clients: {args.clients}, mutations: {result['batches']}, tasks on the server: {result['tasks']}")
+    print(f"server: {serverStats['batches']} batches applied, {serverStats['dropped']} slow client(s) dropped")
+    print(f"throughput: {result['batches'] / result['elapsed']:.0f} mutations/s, "
+          f"{result['delivered'] / result['elapsed']:.0f} deltas delivered/s")
+    print(f"round trip to own delta: mean {statistics.mean(latencies) * 1000:.2f} ms, "
+          f"p50 {quantile(0.5):.2f} ms, p95 {quantile(0.95):.2f} ms, p99 {quantile(0.99):.2f} ms")
+    print(f"checked clients out of sync with the server: {len(result['diverged'])} of {min(args.checked, args.clients)}")
+    sys.exit(1 if result['diverged'] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import Profiler, TaskStore, __version__, writeJsonAtomic
+
+CATEGORIES = [f"Category {i:02d}" for i in range(1, 21)]
+
+def hasDisplay() -> bool:
+    return sys.platform in ("win32", "darwin") or bool(os.getenv("DISPLAY"))
+
+def writeData(filePath: str, size: int, seed: int = 13):
+    rng = random.Random(seed)
+    tasks = [
+        {
+            'id': i,
+            'text': f"task number {i}",
+            'completed': rng.random() < 0.3,
+            'createdAt': "2026-03-14 09:30",
+            'category': rng.choice(CATEGORIES),
+            'lastModified': "2026-03-14 09:30"
+        }
+        for i in range(1, size + 1)
+    ]
+    os.makedirs(os.path.dirname(filePath), exist_ok=True)
+    writeJsonAtomic(filePath, {
+        'version': __version__,
+        'tasks': tasks,
+        'categories': TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        'nextId': size + 1,
+        'currentCategory': CATEGORIES[0]
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description="Widgets and fonts allocated per refresh in steady state")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--refreshes", type=int, default=50)
+    args = parser.parse_args()
+    
+    if not hasDisplay():
+        print("bench_widgets needs a display (set DISPLAY, e.g. under Xvfb)")
+        return
+    
+    import customtkinter as ctk
+    from BreadTasks import BreadTasks, installWidgetCounters
+    
+    with tempfile.TemporaryDirectory() as workDir:
+        os.environ["LOCALAPPDATA"] = workDir
+        writeData(os.path.join(workDir, "BreadTasks", "breadtasks_data.json"), args.tasks)
+        
+        profiler = Profiler(enabled=True)
+        installWidgetCounters(profiler)
+        root = ctk.CTk()
+        app = BreadTasks(root)
+        root.update()
+        
+        categories = itertools.cycle(CATEGORIES)
+        
+        queries = itertools.cycle(["task", "number 1", "zzz"])
+        
+        def scroll():
+            app.tasksFrame.scrollTo(app.tasksFrame.offset + app.tasksFrame._viewportHeight())
+        
+        def search():
+            app.searchVar.set(next(queries))
+            app.runSearch()
+        
+        scenarios = [
+            ("displayTasks", app.displayTasks),
+            ("displayCategories", app.displayCategories),
+            ("selectCategory", lambda: app.selectCategory(next(categories))),
+            ("scroll one screen", scroll),
+            ("search keystroke", search),
+        ]
+        
+        print(f"tasks: {args.tasks}, refreshes per case: {args.refreshes}")
+        try:
+            for name, action in scenarios:
+                for _ in range(3):
+                    action()
+                    root.update()
+                
+                before = dict(profiler.counters)
+                tracemalloc.start()
+                startMemory = tracemalloc.get_traced_memory()[0]
+                for _ in range(args.refreshes):
+                    action()
+                    root.update_idletasks()
+                retained = tracemalloc.get_traced_memory()[0] - startMemory
+                tracemalloc.stop()
+                
+                deltas = {key: profiler.counters.get(key, 0) - before.get(key, 0)
+                          for key in ("widgetsCreated", "widgetsDestroyed", "fontsCreated")}
+                print(f"  {name:<18} per refresh: {deltas['widgetsCreated'] / args.refreshes:6.2f} widgets created, "
+                      f"{deltas['widgetsDestroyed'] / args.refreshes:6.2f} destroyed, "
+                      f"{deltas['fontsCreated'] / args.refreshes:6.2f} fonts, "
+                      f"{retained / args.refreshes / 1024:7.1f} KB retained")
+        finally:
+            app.saveWorker.close()
+            app.storage.close()
+            root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import (
+    JsonStorage,
+    SearchIndex,
+    TaskStats,
+    TaskStore,
+    __version__,
+    exportToFile,
+    importFromFile,
+    loadStore,
+    snapshotData,
+    writeJsonAtomic,
+)
+
+SIZES = [1000, 10000, 100000, 1000000]
+CATEGORIES = [f"Category {i:02d}" for i in range(1, 41)]
+WORDS = [
+    "review", "quarterly", "report", "email", "client", "invoice", "fix", "bug",
+    "deploy", "server", "groceries", "bread", "call", "dentist", "plan", "trip",
+    "update", "docs", "meeting", "notes", "budget", "design", "draft", "proposal"
+]
+QUERY = "quarterly report"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def randomStamp(rng: random.Random) -> str:
+    return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+
+def generateData(size: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(1, size + 1):
+        createdAt = randomStamp(rng)
+        tasks.append({
+            'id': i,
+            'text': " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))),
+            'completed': rng.random() < 0.3,
+            'createdAt': createdAt,
+            'category': rng.choice(CATEGORIES),
+            'lastModified': max(createdAt, randomStamp(rng))
+        })
+    return {
+        'version': __version__,
+        'tasks': tasks,
+        'categories': TaskStore.DEFAULT_CATEGORIES + CATEGORIES,
+        'nextId': size + 1,
+        'currentCategory': CATEGORIES[0]
+    }
+
+def datasetPath(dataDir: str, size: int) -> str:
+    filePath = os.path.join(dataDir, f"tasks-{size}.json")
+    if not os.path.exists(filePath):
+        os.makedirs(dataDir, exist_ok=True)
+        writeJsonAtomic(filePath, generateData(size))
+    return filePath
+
+def loadedStore(dataPath: str, materialize: bool = False):
+    store = TaskStore()
+    stats = TaskStats(store)
+    index = SearchIndex(store)
+    loadStore(JsonStorage(dataPath), store)
+    if materialize:
+        store.materializeSome(len(store))
+    return store, stats, index
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def benchLoad(dataPath: str, workDir: str, repeats: int):
+    def load():
+        store = loadedStore(dataPath)[0]
+        for taskId in store.idsInCategory(CATEGORIES[0])[:12]:
+            store.get(taskId)
+    return [timed(load) for _ in range(repeats)]
+
+def benchSaveAll(dataPath: str, workDir: str, repeats: int):
+    store = loadedStore(dataPath, materialize=True)[0]
+    storage = JsonStorage(os.path.join(workDir, "save.json"))
+    return [timed(lambda: storage.saveAll(snapshotData(store, __version__))) for _ in range(repeats)]
+
+def benchSearch(dataPath: str, workDir: str, repeats: int):
+    store, stats, index = loadedStore(dataPath, materialize=True)
+    index.search(QUERY)
+    
+    def typeQuery():
+        index.lastQuery = ""
+        index.lastResults = None
+        for length in range(1, len(QUERY) + 1):
+            store.filterIds(CATEGORIES[0], index.search(QUERY[:length]))
+    return [timed(typeQuery) / len(QUERY) for _ in range(repeats)]
+
+def benchStatistics(dataPath: str, workDir: str, repeats: int):
+    store, stats, index = loadedStore(dataPath)
+    calls = 1000
+    
+    def update():
+        for _ in range(calls):
+            stats.count()
+            stats.completedCount()
+            stats.count(CATEGORIES[0])
+            stats.completedCount(CATEGORIES[0])
+    return [timed(update) / calls for _ in range(repeats)]
+
+def benchClearCompleted(dataPath: str, workDir: str, repeats: int):
+    times = []
+    for _ in range(repeats):
+        store = loadedStore(dataPath)[0]
+        times.append(timed(lambda: store.removeMany([task.id for task in store.completedTasks("All")])))
+    return times
+
+def benchRenameCategory(dataPath: str, workDir: str, repeats: int):
+    times = []
+    for _ in range(repeats):
+        store = loadedStore(dataPath)[0]
+        times.append(timed(lambda: store.renameCategory(CATEGORIES[0], "Renamed")))
+    return times
+
+def benchBulkComplete(dataPath: str, workDir: str, repeats: int):
+    times = []
+    for _ in range(repeats):
+        store = loadedStore(dataPath)[0]
+        taskIds = store.idsInCategory(CATEGORIES[0])
+        times.append(timed(lambda: [task.toDict() for task in store.updateMany(taskIds, completed=True)]))
+    return times
+
+def benchExport(dataPath: str, workDir: str, repeats: int):
+    store, stats, index = loadedStore(dataPath, materialize=True)
+    exportPath = os.path.join(workDir, "export.json")
+    return [timed(lambda: exportToFile(exportPath, store, __version__)) for _ in range(repeats)]
+
+def benchImport(dataPath: str, workDir: str, repeats: int):
+    return [timed(lambda: importFromFile(dataPath, TaskStore())) for _ in range(repeats)]
+
+def hasDisplay() -> bool:
+    return sys.platform in ("win32", "darwin") or bool(os.getenv("DISPLAY"))
+
+def benchGui(dataPath: str, workDir: str, repeats: int) -> dict:
+    import customtkinter as ctk
+    from BreadTasks import BreadTasks
+    
+    appDir = os.path.join(workDir, "BreadTasks")
+    os.makedirs(appDir, exist_ok=True)
+    shutil.copy(dataPath, os.path.join(appDir, "breadtasks_data.json"))
+    os.environ["LOCALAPPDATA"] = workDir
+    
+    root = ctk.CTk()
+    app = BreadTasks(root)
+    root.update()
+    
+    def display(method):
+        method()
+        root.update_idletasks()
+    
+    try:
+        return {
+            'displayTasks': [timed(lambda: display(app.displayTasks)) for _ in range(repeats)],
+            'displayCategories': [timed(lambda: display(app.displayCategories)) for _ in range(repeats)],
+        }
+    finally:
+        app.saveWorker.close()
+        app.storage.close()
+        root.destroy()
+
+BENCHMARKS = [
+    ("loadData", benchLoad),
+    ("saveAll", benchSaveAll),
+    ("search", benchSearch),
+    ("updateStatistics", benchStatistics),
+    ("clearCompleted", benchClearCompleted),
+    ("renameCategory", benchRenameCategory),
+    ("bulkComplete", benchBulkComplete),
+    ("export", benchExport),
+    ("import", benchImport),
+]
+
+def summarize(times) -> dict:
+    return {'median': statistics.median(times), 'min': min(times), 'repeats': len(times)}
+
+def runSuite(sizes, repeats: int, dataDir: str, selected, gui: bool) -> dict:
+    results = {}
+    for size in sizes:
+        dataPath = datasetPath(dataDir, size)
+        sizeRepeats = repeats if size < 1000000 else max(1, repeats // 3)
+        
+        with tempfile.TemporaryDirectory() as workDir:
+            for name, bench in BENCHMARKS:
+                if selected and name not in selected:
+                    continue
+                results[f"{name}[{size}]"] = summarize(bench(dataPath, workDir, sizeRepeats))
+                printResult(f"{name}[{size}]", results[f"{name}[{size}]"])
+            
+            if gui:
+                for name, times in benchGui(dataPath, workDir, sizeRepeats).items():
+                    if not selected or name in selected:
+                        results[f"{name}[{size}]"] = summarize(times)
+                        printResult(f"{name}[{size}]", results[f"{name}[{size}]"])
+    return results
+
+def formatSeconds(seconds: float) -> str:
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.2f} us"
+    return f"{seconds * 1000:.2f} ms"
+
+def printResult(key: str, result: dict):
+    print(f"{key:<32} {formatSeconds(result['median']):>12}  (min {formatSeconds(result['min'])}, n={result['repeats']})")
+
+def compare(results: dict, baseline: dict, threshold: float, noise: float) -> int:
+    regressions = 0
+    print()
+    print(f"{'benchmark (best of n)':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        
+        change = result['min'] / previous['min'] - 1 if previous['min'] else 0.0
+        regressed = change > threshold and result['min'] - previous['min'] > noise
+        regressions += regressed
+        print(f"{key:<32} {formatSeconds(previous['min']):>12} {formatSeconds(result['min']):>12} "
+              f"{change * 100:+7.1f}%{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="BreadTasks benchmark suite")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", default="", help="comma separated benchmark names")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "breadtasks-bench"),
+                        help="where generated datasets are cached")
+    parser.add_argument("--gui", choices=["auto", "on", "off"], default="auto",
+                        help="time displayTasks/displayCategories (auto: only when a display is available)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing")
+    parser.add_argument("--noise", type=float, default=0.0005, help="ignore slowdowns below this many seconds")
+    args = parser.parse_args()
+    
+    gui = args.gui == "on" or (args.gui == "auto" and hasDisplay())
+    selected = {name for name in args.only.split(",") if name}
+    sizes = [int(value) for value in args.sizes.split(",")]
+    
+    results = runSuite(sizes, args.repeats, args.data_dir, selected, gui)
+    report = {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'appVersion': __version__,
+            'gui': gui
+        },
+        'results': results
+    }
+    
+    if args.output:
+        writeJsonAtomic(args.output, report, indent=2)
+    if args.save_baseline:
+        writeJsonAtomic(args.save_baseline, report, indent=2)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold, args.noise)
+        if regressions:
+            print(f"{regressions} regression(s) over {args.threshold * 100:.0f}%")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
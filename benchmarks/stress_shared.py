@@ -0,0 +1,161 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from breadtasks_core import ChangeTracker, JsonStorage, Task, TaskStore, loadStore, mergeRemoteRecords, snapshotData
+from tests.helpers import stateOf
+
+def writer(path: str, index: int, writers: int, ops: int, seed: int, compactBytes: int,
+           fullRecords: bool, barrier, results):
+    storage = JsonStorage(path)
+    storage.COMPACT_THRESHOLD = compactBytes
+    store = TaskStore()
+    loadStore(storage, store)
+    tracker = ChangeTracker(store)
+    rng = random.Random(seed * 1000 + index)
+    category = f"Writer {index}"
+    ownTexts = {}
+    sharedId = index + 1
+    toggledId = (index + 1) % writers + 1
+    sharedText = None
+    toggles = 0
+    compactions = 0
+    
+    def poll(blocking=False):
+        records = storage.pollChanges(blocking)
+        if records:
+            with tracker.paused():
+                mergeRemoteRecords(store, records)
+        return records
+    
+    def save(tasks=(), deleted=(), meta=None):
+        records = [task.toDict() for task in tasks] if fullRecords else tracker.records(tasks)
+        storage.applyChanges(records, list(deleted), meta)
+    
+    barrier.wait()
+    start = time.perf_counter()
+    for step in range(ops):
+        action = rng.random()
+        if action < 0.4 or not ownTexts:
+            if category not in store.categories:
+                store.addCategory(category)
+            task = store.createTask(f"{category} task {step}", category)
+            ownTexts[task.id] = task.text
+            save([task], meta={'categories': list(store.categories), 'nextId': store.nextId})
+        elif action < 0.6:
+            task = store.get(rng.choice(list(ownTexts)))
+            store.update(task, text=f"{category} task edited at {step}")
+            ownTexts[task.id] = task.text
+            save([task])
+        elif action < 0.7:
+            taskId = rng.choice(list(ownTexts))
+            store.remove(taskId)
+            del ownTexts[taskId]
+            save(deleted=[taskId])
+        elif action < 0.85:
+            task = store.get(sharedId)
+            sharedText = f"shared {index} version {step}"
+            store.update(task, text=sharedText)
+            save([task])
+        else:
+            task = store.toggle(toggledId)
+            toggles += 1
+            save([task])
+        
+        if step % 5 == 0:
+            poll()
+        if storage.needsCompaction():
+            storage.compact()
+            compactions += 1
+    elapsed = time.perf_counter() - start
+    
+    barrier.wait()
+    while poll(blocking=True):
+        pass
+    results.put({
+        'index': index,
+        'ownTexts': ownTexts,
+        'sharedText': sharedText,
+        'toggles': toggles,
+        'elapsed': elapsed,
+        'compactions': compactions,
+        'state': stateOf(store)
+    })
+    storage.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent writer processes on one shared data file")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--compact-bytes", type=int, default=64 * 1024,
+                        help="journal size that triggers compaction (small to exercise it)")
+    parser.add_argument("--full-records", action="store_true",
+                        help="write whole tasks instead of field patches, to show the lost updates patches prevent")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp(prefix="breadtasks-stress-")
+    path = os.path.join(directory, "breadtasks_data.json")
+    seedStore = TaskStore()
+    seedStore.reset([Task(id=i + 1, text=f"shared {i}") for i in range(args.writers)],
+                    TaskStore.DEFAULT_CATEGORIES, args.writers + 1)
+    seedStorage = JsonStorage(path)
+    seedStorage.saveAll(snapshotData(seedStore, "stress"))
+    seedStorage.close()
+    
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.writers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=writer, args=(path, index, args.writers, args.ops, args.seed,
+                                             args.compact_bytes, args.full_records, barrier, results))
+        for index in range(args.writers)
+    ]
+    for process in processes:
+        process.start()
+    reports = sorted((results.get() for _ in processes), key=lambda report: report['index'])
+    for process in processes:
+        process.join()
+    
+    storage = JsonStorage(path)
+    store = TaskStore()
+    loadStore(storage, store)
+    storage.close()
+    diskState = stateOf(store)
+    
+    lost = []
+    expectedCount = args.writers
+    for report in reports:
+        index = report['index']
+        expectedCount += len(report['ownTexts'])
+        for taskId, text in report['ownTexts'].items():
+            task = store.get(taskId)
+            if task is None or task.text != text:
+                lost.append(f"writer {index}: task {taskId} expected {text!r}, found {task.text if task else None!r}")
+        shared = store.get(index + 1)
+        if report['sharedText'] is not None and shared.text != report['sharedText']:
+            lost.append(f"writer {index}: shared task {index + 1} text {shared.text!r}")
+        toggled = store.get((index + 1) % args.writers + 1)
+        if toggled.completed != bool(report['toggles'] % 2):
+            lost.append(f"writer {index}: {report['toggles']} toggles of task {toggled.id} lost")
+    if len(store) != expectedCount:
+        lost.append(f"{len(store)} tasks on disk, expected {expectedCount}")
+    diverged = [report['index'] for report in reports if report['state'] != diskState]
+    
+    slowest = max(report['elapsed'] for report in reports)
+    print(f"{args.writers} writers x {args.ops} ops in {slowest:.2f} s "
+          f"({args.writers * args.ops / slowest:.0f} ops/s), "
+          f"{sum(report['compactions'] for report in reports)} compactions, {len(store)} tasks")
+    print(f"lost updates: {len(lost)}, writers out of sync after the final poll: {len(diverged)}")
+    for line in lost[:10]:
+        print(f"  {line}")
+    sys.exit(1 if lost or diverged else 0)
+
+if __name__ == "__main__":
+    main()
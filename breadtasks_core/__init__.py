@@ -0,0 +1,118 @@
+__version__ = "1.0.0"
+
+import importlib
+
+from .model import Task, TaskColumns, currentStamp, formatTimestamp, normalizeTaskDict, parseTimestamp
+from .store import SORT_MODES, TaskStore
+from .stats import TaskStats
+from .search import SearchIndex
+from .query import QueryEngine, parseQuery
+from .storage import (
+    DEFAULT_FILE,
+    SQLITE_FILE,
+    JsonStorage,
+    SQLiteStorage,
+    SyncStorage,
+    TaskStorage,
+    defaultDataPath,
+    loadStore,
+    openStorage,
+    parseJson,
+    readJsonFile,
+    snapshotData,
+    writeJsonAtomic,
+)
+from .worker import SaveWorker
+from .locking import FileLock
+from .shared import ChangeTracker, mergeRemoteRecords
+from .history import History
+from .profiling import Profiler
+
+LAZY_MODULES = {
+    ".sync": ("SyncServer",),
+    ".replica": ("Replica", "replicaPath"),
+    ".export": (
+        "EXPORT_FORMATS",
+        "ExportCursor",
+        "ExportFilter",
+        "ExportJob",
+        "ExportWriter",
+        "exportToFile",
+        "formatFromPath",
+        "openExportStream",
+        "writeExport",
+    ),
+    ".importer": (
+        "DEDUPE_MODES",
+        "ImportJob",
+        "ImportMerger",
+        "ImportReader",
+        "JsonTaskReader",
+        "importFromFile",
+    ),
+}
+LAZY_NAMES = {name: module for module, names in LAZY_MODULES.items() for name in names}
+
+def __getattr__(name: str):
+    module = LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_NAMES))
+
+__all__ = [
+    "__version__",
+    "Task",
+    "TaskColumns",
+    "currentStamp",
+    "formatTimestamp",
+    "normalizeTaskDict",
+    "parseTimestamp",
+    "SORT_MODES",
+    "TaskStore",
+    "TaskStats",
+    "SearchIndex",
+    "QueryEngine",
+    "parseQuery",
+    "DEFAULT_FILE",
+    "SQLITE_FILE",
+    "JsonStorage",
+    "SQLiteStorage",
+    "SyncStorage",
+    "TaskStorage",
+    "defaultDataPath",
+    "loadStore",
+    "openStorage",
+    "parseJson",
+    "readJsonFile",
+    "snapshotData",
+    "writeJsonAtomic",
+    "SaveWorker",
+    "FileLock",
+    "ChangeTracker",
+    "mergeRemoteRecords",
+    "History",
+    "SyncServer",
+    "Replica",
+    "replicaPath",
+    "EXPORT_FORMATS",
+    "ExportCursor",
+    "ExportFilter",
+    "ExportJob",
+    "ExportWriter",
+    "exportToFile",
+    "formatFromPath",
+    "openExportStream",
+    "writeExport",
+    "DEDUPE_MODES",
+    "ImportJob",
+    "ImportMerger",
+    "ImportReader",
+    "JsonTaskReader",
+    "importFromFile",
+    "Profiler",
+]
@@ -0,0 +1,343 @@
+from typing import TYPE_CHECKING, List, Optional
+import argparse
+import os
+import sys
+
+from . import __version__
+from .model import Task, normalizeTaskDict
+from .query import AndNode, QueryEngine, TextTerm, parseQuery
+from .stats import TaskStats
+from .storage import (DEFAULT_SYNC_ADDRESS, SQLiteStorage, SyncStorage, TaskStorage, defaultDataPath, loadStore,
+                      openStorage, snapshotData)
+from .store import TaskStore, sortKey
+
+if TYPE_CHECKING:
+    from .replica import Replica
+
+EXPORT_FORMATS = ("json", "ndjson", "csv")
+DEDUPE_MODES = ("none", "text", "id")
+
+def buildParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m breadtasks_core", description="Work with BreadTasks data files without the GUI")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--file", default=defaultDataPath(), help="path to breadtasks_data.json")
+    parser.add_argument("--storage", choices=["json", "sqlite", "sync"], default=None,
+                        help="storage backend (default: $BREADTASKS_STORAGE or json)")
+    parser.add_argument("--server", default=None,
+                        help=f"sync server for --storage sync (default: $BREADTASKS_SYNC_ADDRESS or {DEFAULT_SYNC_ADDRESS})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    addParser = commands.add_parser("add", help="add a task")
+    addParser.add_argument("text")
+    addParser.add_argument("-c", "--category", default="Uncategorized")
+    
+    listParser = commands.add_parser("list", help="list tasks")
+    listParser.add_argument("-c", "--category", default="All")
+    state = listParser.add_mutually_exclusive_group()
+    state.add_argument("--done", action="store_true", help="only completed tasks")
+    state.add_argument("--open", action="store_true", help="only open tasks")
+    
+    toggleParser = commands.add_parser("toggle", help="toggle tasks between open and completed")
+    toggleParser.add_argument("ids", type=int, nargs="+")
+    
+    searchParser = commands.add_parser("search", help="find tasks matching a query, e.g. 'report cat:Work -done:yes'")
+    searchParser.add_argument("query")
+    searchParser.add_argument("-c", "--category", default="All")
+    searchParser.add_argument("--explain", action="store_true", help="print the query plan before the results")
+    
+    commands.add_parser("stats", help="count open and completed tasks per category")
+    
+    exportParser = commands.add_parser("export", help="export tasks as JSON, NDJSON or CSV")
+    exportParser.add_argument("-o", "--output", default="-",
+                              help="output file; the format follows the extension, .gz compresses (default: stdout)")
+    exportParser.add_argument("--format", choices=EXPORT_FORMATS, default=None)
+    exportParser.add_argument("--gzip", action="store_true", default=None)
+    exportParser.add_argument("-c", "--category", default="All")
+    exportState = exportParser.add_mutually_exclusive_group()
+    exportState.add_argument("--done", action="store_true", help="only completed tasks")
+    exportState.add_argument("--open", action="store_true", help="only open tasks")
+    exportParser.add_argument("--from", dest="createdFrom", help="created on or after YYYY-MM-DD")
+    exportParser.add_argument("--to", dest="createdTo", help="created on or before YYYY-MM-DD")
+    
+    importParser = commands.add_parser("import", help="import tasks from JSON, NDJSON or CSV")
+    importParser.add_argument("input", help="file to import; the format follows the extension, .gz is decompressed")
+    importParser.add_argument("--format", choices=EXPORT_FORMATS, default=None)
+    importParser.add_argument("--gzip", action="store_true", default=None)
+    importParser.add_argument("--dedupe", choices=DEDUPE_MODES, default="none",
+                              help="text: skip tasks with the same text and category; "
+                                   "id: merge tasks with the same id, the newer lastModified wins")
+    
+    mergeParser = commands.add_parser("merge", help="merge offline edits with another copy of the data file, both ways")
+    mergeParser.add_argument("other", help="the other breadtasks_data.json, e.g. on a USB stick or a synced folder")
+    
+    serveParser = commands.add_parser("serve", help="share the data file with other computers through a sync server")
+    serveParser.add_argument("--listen", default=DEFAULT_SYNC_ADDRESS, help="HOST:PORT to listen on")
+    
+    return parser
+
+def formatTask(task: Task) -> str:
+    mark = "x" if task.completed else " "
+    return f"{task.id:>6}  [{mark}] {task.text}  ({task.category}, {task.lastModified})"
+
+def printTasks(tasks: List[Task]):
+    for task in tasks:
+        print(formatTask(task))
+
+def taskFromRow(taskDict: dict) -> Task:
+    return Task(**normalizeTaskDict(taskDict))
+
+def indexedText(query: str) -> Optional[str]:
+    plan = parseQuery(query)
+    terms = plan.children if isinstance(plan, AndNode) else [plan]
+    texts = [term.text for term in terms if isinstance(term, TextTerm)]
+    return max(texts, key=len) if texts else None
+
+def queriesStorage(args, storage: TaskStorage) -> bool:
+    if not isinstance(storage, SQLiteStorage) or args.command not in INDEXED_COMMANDS or storage.isEmpty():
+        return False
+    return args.command != "search" or indexedText(args.query) is not None
+
+def openData(args) -> tuple:
+    readOnly = args.command in READ_ONLY_COMMANDS
+    storage = openStorage(args.file, args.storage, args.server, create=not readOnly)
+    if storage is None:
+        return TaskStorage(), TaskStore()
+    if queriesStorage(args, storage):
+        return storage, None
+    store = TaskStore()
+    if loadStore(storage, store) is None and not readOnly:
+        storage.saveAll(snapshotData(store, __version__))
+    return storage, store
+
+def runAdd(args, storage: TaskStorage, store: TaskStore) -> int:
+    text = args.text.strip()
+    if not text:
+        print("breadtasks: task text is empty", file=sys.stderr)
+        return 1
+    
+    if args.category == "All":
+        print("breadtasks: 'All' is not a category tasks can belong to", file=sys.stderr)
+        return 1
+    if args.category not in store.categories:
+        store.addCategory(args.category)
+    
+    task = store.createTask(text, args.category)
+    storage.applyChanges([task.toDict()], [], {'categories': list(store.categories), 'nextId': store.nextId})
+    print(formatTask(task))
+    return 0
+
+def runList(args, storage: TaskStorage, store: Optional[TaskStore]) -> int:
+    if store is None:
+        completed = True if args.done else False if args.open else None
+        printTasks([taskFromRow(taskDict) for taskDict in storage.tasksInCategory(args.category, completed)])
+        return 0
+    
+    tasks = store.inCategory(args.category)
+    if args.done:
+        tasks = [task for task in tasks if task.completed]
+    elif args.open:
+        tasks = [task for task in tasks if not task.completed]
+    printTasks(tasks)
+    return 0
+
+def runToggle(args, storage: TaskStorage, store: TaskStore) -> int:
+    changed = []
+    status = 0
+    for taskId in args.ids:
+        task = store.toggle(taskId)
+        if task is None:
+            print(f"breadtasks: no task with id {taskId}", file=sys.stderr)
+            status = 1
+        else:
+            changed.append(task)
+    
+    storage.applyChanges([task.toPatch(('completed', 'lastModified')) for task in changed], [], None)
+    printTasks(changed)
+    return status
+
+def runSearch(args, storage: TaskStorage, store: Optional[TaskStore]) -> int:
+    if store is None:
+        plan = parseQuery(args.query)
+        if args.explain:
+            print(repr(plan))
+        tasks = [taskFromRow(taskDict) for taskDict in storage.search(indexedText(args.query), args.category)]
+        mode, descending = storage.sortOrder()
+        tasks.sort(key=lambda task: sortKey(mode, task), reverse=descending)
+        printTasks([task for task in tasks if plan.matches(task)])
+        return 0
+    
+    engine = QueryEngine(store)
+    if args.explain:
+        print(engine.explain(args.query))
+    taskIds = store.filterIds(args.category, engine.search(args.query))
+    printTasks([store.get(taskId) for taskId in taskIds])
+    return 0
+
+def runStats(args, storage: TaskStorage, store: Optional[TaskStore]) -> int:
+    if store is None:
+        counts = storage.countByCategory()
+    else:
+        stats = TaskStats(store)
+        counts = {category: (total, stats.completedCount(category)) for category, total in stats.categoryTotals.items()}
+    
+    for category, (total, completed) in sorted(counts.items()):
+        print(f"{total:>8} {completed:>8} done  {category}")
+    print(f"{sum(total for total, _ in counts.values()):>8} "
+          f"{sum(completed for _, completed in counts.values()):>8} done  All")
+    return 0
+
+def runExport(args, storage: TaskStorage, store: TaskStore) -> int:
+    from .export import ExportFilter, exportToFile, writeExport
+    
+    completed = True if args.done else False if args.open else None
+    try:
+        exportFilter = ExportFilter(args.category, completed, args.createdFrom, args.createdTo)
+    except ValueError as e:
+        print(f"breadtasks: {e}", file=sys.stderr)
+        return 1
+    
+    if args.output == "-":
+        if args.gzip:
+            print("breadtasks: --gzip needs an output file", file=sys.stderr)
+            return 1
+        writeExport(sys.stdout, store, args.format or "json", __version__, exportFilter)
+    else:
+        count = exportToFile(args.output, store, __version__, exportFilter, args.format, args.gzip)
+        print(f"exported {count} task(s) to {args.output}", file=sys.stderr)
+    return 0
+
+def runImport(args, storage: TaskStorage, store: TaskStore) -> int:
+    from .importer import ImportMerger, ImportReader
+    
+    try:
+        reader = ImportReader(args.input, args.format, args.gzip)
+    except OSError as e:
+        print(f"breadtasks: {e}", file=sys.stderr)
+        return 1
+    
+    merger = ImportMerger(store, args.dedupe)
+    try:
+        while True:
+            chunk = reader.nextChunk()
+            if chunk is None:
+                break
+            added, updated = merger.apply(chunk)
+            storage.applyChanges([task.toDict() for task in added + updated], [], None)
+        merger.registerCategories(reader.categories)
+    except (ValueError, OSError) as e:
+        print(f"breadtasks: {args.input}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        reader.close()
+        storage.applyChanges([], [], {'categories': list(store.categories), 'nextId': store.nextId})
+    
+    summary = merger.summary(reader.invalid)
+    print(f"imported {summary['added']} task(s), updated {summary['updated']}, "
+          f"skipped {summary['skipped']} duplicate(s) and {summary['invalid']} invalid record(s)",
+          file=sys.stderr)
+    return 0
+
+def openOther(path: str) -> tuple:
+    from .replica import Replica
+    
+    storage = openStorage(path, "json", create=False)
+    store = TaskStore()
+    if storage is None or loadStore(storage, store) is None:
+        if storage is not None:
+            storage.close()
+        raise OSError(f"{path}: no BreadTasks data found")
+    return storage, store, Replica.load(store, path)
+
+def applyMerge(source: "Replica", target: "Replica", storage: TaskStorage) -> int:
+    changed, removed, categoriesChanged = target.merge(source.delta(target.seen))
+    store = target.store
+    storage.applyChanges([task.toDict() for task in changed], [task.id for task in removed],
+                         {'categories': list(store.categories), 'nextId': store.nextId})
+    return len(changed) + len(removed)
+
+def runMerge(args, storage: TaskStorage, store: TaskStore) -> int:
+    if args.replica is None:
+        print("breadtasks: merge needs a local data file, not --storage sync", file=sys.stderr)
+        return 1
+    if os.path.abspath(args.other) == os.path.abspath(args.file):
+        print("breadtasks: cannot merge a data file with itself", file=sys.stderr)
+        return 1
+    try:
+        otherStorage, otherStore, other = openOther(args.other)
+    except (OSError, ValueError) as e:
+        print(f"breadtasks: {e}", file=sys.stderr)
+        return 1
+    
+    try:
+        pulled = applyMerge(other, args.replica, storage)
+        pushed = applyMerge(args.replica, other, otherStorage)
+        other.save()
+    finally:
+        otherStorage.close()
+    print(f"merged {pulled} change(s) from {args.other} and {pushed} into it", file=sys.stderr)
+    return 0
+
+def runServe(args, storage: TaskStorage, store: TaskStore) -> int:
+    import asyncio
+    
+    from .sync import SyncServer, parseAddress
+    
+    if isinstance(storage, SyncStorage):
+        print("breadtasks: serve needs a local data file, not --storage sync", file=sys.stderr)
+        return 1
+    
+    try:
+        host, port = parseAddress(args.listen)
+    except ValueError:
+        print(f"breadtasks: --listen expects HOST:PORT, got {args.listen!r}", file=sys.stderr)
+        return 1
+    
+    server = SyncServer(store, storage, __version__)
+    print(f"serving {len(store)} task(s) from {args.file} on {host}:{port}", file=sys.stderr)
+    try:
+        asyncio.run(server.serveForever(host, port))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"breadtasks: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+COMMANDS = {
+    "add": runAdd,
+    "list": runList,
+    "toggle": runToggle,
+    "search": runSearch,
+    "stats": runStats,
+    "export": runExport,
+    "import": runImport,
+    "merge": runMerge,
+    "serve": runServe,
+}
+
+TRACKED_COMMANDS = {"add", "toggle", "import", "merge"}
+INDEXED_COMMANDS = {"list", "search", "stats"}
+READ_ONLY_COMMANDS = {"list", "search", "stats", "export"}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = buildParser().parse_args(argv)
+    storage, store = openData(args)
+    tracked = args.command in TRACKED_COMMANDS and not isinstance(storage, SyncStorage)
+    try:
+        args.replica = None
+        if tracked:
+            from .replica import Replica
+            
+            args.replica = Replica.load(store, args.file)
+        status = COMMANDS[args.command](args, storage, store)
+        if tracked:
+            args.replica.save()
+        return status
+    finally:
+        unused = store.unusedIds() if store is not None else None
+        if unused is not None:
+            storage.releaseIds(*unused)
+        storage.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
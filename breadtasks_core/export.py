@@ -0,0 +1,213 @@
+from typing import Callable, List, Optional, Tuple
+import threading
+import datetime
+import queue
+import json
+import gzip
+import csv
+import os
+
+from .model import Task, parseTimestamp
+from .store import TaskStore
+
+EXPORT_FORMATS = ("json", "ndjson", "csv")
+CSV_COLUMNS = ('id', 'text', 'completed', 'createdAt', 'category', 'lastModified')
+
+def formatFromPath(filePath: str) -> Tuple[str, bool]:
+    name = filePath.lower()
+    compress = name.endswith(".gz")
+    if compress:
+        name = name[:-3]
+    extension = os.path.splitext(name)[1]
+    return {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}.get(extension, "json"), compress
+
+def openExportStream(filePath: str, compress: bool = False):
+    if compress:
+        return gzip.open(filePath, 'wt', encoding='utf-8', newline='', compresslevel=6)
+    return open(filePath, 'w', encoding='utf-8', newline='')
+
+def parseDateBound(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    stamp = parseTimestamp(value)
+    if stamp is None:
+        raise ValueError(f"'{value}' is not a date (YYYY-MM-DD)")
+    return stamp
+
+class ExportFilter:
+    def __init__(self, category: str = "All", completed: Optional[bool] = None,
+                 createdFrom: Optional[str] = None, createdTo: Optional[str] = None):
+        self.category = category
+        self.completed = completed
+        self.createdFrom = parseDateBound(createdFrom)
+        self.createdTo = parseDateBound(createdTo)
+        if self.createdTo is not None and len(createdTo) <= 10:
+            self.createdTo += 2359
+    
+    def candidateIds(self, store: TaskStore) -> List[int]:
+        if self.completed is None:
+            return store.idsInCategory(self.category)
+        
+        if self.category == "All":
+            completedIds = set()
+            for bucket in store.completedIds.values():
+                completedIds |= bucket
+        else:
+            completedIds = store.completedIds.get(self.category, set())
+        
+        if self.completed:
+            return sorted(completedIds)
+        return [taskId for taskId in store.idsInCategory(self.category) if taskId not in completedIds]
+    
+    def matches(self, task: Task) -> bool:
+        if self.createdFrom is not None and task.createdStamp < self.createdFrom:
+            return False
+        if self.createdTo is not None and task.createdStamp > self.createdTo:
+            return False
+        return True
+
+class ExportCursor:
+    CHUNK_SIZE = 5000
+    
+    def __init__(self, store: TaskStore, exportFilter: Optional[ExportFilter] = None,
+                 chunkSize: Optional[int] = None):
+        self.store = store
+        self.exportFilter = exportFilter or ExportFilter()
+        self.chunkSize = chunkSize or self.CHUNK_SIZE
+        self.taskIds = self.exportFilter.candidateIds(store)
+        self.position = 0
+    
+    @property
+    def total(self) -> int:
+        return len(self.taskIds)
+    
+    def done(self) -> bool:
+        return self.position >= len(self.taskIds)
+    
+    def nextChunk(self) -> List[dict]:
+        store = self.store
+        matches = self.exportFilter.matches
+        end = min(self.position + self.chunkSize, len(self.taskIds))
+        chunk = []
+        for taskId in self.taskIds[self.position:end]:
+            task = store.get(taskId)
+            if task is not None and matches(task):
+                chunk.append(task.toDict())
+        self.position = end
+        return chunk
+
+class ExportWriter:
+    def __init__(self, stream, fmt: str, appVersion: str, categories: List[str]):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"unknown export format: {fmt}")
+        self.stream = stream
+        self.fmt = fmt
+        self.appVersion = appVersion
+        self.categories = list(categories)
+        self.count = 0
+        self.completed = 0
+        self.csvWriter = None
+    
+    def begin(self):
+        if self.fmt == "json":
+            self.stream.write("{\n")
+            self.stream.write(f'  "exportDate": {json.dumps(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))},\n')
+            self.stream.write(f'  "appVersion": {json.dumps(self.appVersion)},\n')
+            self.stream.write(f'  "categories": {json.dumps(self.categories, ensure_ascii=False)},\n')
+            self.stream.write('  "tasks": [')
+        elif self.fmt == "csv":
+            self.csvWriter = csv.DictWriter(self.stream, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            self.csvWriter.writeheader()
+    
+    def write(self, records: List[dict]):
+        if not records:
+            return
+        
+        if self.fmt == "json":
+            separator = ",\n    " if self.count else "\n    "
+            self.stream.write(separator + ",\n    ".join(json.dumps(record, ensure_ascii=False) for record in records))
+        elif self.fmt == "ndjson":
+            self.stream.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+        else:
+            self.csvWriter.writerows(records)
+        
+        self.count += len(records)
+        self.completed += sum(1 for record in records if record['completed'])
+    
+    def end(self):
+        if self.fmt == "json":
+            statistics = {
+                'totalTasks': self.count,
+                'completedTasks': self.completed,
+                'categoriesCount': len([c for c in self.categories if c not in ["All", "Uncategorized"]])
+            }
+            self.stream.write("\n  ],\n" if self.count else "],\n")
+            self.stream.write(f'  "statistics": {json.dumps(statistics)}\n}}\n')
+
+def writeExport(stream, store: TaskStore, fmt: str, appVersion: str,
+                exportFilter: Optional[ExportFilter] = None,
+                progress: Optional[Callable[[int, int], None]] = None) -> int:
+    cursor = ExportCursor(store, exportFilter)
+    writer = ExportWriter(stream, fmt, appVersion, store.categories)
+    writer.begin()
+    while not cursor.done():
+        writer.write(cursor.nextChunk())
+        if progress is not None:
+            progress(cursor.position, cursor.total)
+    writer.end()
+    return writer.count
+
+def exportToFile(filePath: str, store: TaskStore, appVersion: str,
+                 exportFilter: Optional[ExportFilter] = None, fmt: Optional[str] = None,
+                 compress: Optional[bool] = None, progress: Optional[Callable[[int, int], None]] = None) -> int:
+    detectedFormat, detectedCompress = formatFromPath(filePath)
+    with openExportStream(filePath, detectedCompress if compress is None else compress) as stream:
+        return writeExport(stream, store, fmt or detectedFormat, appVersion, exportFilter, progress)
+
+class ExportJob:
+    MAX_PENDING_CHUNKS = 4
+    
+    def __init__(self, filePath: str, fmt: str, compress: bool, appVersion: str, categories: List[str]):
+        self.filePath = filePath
+        self.stream = openExportStream(filePath, compress)
+        self.writer = ExportWriter(self.stream, fmt, appVersion, categories)
+        self.chunks = queue.Queue(self.MAX_PENDING_CHUNKS)
+        self.cancelled = False
+        self.finished = threading.Event()
+        self.error: Optional[Exception] = None
+        self.thread = threading.Thread(target=self._run, name="ExportJob", daemon=True)
+        self.thread.start()
+    
+    def offer(self, chunk: Optional[List[dict]]) -> bool:
+        try:
+            self.chunks.put_nowait(chunk)
+            return True
+        except queue.Full:
+            return False
+    
+    def cancel(self):
+        self.cancelled = True
+    
+    def _run(self):
+        try:
+            self.writer.begin()
+            while True:
+                chunk = self.chunks.get()
+                if chunk is None:
+                    break
+                if not self.cancelled and self.error is None:
+                    self.writer.write(chunk)
+            if not self.cancelled:
+                self.writer.end()
+        except Exception as e:
+            self.error = e
+            while self.chunks.get() is not None:
+                pass
+        finally:
+            self.stream.close()
+            if self.cancelled or self.error is not None:
+                try:
+                    os.remove(self.filePath)
+                except OSError:
+                    pass
+            self.finished.set()
@@ -0,0 +1,127 @@
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
+
+from .model import Task
+from .store import TaskStore
+
+class History:
+    MAX_ENTRIES = 100
+    MAX_OPS = 200000
+    
+    def __init__(self, store: TaskStore):
+        self.store = store
+        self.undoStack: Deque[list] = deque()
+        self.redoStack: List[list] = []
+        self.pending: list = []
+        self.size = 0
+        self.categories = list(store.categories)
+        self.replaying: Optional[str] = None
+        self.muted = 0
+        store.subscribe(self.onStoreChange)
+    
+    @contextmanager
+    def paused(self):
+        self.muted += 1
+        try:
+            yield self
+        finally:
+            self.muted -= 1
+    
+    @property
+    def canUndo(self) -> bool:
+        return bool(self.undoStack)
+    
+    @property
+    def canRedo(self) -> bool:
+        return bool(self.redoStack)
+    
+    def clear(self):
+        self.undoStack.clear()
+        self.redoStack = []
+        self.pending = []
+        self.size = 0
+    
+    def onStoreChange(self, event: str, task: Optional[Task], changes: Optional[dict]):
+        if event in ("categories", "rename"):
+            previous = self.categories
+            self.categories = list(self.store.categories)
+            if self.muted or previous == self.categories:
+                return
+            self.pending.append(("categories", previous))
+        elif event == "commit":
+            self._push()
+            return
+        elif event == "reset":
+            self.categories = list(self.store.categories)
+            self.clear()
+            return
+        elif self.muted:
+            return
+        elif event == "add":
+            self.pending.append(("remove", task.id))
+        elif event == "remove":
+            self.pending.append(("add", task))
+        elif event == "update":
+            self.pending.append(("update", task.id, changes))
+        else:
+            return
+        if not self.store.transactionDepth:
+            self._push()
+    
+    def _push(self):
+        if not self.pending:
+            return
+        entry = self.pending
+        self.pending = []
+        if self.replaying == "undo":
+            self.redoStack.append(entry)
+            return
+        if self.replaying is None:
+            self.redoStack = []
+        self.undoStack.append(entry)
+        self.size += len(entry)
+        while len(self.undoStack) > 1 and (len(self.undoStack) > self.MAX_ENTRIES or self.size > self.MAX_OPS):
+            self.size -= len(self.undoStack.popleft())
+    
+    def _replay(self, entry: list, direction: str) -> Tuple[List[Task], List[Task], bool]:
+        store = self.store
+        changed: Dict[int, Task] = {}
+        removed: Dict[int, Task] = {}
+        categoriesChanged = False
+        self.replaying = direction
+        try:
+            with store.transaction():
+                for op in reversed(entry):
+                    kind = op[0]
+                    if kind == "add":
+                        task = op[1]
+                        if task.id not in store:
+                            changed[task.id] = store.add(task)
+                            removed.pop(task.id, None)
+                    elif kind == "remove":
+                        task = store.remove(op[1])
+                        if task is not None:
+                            removed[task.id] = task
+                            changed.pop(task.id, None)
+                    elif kind == "update":
+                        task = store.get(op[1])
+                        if task is not None and store.update(task, touch=False, **op[2]):
+                            changed[task.id] = task
+                    else:
+                        categoriesChanged = store.setCategories(op[1]) or categoriesChanged
+        finally:
+            self.replaying = None
+        return list(changed.values()), list(removed.values()), categoriesChanged
+    
+    def undo(self) -> Optional[Tuple[List[Task], List[Task], bool]]:
+        if not self.undoStack:
+            return None
+        entry = self.undoStack.pop()
+        self.size -= len(entry)
+        return self._replay(entry, "undo")
+    
+    def redo(self) -> Optional[Tuple[List[Task], List[Task], bool]]:
+        if not self.redoStack:
+            return None
+        return self._replay(self.redoStack.pop(), "redo")
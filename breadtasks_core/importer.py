@@ -0,0 +1,341 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import threading
+import queue
+import json
+import gzip
+import csv
+import io
+import os
+import re
+
+from .export import formatFromPath
+from .model import Task, parseTimestamp
+from .storage import parseJson
+from .store import TaskStore
+
+DEDUPE_MODES = ("none", "text", "id")
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "done"}
+WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+class JsonTaskReader:
+    READ_SIZE = 1 << 16
+    
+    def __init__(self, stream, readSize: Optional[int] = None):
+        self.stream = stream
+        self.readSize = readSize or self.READ_SIZE
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.categories: List[str] = []
+    
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.stream.read(self.readSize)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + data
+        self.position = 0
+        return True
+    
+    def _peek(self) -> str:
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ""
+    
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"malformed JSON: expected one of {chars!r}, found {char or 'end of file'!r}")
+        self.position += 1
+        return char
+    
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+    
+    def _array(self) -> Iterator:
+        if self._peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+    
+    def __iter__(self) -> Iterator:
+        if self._expect("[{") == "[":
+            yield from self._array()
+            return
+        
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "tasks" and self._peek() == "[":
+                self.position += 1
+                yield from self._array()
+            else:
+                value = self._value()
+                if key == "categories" and isinstance(value, list):
+                    self.categories = [name for name in value if isinstance(name, str)]
+            if self._expect(",}") == "}":
+                return
+
+def iterNdjsonTasks(stream) -> Iterator:
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield parseJson(line)
+
+def cleanRecord(record) -> Optional[dict]:
+    if not isinstance(record, dict):
+        return None
+    text = record.get('text')
+    if not isinstance(text, str) or not text.strip():
+        return None
+    
+    completed = record.get('completed', False)
+    if isinstance(completed, str):
+        completed = completed.strip().lower() in TRUE_VALUES
+    
+    category = record.get('category')
+    category = category.strip() if isinstance(category, str) else ""
+    if not category or category == "All":
+        category = "Uncategorized"
+    
+    try:
+        taskId = int(record.get('id'))
+    except (TypeError, ValueError):
+        taskId = None
+    
+    createdAt = record.get('createdAt')
+    createdStamp = parseTimestamp(createdAt) if isinstance(createdAt, str) and createdAt else None
+    lastModified = record.get('lastModified')
+    modifiedStamp = parseTimestamp(lastModified) if isinstance(lastModified, str) and lastModified else None
+    
+    return {
+        'id': taskId,
+        'text': text.strip(),
+        'completed': bool(completed),
+        'createdAt': createdStamp,
+        'category': category,
+        'lastModified': modifiedStamp if modifiedStamp is not None else createdStamp
+    }
+
+class ImportReader:
+    CHUNK_SIZE = 2000
+    
+    def __init__(self, filePath: str, fmt: Optional[str] = None, compress: Optional[bool] = None,
+                 chunkSize: Optional[int] = None):
+        detectedFormat, detectedCompress = formatFromPath(filePath)
+        self.fmt = fmt or detectedFormat
+        self.chunkSize = chunkSize or self.CHUNK_SIZE
+        self.rawFile = open(filePath, 'rb')
+        self.size = os.fstat(self.rawFile.fileno()).st_size
+        if detectedCompress if compress is None else compress:
+            binary = gzip.GzipFile(fileobj=self.rawFile)
+        else:
+            binary = self.rawFile
+        self.stream = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+        self.jsonReader = None
+        if self.fmt == "ndjson":
+            self.records = iterNdjsonTasks(self.stream)
+        elif self.fmt == "csv":
+            self.records = csv.DictReader(self.stream)
+        else:
+            self.jsonReader = JsonTaskReader(self.stream)
+            self.records = iter(self.jsonReader)
+        self.read = 0
+        self.invalid = 0
+        self.progress = 0.0
+    
+    @property
+    def categories(self) -> List[str]:
+        return self.jsonReader.categories if self.jsonReader is not None else []
+    
+    def nextChunk(self) -> Optional[List[dict]]:
+        chunk = []
+        for record in self.records:
+            self.read += 1
+            cleaned = cleanRecord(record)
+            if cleaned is None:
+                self.invalid += 1
+                continue
+            chunk.append(cleaned)
+            if len(chunk) >= self.chunkSize:
+                break
+        self.progress = self.rawFile.tell() / self.size if self.size else 1.0
+        return chunk or None
+    
+    def close(self):
+        self.stream.close()
+        self.rawFile.close()
+
+class ImportMerger:
+    PREPARE_CHUNK = 50000
+    
+    def __init__(self, store: TaskStore, dedupe: str = "none"):
+        if dedupe not in DEDUPE_MODES:
+            raise ValueError(f"unknown dedupe mode: {dedupe}")
+        self.store = store
+        self.dedupe = dedupe
+        self.textKeys: Set[Tuple[str, str]] = set()
+        self.pendingKeyIds: List[int] = list(store.tasksById) if dedupe == "text" else []
+        self.idMap: Dict[int, int] = {}
+        self.firstNewId = store.nextId
+        self.added = 0
+        self.updated = 0
+        self.skipped = 0
+    
+    def prepare(self, limit: Optional[int] = None) -> bool:
+        tasksById = self.store.tasksById
+        pendingKeyIds = self.pendingKeyIds
+        textKeys = self.textKeys
+        count = len(pendingKeyIds) if limit is None else min(limit, len(pendingKeyIds))
+        for _ in range(count):
+            task = tasksById.get(pendingKeyIds.pop())
+            if type(task) is dict:
+                textKeys.add((task.get('category', "Uncategorized"), task['text']))
+            elif task is not None:
+                textKeys.add((task.category, task.text))
+        return bool(pendingKeyIds)
+    
+    def registerCategories(self, names):
+        for name in names:
+            if name != "All" and name not in self.store.categories:
+                self.store.addCategory(name)
+    
+    def _merge(self, record: dict) -> Tuple[Optional[Task], bool]:
+        store = self.store
+        sourceId = record['id']
+        targetId = self.idMap.get(sourceId)
+        if targetId is None and sourceId < self.firstNewId:
+            targetId = sourceId
+        existing = store.get(targetId) if targetId is not None else None
+        if existing is None:
+            return None, False
+        
+        modifiedStamp = record['lastModified']
+        if modifiedStamp is None or modifiedStamp <= existing.modifiedStamp:
+            return existing, False
+        fields = {key: record[key] for key in ('text', 'completed', 'category')}
+        if record['createdAt'] is not None:
+            fields['createdAt'] = record['createdAt']
+        store.update(existing, touch=False, lastModified=modifiedStamp, **fields)
+        return existing, True
+    
+    def apply(self, records: List[dict]) -> Tuple[List[Task], List[Task]]:
+        self.prepare()
+        store = self.store
+        added = []
+        updated = []
+        with store.transaction():
+            self.registerCategories(dict.fromkeys(record['category'] for record in records))
+            for record in records:
+                if self.dedupe == "id" and record['id'] is not None:
+                    existing, changed = self._merge(record)
+                    if existing is not None:
+                        if changed:
+                            updated.append(existing)
+                        else:
+                            self.skipped += 1
+                        continue
+                elif self.dedupe == "text":
+                    key = (record['category'], record['text'])
+                    if key in self.textKeys:
+                        self.skipped += 1
+                        continue
+                    self.textKeys.add(key)
+                
+                task = store.add(Task(
+                    id=store.allocateId(len(records)),
+                    text=record['text'],
+                    completed=record['completed'],
+                    createdAt=record['createdAt'],
+                    category=record['category'],
+                    lastModified=record['lastModified']
+                ))
+                if self.dedupe == "id" and record['id'] is not None:
+                    self.idMap[record['id']] = task.id
+                added.append(task)
+        
+        self.added += len(added)
+        self.updated += len(updated)
+        return added, updated
+    
+    def summary(self, invalid: int = 0) -> Dict[str, int]:
+        return {'added': self.added, 'updated': self.updated, 'skipped': self.skipped, 'invalid': invalid}
+
+def importFromFile(filePath: str, store: TaskStore, fmt: Optional[str] = None,
+                   compress: Optional[bool] = None, dedupe: str = "none",
+                   progress=None) -> Dict[str, int]:
+    merger = ImportMerger(store, dedupe)
+    reader = ImportReader(filePath, fmt, compress)
+    try:
+        while True:
+            chunk = reader.nextChunk()
+            if chunk is None:
+                break
+            merger.apply(chunk)
+            if progress is not None:
+                progress(reader.progress)
+        merger.registerCategories(reader.categories)
+    finally:
+        reader.close()
+    return merger.summary(reader.invalid)
+
+class ImportJob:
+    MAX_PENDING_CHUNKS = 4
+    PUT_TIMEOUT = 0.1
+    
+    def __init__(self, filePath: str, fmt: Optional[str] = None, compress: Optional[bool] = None):
+        self.reader = ImportReader(filePath, fmt, compress)
+        self.chunks = queue.Queue(self.MAX_PENDING_CHUNKS)
+        self.cancelled = False
+        self.finished = threading.Event()
+        self.error: Optional[Exception] = None
+        self.thread = threading.Thread(target=self._run, name="ImportJob", daemon=True)
+        self.thread.start()
+    
+    def poll(self) -> Optional[List[dict]]:
+        try:
+            return self.chunks.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def cancel(self):
+        self.cancelled = True
+    
+    def _run(self):
+        try:
+            while not self.cancelled:
+                chunk = self.reader.nextChunk()
+                if chunk is None:
+                    break
+                while not self.cancelled:
+                    try:
+                        self.chunks.put(chunk, timeout=self.PUT_TIMEOUT)
+                        break
+                    except queue.Full:
+                        pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.reader.close()
+            self.finished.set()
@@ -0,0 +1,85 @@
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+class FileLock:
+    POLL_SECONDS = 0.005
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.threadLock = threading.RLock()
+        self.handle = None
+        self.depth = 0
+    
+    def _lockFile(self, blocking: bool) -> bool:
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(self.handle.fileno(), flags)
+            except BlockingIOError:
+                return False
+            return True
+        
+        if msvcrt is not None:
+            while True:
+                try:
+                    self.handle.seek(0)
+                    msvcrt.locking(self.handle.fileno(), msvcrt.LK_NBLCK, 1)
+                    return True
+                except OSError:
+                    if not blocking:
+                        return False
+                    time.sleep(self.POLL_SECONDS)
+        return True
+    
+    def _unlockFile(self):
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            self.handle.seek(0)
+            msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self.threadLock.acquire(blocking):
+            return False
+        if self.depth == 0:
+            try:
+                if self.handle is None:
+                    self.handle = open(self.path, 'a+b')
+                locked = self._lockFile(blocking)
+            except BaseException:
+                self.threadLock.release()
+                raise
+            if not locked:
+                self.threadLock.release()
+                return False
+        self.depth += 1
+        return True
+    
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            self._unlockFile()
+        self.threadLock.release()
+    
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.release()
+    
+    def close(self):
+        with self.threadLock:
+            if self.handle is not None and self.depth == 0:
+                self.handle.close()
+                self.handle = None
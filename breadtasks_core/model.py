@@ -0,0 +1,158 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from array import array
+import datetime
+import sys
+
+def currentStamp() -> int:
+    now = datetime.datetime.now()
+    return (((now.year * 100 + now.month) * 100 + now.day) * 100 + now.hour) * 100 + now.minute
+
+def parseTimestamp(value) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    
+    if len(value) >= 16 and value[4] == "-" and value[13] == ":":
+        try:
+            return int(value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16])
+        except ValueError:
+            pass
+    
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return int(parsed.strftime("%Y%m%d%H%M"))
+
+def formatTimestamp(stamp: Optional[int]) -> Optional[str]:
+    if stamp is None:
+        return None
+    text = str(stamp)
+    return f"{text[0:4]}-{text[4:6]}-{text[6:8]} {text[8:10]}:{text[10:12]}"
+
+class Task:
+    __slots__ = ('id', 'text', 'completed', '_category', 'createdStamp', 'modifiedStamp')
+    
+    def __init__(self, id: int, text: str, completed: bool = False, createdAt=None,
+                 category: str = "Uncategorized", lastModified=None):
+        self.id = id
+        self.text = text
+        self.completed = completed
+        self._category = sys.intern(category)
+        self.createdStamp = parseTimestamp(createdAt)
+        self.modifiedStamp = parseTimestamp(lastModified)
+        
+        if self.createdStamp is None or self.modifiedStamp is None:
+            now = currentStamp()
+            if self.createdStamp is None:
+                self.createdStamp = now
+            if self.modifiedStamp is None:
+                self.modifiedStamp = now
+    
+    @property
+    def category(self) -> str:
+        return self._category
+    
+    @category.setter
+    def category(self, value: str):
+        self._category = sys.intern(value)
+    
+    @property
+    def createdAt(self) -> Optional[str]:
+        return formatTimestamp(self.createdStamp)
+    
+    @createdAt.setter
+    def createdAt(self, value):
+        self.createdStamp = parseTimestamp(value)
+    
+    @property
+    def lastModified(self) -> Optional[str]:
+        return formatTimestamp(self.modifiedStamp)
+    
+    @lastModified.setter
+    def lastModified(self, value):
+        self.modifiedStamp = parseTimestamp(value)
+    
+    def toDict(self) -> dict:
+        return {
+            'id': self.id,
+            'text': self.text,
+            'completed': self.completed,
+            'createdAt': formatTimestamp(self.createdStamp),
+            'category': self._category,
+            'lastModified': formatTimestamp(self.modifiedStamp)
+        }
+    
+    def toPatch(self, keys: Iterable[str]) -> dict:
+        patch = {'id': self.id}
+        for key in keys:
+            patch[key] = getattr(self, key)
+        return patch
+    
+    def __repr__(self) -> str:
+        return f"Task(id={self.id!r}, text={self.text!r}, completed={self.completed!r}, category={self._category!r})"
+
+class TaskColumns:
+    def __init__(self):
+        self.ids = array('q')
+        self.completed = array('b')
+        self.categoryCodes = array('I')
+        self.createdStamps = array('q')
+        self.modifiedStamps = array('q')
+        self.texts: List[str] = []
+        self.categoryNames: List[str] = []
+        self.categoryLookup: Dict[str, int] = {}
+    
+    @classmethod
+    def fromTasks(cls, tasks: Iterable[Task]) -> "TaskColumns":
+        columns = cls()
+        for task in tasks:
+            columns.append(task)
+        return columns
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def categoryCode(self, category: str) -> int:
+        code = self.categoryLookup.get(category)
+        if code is None:
+            code = len(self.categoryNames)
+            self.categoryNames.append(sys.intern(category))
+            self.categoryLookup[category] = code
+        return code
+    
+    def append(self, task: Task):
+        self.ids.append(task.id)
+        self.completed.append(1 if task.completed else 0)
+        self.categoryCodes.append(self.categoryCode(task.category))
+        self.createdStamps.append(task.createdStamp)
+        self.modifiedStamps.append(task.modifiedStamp)
+        self.texts.append(task.text)
+    
+    def task(self, index: int) -> Task:
+        task = Task.__new__(Task)
+        task.id = self.ids[index]
+        task.text = self.texts[index]
+        task.completed = bool(self.completed[index])
+        task._category = self.categoryNames[self.categoryCodes[index]]
+        task.createdStamp = self.createdStamps[index]
+        task.modifiedStamp = self.modifiedStamps[index]
+        return task
+    
+    def __iter__(self) -> Iterator[Task]:
+        return (self.task(index) for index in range(len(self.ids)))
+    
+    def countInCategory(self, category: str) -> int:
+        code = self.categoryLookup.get(category)
+        return 0 if code is None else self.categoryCodes.count(code)
+    
+    def completedCount(self) -> int:
+        return self.completed.count(1)
+
+def normalizeTaskDict(taskDict: dict) -> dict:
+    if 'priority' in taskDict:
+        taskDict.pop('priority')
+    if 'category' not in taskDict:
+        taskDict['category'] = "Uncategorized"
+    if 'lastModified' not in taskDict:
+        taskDict['lastModified'] = taskDict.get('createdAt')
+    return taskDict
@@ -0,0 +1,144 @@
+from typing import Callable, Dict, Iterable, Optional
+from collections import deque
+import functools
+import cProfile
+import time
+import os
+
+from .storage import writeJsonAtomic
+
+class Profiler:
+    LAG_SAMPLES = 600
+    WATCHED_COUNTERS = ("widgetsCreated", "widgetsDestroyed", "fontsCreated")
+    
+    def __init__(self, enabled: bool = False, cprofile: bool = False):
+        self.enabled = enabled
+        self.timings: Dict[str, dict] = {}
+        self.counters: Dict[str, int] = {}
+        self.lagSamples = deque(maxlen=self.LAG_SAMPLES)
+        self.cprofile = cProfile.Profile() if enabled and cprofile else None
+        self.cprofileRunning = False
+        self.startedAt = time.perf_counter()
+    
+    @classmethod
+    def fromSetting(cls, value: Optional[str] = None) -> "Profiler":
+        if value is None:
+            value = os.getenv("BREADTASKS_PROFILE", "")
+        value = value.strip().lower()
+        if value in ("", "0", "off", "false", "no"):
+            return cls()
+        return cls(enabled=True, cprofile=value in ("full", "cprofile"))
+    
+    def start(self):
+        if self.cprofile is not None:
+            self.cprofile.enable()
+            self.cprofileRunning = True
+    
+    def stop(self):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            self.cprofileRunning = False
+    
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def record(self, name: str, seconds: float, deltas: Optional[Dict[str, int]] = None):
+        entry = self.timings.get(name)
+        if entry is None:
+            entry = self.timings[name] = {'calls': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0}
+        entry['calls'] += 1
+        entry['total'] += seconds
+        entry['last'] = seconds
+        if seconds > entry['max']:
+            entry['max'] = seconds
+        if deltas:
+            for key, value in deltas.items():
+                entry[key] = entry.get(key, 0) + value
+                entry['last' + key[0].upper() + key[1:]] = value
+    
+    def recordLag(self, seconds: float):
+        self.lagSamples.append(max(0.0, seconds))
+    
+    def wrap(self, name: str, func: Callable) -> Callable:
+        counters = self.counters
+        watched = self.WATCHED_COUNTERS
+        
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            before = [counters.get(key, 0) for key in watched]
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.record(name, elapsed, {
+                    key: counters.get(key, 0) - previous for key, previous in zip(watched, before)
+                })
+        return timed
+    
+    def instrument(self, obj, names: Iterable[str]):
+        if not self.enabled:
+            return
+        for name in names:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+    
+    def reset(self):
+        self.timings.clear()
+        self.counters.clear()
+        self.lagSamples.clear()
+        self.startedAt = time.perf_counter()
+    
+    def lagSummary(self) -> dict:
+        samples = sorted(self.lagSamples)
+        if not samples:
+            return {'samples': 0, 'mean': 0.0, 'p95': 0.0, 'max': 0.0}
+        return {
+            'samples': len(samples),
+            'mean': sum(samples) / len(samples),
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'max': samples[-1]
+        }
+    
+    def report(self) -> dict:
+        return {
+            'uptime': time.perf_counter() - self.startedAt,
+            'timings': {
+                name: {**entry, 'mean': entry['total'] / entry['calls']}
+                for name, entry in sorted(self.timings.items(), key=lambda item: -item[1]['total'])
+            },
+            'counters': dict(self.counters),
+            'eventLoopLag': self.lagSummary()
+        }
+    
+    def formatReport(self) -> str:
+        report = self.report()
+        lines = [f"{'name':<24}{'calls':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}{'+widgets':>10}{'-widgets':>10}{'+fonts':>8}"]
+        for name, entry in report['timings'].items():
+            lines.append(
+                f"{name:<24}{entry['calls']:>7}{entry['total'] * 1000:>11.1f}{entry['mean'] * 1000:>10.2f}"
+                f"{entry['max'] * 1000:>10.2f}{entry.get('widgetsCreated', 0):>10}{entry.get('widgetsDestroyed', 0):>10}"
+                f"{entry.get('fontsCreated', 0):>8}"
+            )
+        
+        lines.append("")
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f"{name:<24}{value:>7}")
+        
+        lag = report['eventLoopLag']
+        lines.append("")
+        lines.append(
+            f"event loop lag: mean {lag['mean'] * 1000:.1f} ms, p95 {lag['p95'] * 1000:.1f} ms, "
+            f"max {lag['max'] * 1000:.1f} ms over {lag['samples']} samples"
+        )
+        return "\n".join(lines)
+    
+    def dumpJson(self, filePath: str):
+        writeJsonAtomic(filePath, self.report(), indent=2)
+    
+    def dumpStats(self, filePath: str) -> bool:
+        if self.cprofile is None:
+            return False
+        self.cprofile.dump_stats(filePath)
+        if self.cprofileRunning:
+            self.cprofile.enable()
+        return True
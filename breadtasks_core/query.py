@@ -0,0 +1,474 @@
+from typing import Dict, List, Optional, Set, Tuple
+import bisect
+import datetime
+import re
+
+from .model import Task, currentStamp
+from .search import SearchIndex
+from .store import TaskStore
+
+TOKEN = re.compile(r'\s*(?:(-?\()|(\))|(-)?(?:([A-Za-z]+):)?(?:"([^"]*)"?|([^\s()"]+)))')
+DATE_VALUE = re.compile(r"(>=|<=|>|<|=)?(.*)")
+RELATIVE_AGE = re.compile(r"(\d+)([mhdw])")
+AGE_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+TRUE_VALUES = {"1", "true", "yes", "y", "done"}
+FALSE_VALUES = {"0", "false", "no", "n", "open"}
+FIELDS = {
+    'cat': "category", 'category': "category",
+    'done': "done", 'completed': "done",
+    'created': "created", 'modified': "modified",
+    'text': "text"
+}
+
+def toStamp(moment: datetime.datetime) -> int:
+    return int(moment.strftime("%Y%m%d%H%M"))
+
+class QueryNode:
+    cost = 0
+    relative = False
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        raise NotImplementedError
+    
+    def estimate(self, engine: "QueryEngine") -> int:
+        return len(engine.store)
+    
+    def matches(self, task: Task) -> bool:
+        raise NotImplementedError
+
+class CategoryTerm(QueryNode):
+    cost = 0
+    
+    def __init__(self, name: str):
+        self.name = name.casefold()
+    
+    def __repr__(self) -> str:
+        return f"cat:{self.name}"
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        buckets = self._buckets(engine)
+        matched = set(buckets[0]) if len(buckets) == 1 else set().union(*buckets)
+        if candidates is None:
+            return matched
+        return candidates & matched
+    
+    def _buckets(self, engine: "QueryEngine") -> List[Set[int]]:
+        return [ids for category, ids in engine.store.categoryIds.items() if category.casefold() == self.name]
+    
+    def estimate(self, engine: "QueryEngine") -> int:
+        return sum(len(ids) for ids in self._buckets(engine))
+    
+    def matches(self, task: Task) -> bool:
+        return task.category.casefold() == self.name
+
+class DoneTerm(QueryNode):
+    cost = 1
+    
+    def __init__(self, completed: bool):
+        self.completed = completed
+    
+    def __repr__(self) -> str:
+        return f"done:{str(self.completed).lower()}"
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        completedIds = engine.completedIds()
+        if candidates is None:
+            candidates = engine.store.tasksById.keys()
+        if self.completed:
+            return candidates & completedIds
+        return candidates - completedIds
+    
+    def estimate(self, engine: "QueryEngine") -> int:
+        completed = len(engine.completedIds())
+        return completed if self.completed else len(engine.store) - completed
+    
+    def matches(self, task: Task) -> bool:
+        return task.completed == self.completed
+
+class DateTerm(QueryNode):
+    cost = 2
+    
+    def __init__(self, field: str, low: Optional[int], high: Optional[int], relative: bool):
+        self.field = field
+        self.low = low
+        self.high = high
+        self.relative = relative
+    
+    def __repr__(self) -> str:
+        return f"{self.field}:[{self.low}, {self.high})"
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        index = engine.dateIndex(self.field)
+        start, end = index.bounds(self.low, self.high)
+        if candidates is None:
+            return index.ids(start, end)
+        if len(candidates) < end - start:
+            get = engine.store.get
+            return {taskId for taskId in candidates if self.matches(get(taskId))}
+        return candidates & index.ids(start, end)
+    
+    def estimate(self, engine: "QueryEngine") -> int:
+        start, end = engine.dateIndex(self.field).bounds(self.low, self.high)
+        return end - start
+    
+    def matches(self, task: Task) -> bool:
+        stamp = task.createdStamp if self.field == "created" else task.modifiedStamp
+        if stamp is None:
+            return False
+        return (self.low is None or stamp >= self.low) and (self.high is None or stamp < self.high)
+
+class TextTerm(QueryNode):
+    cost = 4
+    SCAN_LIMIT = 4096
+    
+    def __init__(self, text: str):
+        self.text = text.lower()
+    
+    def __repr__(self) -> str:
+        return f"text:{self.text!r}"
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        if candidates is not None and len(candidates) <= max(self.SCAN_LIMIT, len(engine.store) // 4):
+            return engine.searchIndex.filter(self.text, candidates)
+        matched = engine.textIds(self.text)
+        if candidates is None:
+            return matched
+        return candidates & matched
+    
+    def matches(self, task: Task) -> bool:
+        return self.text in task.text.lower()
+
+class NotNode(QueryNode):
+    def __init__(self, child: QueryNode):
+        self.child = child
+        self.cost = child.cost + 1
+        self.relative = child.relative
+    
+    def __repr__(self) -> str:
+        return f"NOT {self.child!r}"
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        if candidates is None:
+            candidates = engine.store.tasksById.keys()
+        return candidates - self.child.filter(engine, candidates)
+    
+    def matches(self, task: Task) -> bool:
+        return not self.child.matches(task)
+
+class AndNode(QueryNode):
+    def __init__(self, children: List[QueryNode]):
+        self.children = sorted(children, key=lambda child: child.cost)
+        self.cost = self.children[0].cost
+        self.indexed = sum(1 for child in self.children if child.cost < TextTerm.cost)
+        self.relative = any(child.relative for child in children)
+    
+    def __repr__(self) -> str:
+        return "(" + " AND ".join(repr(child) for child in self.children) + ")"
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        children = self.children
+        if self.indexed > 1:
+            indexed = sorted(children[:self.indexed], key=lambda child: child.estimate(engine))
+            children = indexed + children[self.indexed:]
+        for child in children:
+            candidates = child.filter(engine, candidates)
+            if not candidates:
+                return set()
+        return candidates
+    
+    def estimate(self, engine: "QueryEngine") -> int:
+        return min(child.estimate(engine) for child in self.children)
+    
+    def matches(self, task: Task) -> bool:
+        return all(child.matches(task) for child in self.children)
+
+class OrNode(QueryNode):
+    def __init__(self, children: List[QueryNode]):
+        self.children = children
+        self.cost = max(child.cost for child in children)
+        self.relative = any(child.relative for child in children)
+    
+    def __repr__(self) -> str:
+        return "(" + " OR ".join(repr(child) for child in self.children) + ")"
+    
+    def filter(self, engine: "QueryEngine", candidates: Optional[Set[int]]) -> Set[int]:
+        matched = set()
+        for child in self.children:
+            matched |= child.filter(engine, candidates)
+        return matched
+    
+    def estimate(self, engine: "QueryEngine") -> int:
+        return min(len(engine.store), sum(child.estimate(engine) for child in self.children))
+    
+    def matches(self, task: Task) -> bool:
+        return any(child.matches(task) for child in self.children)
+
+def parseDateRange(value: str, now: datetime.datetime) -> Optional[Tuple[Optional[int], Optional[int], bool]]:
+    try:
+        return _dateBounds(value, now)
+    except OverflowError:
+        return None
+
+def _dateBounds(value: str, now: datetime.datetime) -> Optional[Tuple[Optional[int], Optional[int], bool]]:
+    operator, value = DATE_VALUE.fullmatch(value).groups()
+    value = value.strip().lower()
+    
+    relative = RELATIVE_AGE.fullmatch(value)
+    if relative is not None:
+        cutoff = toStamp(now - datetime.timedelta(**{AGE_UNITS[relative.group(2)]: int(relative.group(1))}))
+        if operator in (">", ">="):
+            return None, cutoff, True
+        return cutoff, None, True
+    
+    if value in ("today", "yesterday"):
+        start = datetime.datetime.combine(now.date(), datetime.time())
+        if value == "yesterday":
+            start -= datetime.timedelta(days=1)
+        isRelative = True
+    else:
+        try:
+            start = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        isRelative = False
+    
+    hasTime = ":" in value
+    end = start + (datetime.timedelta(minutes=1) if hasTime else datetime.timedelta(days=1))
+    if operator == ">":
+        return toStamp(end), None, isRelative
+    if operator == ">=":
+        return toStamp(start), None, isRelative
+    if operator == "<":
+        return None, toStamp(start), isRelative
+    if operator == "<=":
+        return None, toStamp(end), isRelative
+    return toStamp(start), toStamp(end), isRelative
+
+def compileTerm(field: Optional[str], value: str, raw: str, now: datetime.datetime) -> Optional[QueryNode]:
+    kind = FIELDS.get(field.lower()) if field else "text"
+    if kind == "category" and value:
+        return CategoryTerm(value)
+    if kind == "done":
+        if value.lower() in TRUE_VALUES:
+            return DoneTerm(True)
+        if value.lower() in FALSE_VALUES:
+            return DoneTerm(False)
+    elif kind in ("created", "modified"):
+        dateRange = parseDateRange(value, now)
+        if dateRange is not None:
+            return DateTerm(kind, *dateRange)
+    elif kind == "text":
+        return TextTerm(value) if value else None
+    return TextTerm(raw)
+
+class QueryParser:
+    def __init__(self, query: str, now: Optional[datetime.datetime] = None):
+        self.tokens = self._tokenize(query)
+        self.position = 0
+        self.now = now or datetime.datetime.now()
+    
+    def _tokenize(self, query: str) -> List[tuple]:
+        tokens = []
+        position = 0
+        query = query.strip()
+        while position < len(query):
+            match = TOKEN.match(query, position)
+            if match is None or match.end() == position:
+                position += 1
+                continue
+            position = match.end()
+            opening, closing, negated, field, quoted, bare = match.groups()
+            if opening:
+                if opening == "-(":
+                    tokens.append(("NOT",))
+                tokens.append(("(",))
+            elif closing:
+                tokens.append((")",))
+            elif quoted is None and field is None and bare in ("OR", "|"):
+                tokens.append(("OR",))
+            elif quoted is None and field is None and bare in ("NOT", "AND"):
+                tokens.append((bare,))
+            else:
+                value = quoted if quoted is not None else bare
+                raw = match.group(0).strip()[1 if negated else 0:]
+                tokens.append(("TERM", bool(negated), field, value, raw))
+        return tokens
+    
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+    
+    def parse(self) -> Optional[QueryNode]:
+        node = self._or()
+        while self.position < len(self.tokens):
+            self.position += 1
+            rest = self._or()
+            if rest is not None:
+                node = rest if node is None else AndNode([node, rest])
+        return node
+    
+    def _or(self) -> Optional[QueryNode]:
+        children = []
+        while True:
+            node = self._and()
+            if node is not None:
+                children.append(node)
+            if self._peek() != "OR":
+                break
+            self.position += 1
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else OrNode(children)
+    
+    def _and(self) -> Optional[QueryNode]:
+        children = []
+        while self._peek() not in (None, "OR", ")"):
+            node = self._unary()
+            if node is not None:
+                children.append(node)
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else AndNode(children)
+    
+    def _unary(self) -> Optional[QueryNode]:
+        token = self.tokens[self.position]
+        self.position += 1
+        if token[0] == "AND":
+            return None
+        if token[0] == "NOT":
+            if self._peek() in (None, "OR", ")"):
+                return None
+            node = self._unary()
+            return NotNode(node) if node is not None else None
+        if token[0] == "(":
+            node = self._or()
+            if self._peek() == ")":
+                self.position += 1
+            return node
+        
+        node = compileTerm(token[2], token[3], token[4], self.now)
+        if node is not None and token[1]:
+            return NotNode(node)
+        return node
+
+def parseQuery(query: str, now: Optional[datetime.datetime] = None) -> Optional[QueryNode]:
+    return QueryParser(query, now).parse()
+
+class DateIndex:
+    __slots__ = ('keys',)
+    
+    def __init__(self, keys: List[Tuple[int, int]]):
+        self.keys = keys
+    
+    def add(self, key: Tuple[int, int]):
+        bisect.insort(self.keys, key)
+    
+    def discard(self, key: Tuple[int, int]):
+        keys = self.keys
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+    
+    def bounds(self, low: Optional[int], high: Optional[int]) -> Tuple[int, int]:
+        keys = self.keys
+        start = 0 if low is None else bisect.bisect_left(keys, (low,))
+        end = len(keys) if high is None else bisect.bisect_left(keys, (high,))
+        return start, end
+    
+    def ids(self, start: int, end: int) -> Set[int]:
+        return {key[1] for key in self.keys[start:end]}
+
+class QueryEngine:
+    MAX_CACHED = 64
+    STAMP_FIELDS = {'created': 'createdStamp', 'modified': 'modifiedStamp'}
+    
+    def __init__(self, store: TaskStore, searchIndex: Optional[SearchIndex] = None):
+        self.store = store
+        self.searchIndex = searchIndex or SearchIndex(store)
+        self.generation = 0
+        self.cachedGeneration = 0
+        self.results: Dict[str, Tuple[Optional[QueryNode], int, Set[int]]] = {}
+        self.texts: Dict[str, Set[int]] = {}
+        self.completed: Optional[Set[int]] = None
+        self.dateIndexes: Dict[str, DateIndex] = {}
+        store.subscribe(self.onStoreChange)
+    
+    def onStoreChange(self, event: str, task: Optional[Task], changes: Optional[dict]):
+        if event in ("add", "remove", "update"):
+            self.generation += 1
+            self.completed = None
+            for field, index in self.dateIndexes.items():
+                stampName = self.STAMP_FIELDS[field]
+                if event == "update":
+                    if stampName not in changes:
+                        continue
+                    index.discard((changes[stampName], task.id))
+                elif event == "remove":
+                    index.discard((getattr(task, stampName), task.id))
+                    continue
+                index.add((getattr(task, stampName), task.id))
+        elif event == "reset":
+            self.generation += 1
+            self.completed = None
+            self.dateIndexes = {}
+    
+    def _checkGeneration(self):
+        if self.cachedGeneration != self.generation:
+            self.cachedGeneration = self.generation
+            self.results = {}
+            self.texts = {}
+    
+    def completedIds(self) -> Set[int]:
+        if self.completed is None:
+            completedIds = self.store.completedIds
+            self.completed = set().union(*completedIds.values()) if completedIds else set()
+        return self.completed
+    
+    def dateIndex(self, field: str) -> DateIndex:
+        index = self.dateIndexes.get(field)
+        if index is None:
+            stampName = self.STAMP_FIELDS[field]
+            store = self.store
+            index = DateIndex(sorted(
+                (getattr(store.get(taskId), stampName), taskId) for taskId in store.tasksById
+            ))
+            self.dateIndexes[field] = index
+        return index
+    
+    def textIds(self, text: str) -> Set[int]:
+        matched = self.texts.get(text)
+        if matched is None:
+            matched = set(self.searchIndex.search(text))
+            self._remember(self.texts, text, matched)
+        return matched
+    
+    def _remember(self, cache: dict, key: str, value):
+        if len(cache) >= self.MAX_CACHED:
+            del cache[next(iter(cache))]
+        cache[key] = value
+    
+    def search(self, query: str) -> Set[int]:
+        self._checkGeneration()
+        cached = self.results.get(query)
+        if cached is not None:
+            plan, stamp, results = cached
+            if plan is None or not plan.relative or stamp == currentStamp():
+                return results
+        
+        stamp = currentStamp()
+        plan = parseQuery(query)
+        if plan is None:
+            results = set(self.store.tasksById)
+        else:
+            results = plan.filter(self, None)
+            if not isinstance(results, set):
+                results = set(results)
+        self._remember(self.results, query, (plan, stamp, results))
+        return results
+    
+    def matches(self, task: Task, query: str) -> bool:
+        cached = self.results.get(query)
+        plan = cached[0] if cached is not None else parseQuery(query)
+        return plan is None or plan.matches(task)
+    
+    def explain(self, query: str) -> str:
+        return repr(parseQuery(query))
@@ -0,0 +1,410 @@
+from typing import Dict, List, Optional, Set, Tuple
+from bisect import bisect_right
+from contextlib import contextmanager
+import socket
+import uuid
+import os
+
+from .model import Task, currentStamp, normalizeTaskDict, parseTimestamp
+from .shared import FIELD_KEYS, mergeCategories
+from .storage import readJsonFile, writeJsonAtomic
+from .store import TaskStore
+
+REPLICA_SUFFIX = ".replica.json"
+TASK_FIELDS = ('text', 'completed', 'createdAt', 'category', 'lastModified')
+FIXED_CATEGORIES = ("All", "Uncategorized")
+LEGACY_STAMP = [0, ""]
+
+def replicaPath(dataPath: str) -> str:
+    return os.path.splitext(dataPath)[0] + REPLICA_SUFFIX
+
+def replicaOwner(dataPath: str) -> str:
+    return f"{socket.gethostname()}:{os.path.abspath(dataPath)}"
+
+def isNewer(register: list, current: Optional[list]) -> bool:
+    if current is None:
+        return True
+    if register[:2] != current[:2]:
+        return register[:2] > current[:2]
+    return str(register[-1]) > str(current[-1])
+
+class Replica:
+    def __init__(self, store: TaskStore, replicaId: Optional[str] = None):
+        self.store = store
+        self.replicaId = replicaId or uuid.uuid4().hex[:12]
+        self.counter = 0
+        self.seen: Dict[str, int] = {}
+        self.uids: Dict[int, str] = {}
+        self.ids: Dict[str, int] = {}
+        self.fields: Dict[str, Dict[str, list]] = {}
+        self.deleted: Dict[str, list] = {}
+        self.categories: Dict[str, list] = {}
+        self.renames: Dict[str, list] = {}
+        self.log: Dict[str, List[Tuple[int, str, object]]] = {}
+        self.logCounters: Dict[str, List[int]] = {}
+        self.unsorted: Set[str] = set()
+        self.knownCategories = set(store.categories)
+        self.renaming: Optional[Tuple[str, str]] = None
+        self.muted = 0
+        self.path: Optional[str] = None
+        self.owner: Optional[str] = None
+        store.subscribe(self.onStoreChange)
+    
+    @contextmanager
+    def paused(self):
+        self.muted += 1
+        try:
+            yield self
+        finally:
+            self.muted -= 1
+            if not self.muted:
+                self.knownCategories = set(self.store.categories)
+    
+    def uidOf(self, taskId: int) -> str:
+        return self.uids.get(taskId, str(taskId))
+    
+    def idOf(self, uid: str) -> Optional[int]:
+        if uid in self.ids:
+            return self.ids[uid]
+        if uid.isdigit() and int(uid) not in self.uids:
+            return int(uid)
+        return None
+    
+    def _bind(self, taskId: int, uid: str):
+        self._unbind(taskId)
+        if uid != str(taskId):
+            self.uids[taskId] = uid
+            self.ids[uid] = taskId
+    
+    def _unbind(self, taskId: int):
+        uid = self.uids.pop(taskId, None)
+        if uid is not None:
+            self.ids.pop(uid, None)
+    
+    def _tick(self) -> list:
+        self.counter += 1
+        self.seen[self.replicaId] = self.counter
+        return [self.counter, self.replicaId]
+    
+    def _log(self, stamp: list, kind: str, key):
+        counter, replica = stamp[0], stamp[1]
+        if not counter:
+            return
+        counters = self.logCounters.setdefault(replica, [])
+        if counters and counters[-1] > counter:
+            self.unsorted.add(replica)
+        counters.append(counter)
+        self.log.setdefault(replica, []).append((counter, kind, key))
+    
+    def _sortLogs(self):
+        for replica in self.unsorted:
+            entries = sorted(self.log[replica], key=lambda entry: entry[0])
+            self.log[replica] = entries
+            self.logCounters[replica] = [entry[0] for entry in entries]
+        self.unsorted = set()
+    
+    def _setField(self, uid: str, field: str, value, stamp: list):
+        self.fields.setdefault(uid, {})[field] = [stamp[0], stamp[1], value]
+        self._log(stamp, "field", (uid, field))
+    
+    def _delete(self, uid: str, stamp: list):
+        self.deleted[uid] = list(stamp)
+        self.fields.pop(uid, None)
+        self._log(stamp, "del", uid)
+    
+    def _setCategory(self, name: str, present: bool, stamp: list):
+        self.categories[name] = [stamp[0], stamp[1], present]
+        self._log(stamp, "category", name)
+    
+    def _stampTask(self, task: Task, stamp: list) -> str:
+        uid = f"{stamp[0]}@{stamp[1]}"
+        self._bind(task.id, uid)
+        values = task.toDict()
+        for field in TASK_FIELDS:
+            self._setField(uid, field, values[field], stamp)
+        return uid
+    
+    def onStoreChange(self, event: str, task: Optional[Task], changes: Optional[dict]):
+        if self.muted:
+            return
+        if event == "add":
+            self._stampTask(task, self._tick())
+        elif event == "update":
+            uid = self.uidOf(task.id)
+            fields = [FIELD_KEYS[name] for name in changes]
+            if self.renaming is not None and changes.get('category') == self.renaming[0]:
+                fields.remove('category')
+                self.fields.setdefault(uid, {}).setdefault('category', LEGACY_STAMP + [self.renaming[0]])
+            if fields:
+                stamp = self._tick()
+                values = task.toDict()
+                for field in fields:
+                    self._setField(uid, field, values[field], stamp)
+        elif event == "remove":
+            self._delete(self.uidOf(task.id), self._tick())
+            self._unbind(task.id)
+        elif event == "rename":
+            oldName, newName = changes['category']
+            stamp = self._tick()
+            self.renames[oldName] = [stamp[0], stamp[1], newName]
+            self._log(stamp, "rename", oldName)
+            self._setCategory(oldName, False, stamp)
+            self._setCategory(newName, True, stamp)
+            self.knownCategories.discard(oldName)
+            self.knownCategories.add(newName)
+            self.renaming = (oldName, newName)
+        elif event == "categories":
+            self.renaming = None
+            self._stampCategories()
+        elif event == "reset":
+            self.reconcile()
+    
+    def _stampCategories(self):
+        current = set(self.store.categories)
+        stamp = None
+        for name in sorted(current ^ self.knownCategories):
+            if name in FIXED_CATEGORIES:
+                continue
+            stamp = stamp or self._tick()
+            self._setCategory(name, name in current, stamp)
+        self.knownCategories = current
+    
+    def reconcile(self, since: Optional[int] = None):
+        store = self.store
+        for taskId in [taskId for taskId in self.uids if taskId not in store]:
+            self._delete(self.uids[taskId], self._tick())
+            self._unbind(taskId)
+        
+        for taskId, value in list(store.tasksById.items()):
+            uid = self.uidOf(taskId)
+            if uid in self.deleted:
+                self._stampTask(store.get(taskId), self._tick())
+                continue
+            if since is None:
+                continue
+            if type(value) is dict:
+                modified = parseTimestamp(value.get('lastModified') or value.get('createdAt'))
+            else:
+                modified = value.modifiedStamp
+            if modified is None or modified < since:
+                continue
+            
+            registers = self.fields.get(uid, {})
+            values = store.get(taskId).toDict()
+            fields = [field for field in TASK_FIELDS
+                      if (field in registers and registers[field][2] != values[field])
+                      or (field not in registers and modified > since)]
+            if fields:
+                stamp = self._tick()
+                for field in fields:
+                    self._setField(uid, field, values[field], stamp)
+        
+        current = set(store.categories)
+        self.knownCategories = {name for name, register in self.categories.items() if register[2]} | (
+            current - self.categories.keys())
+        self._stampCategories()
+    
+    def resolveCategory(self, name: str) -> str:
+        visited = set()
+        while name not in visited:
+            visited.add(name)
+            register = self.categories.get(name)
+            if register is None or register[2] or name in FIXED_CATEGORIES:
+                return name
+            rename = self.renames.get(name)
+            if rename is None:
+                return "Uncategorized"
+            name = rename[2]
+        return "Uncategorized"
+    
+    def _register(self, uid: str, field: str, task: Optional[Task]) -> Optional[list]:
+        register = self.fields.get(uid, {}).get(field)
+        if register is None and task is not None:
+            return LEGACY_STAMP + [task.toDict()[field]]
+        return register
+    
+    def delta(self, seen: Optional[Dict[str, int]] = None) -> dict:
+        self._sortLogs()
+        full = not seen or not self.seen.keys() & seen.keys()
+        seen = {} if full else seen
+        tasks: Dict[str, Dict[str, list]] = {}
+        deleted: Dict[str, list] = {}
+        categories: Dict[str, list] = {}
+        renames: Dict[str, list] = {}
+        for replica, entries in self.log.items():
+            start = bisect_right(self.logCounters[replica], seen.get(replica, 0))
+            for counter, kind, key in entries[start:]:
+                if kind == "field":
+                    register = self.fields.get(key[0], {}).get(key[1])
+                    target = tasks.setdefault(key[0], {}) if register is not None else None
+                    key = key[1]
+                elif kind == "del":
+                    register, target = self.deleted.get(key), deleted
+                elif kind == "category":
+                    register, target = self.categories.get(key), categories
+                else:
+                    register, target = self.renames.get(key), renames
+                if register is not None and register[0] == counter and register[1] == replica:
+                    target[key] = register
+        
+        if full:
+            for task in self.store:
+                uid = self.uidOf(task.id)
+                values = task.toDict()
+                for field in TASK_FIELDS:
+                    register = self.fields.get(uid, {}).get(field)
+                    if register is None or not register[0]:
+                        tasks.setdefault(uid, {})[field] = register or LEGACY_STAMP + [values[field]]
+            for name in self.store.categories:
+                if name not in self.categories and name not in FIXED_CATEGORIES:
+                    categories[name] = LEGACY_STAMP + [True]
+        
+        return {
+            'replica': self.replicaId,
+            'seen': dict(self.seen),
+            'tasks': {uid: registers for uid, registers in tasks.items() if registers},
+            'deleted': deleted,
+            'categories': categories,
+            'renames': renames
+        }
+    
+    def merge(self, delta: dict) -> Tuple[List[Task], List[Task], bool]:
+        store = self.store
+        affected: Set[str] = set()
+        
+        for uid, stamp in delta.get('deleted', {}).items():
+            if isNewer(stamp, self.deleted.get(uid)):
+                self._delete(uid, stamp)
+                affected.add(uid)
+        
+        for uid, registers in delta.get('tasks', {}).items():
+            if uid in self.deleted:
+                continue
+            taskId = self.idOf(uid)
+            task = store.get(taskId) if taskId is not None else None
+            for field, register in registers.items():
+                if field in TASK_FIELDS and isNewer(register, self._register(uid, field, task)):
+                    self.fields.setdefault(uid, {})[field] = list(register)
+                    self._log(register, "field", (uid, field))
+                    affected.add(uid)
+        
+        categories = {name: register for name, register in delta.get('categories', {}).items()
+                      if name not in FIXED_CATEGORIES and isNewer(register, self.categories.get(name))}
+        renames = {name: register for name, register in delta.get('renames', {}).items()
+                   if isNewer(register, self.renames.get(name))}
+        touchedCategories = {self.resolveCategory(name) for name in categories.keys() | renames.keys()}
+        for name, register in categories.items():
+            self.categories[name] = list(register)
+            self._log(register, "category", name)
+            touchedCategories.add(name)
+        for name, register in renames.items():
+            self.renames[name] = list(register)
+            self._log(register, "rename", name)
+            touchedCategories.update((name, register[2]))
+        
+        for replica, counter in delta.get('seen', {}).items():
+            self.seen[replica] = max(self.seen.get(replica, 0), counter)
+        self.counter = max(self.counter, max(self.seen.values(), default=0))
+        return self._materialize(affected, touchedCategories)
+    
+    def _values(self, uid: str, task: Optional[Task]) -> Optional[dict]:
+        values = task.toDict() if task is not None else {}
+        for field, register in self.fields.get(uid, {}).items():
+            values[field] = register[2]
+        if any(field not in values for field in TASK_FIELDS):
+            return None
+        values['category'] = self.resolveCategory(values['category'])
+        return values
+    
+    def _materialize(self, uids: Set[str], categoryNames: Set[str]) -> Tuple[List[Task], List[Task], bool]:
+        store = self.store
+        changed: List[Task] = []
+        removed: List[Task] = []
+        for name in categoryNames:
+            uids.update(self.uidOf(task.id) for task in store.inCategory(name))
+        
+        with self.paused(), store.transaction():
+            for uid in uids:
+                taskId = self.idOf(uid)
+                task = store.get(taskId) if taskId is not None else None
+                if uid in self.deleted:
+                    if task is not None:
+                        removed.append(store.remove(taskId))
+                        self._unbind(taskId)
+                    continue
+                
+                if task is not None:
+                    self.fields.setdefault(uid, {}).setdefault('category', LEGACY_STAMP + [task.category])
+                values = self._values(uid, task)
+                if values is None:
+                    continue
+                if task is None:
+                    if taskId is None or taskId in store or taskId in self.uids:
+                        taskId = store.allocateId()
+                    task = store.add(Task(**normalizeTaskDict({'id': taskId, **values})))
+                    self._bind(taskId, uid)
+                    changed.append(task)
+                elif store.update(task, touch=False, **values):
+                    changed.append(task)
+            
+            present = [name for name in store.categories
+                       if self.categories.get(name, LEGACY_STAMP + [True])[2] or name in FIXED_CATEGORIES]
+            present += sorted(name for name in categoryNames
+                              if name not in present and self.categories.get(name, LEGACY_STAMP + [False])[2])
+            categoriesChanged = mergeCategories(store, present, dict.fromkeys(task.category for task in changed))
+        
+        self.knownCategories = set(store.categories)
+        return changed, removed, categoriesChanged
+    
+    def toDict(self) -> dict:
+        return {
+            'replica': self.replicaId,
+            'counter': self.counter,
+            'savedAt': currentStamp(),
+            'seen': self.seen,
+            'uids': {str(taskId): uid for taskId, uid in self.uids.items()},
+            'fields': self.fields,
+            'deleted': self.deleted,
+            'categories': self.categories,
+            'renames': self.renames
+        }
+    
+    @classmethod
+    def fromDict(cls, store: TaskStore, data: dict, replicaId: Optional[str] = None) -> "Replica":
+        replica = cls(store, replicaId or data.get('replica'))
+        replica.counter = data.get('counter', 0)
+        replica.seen = dict(data.get('seen', {}))
+        replica.fields = data.get('fields', {})
+        replica.deleted = data.get('deleted', {})
+        replica.categories = data.get('categories', {})
+        replica.renames = data.get('renames', {})
+        for taskId, uid in data.get('uids', {}).items():
+            replica._bind(int(taskId), uid)
+        
+        for uid, registers in replica.fields.items():
+            for field, register in registers.items():
+                replica._log(register, "field", (uid, field))
+        for kind, registers in (("del", replica.deleted), ("category", replica.categories), ("rename", replica.renames)):
+            for key, register in registers.items():
+                replica._log(register, kind, key)
+        replica._sortLogs()
+        return replica
+    
+    @classmethod
+    def load(cls, store: TaskStore, dataPath: str) -> "Replica":
+        path = replicaPath(dataPath)
+        if not os.path.exists(path):
+            replica = cls(store)
+        else:
+            data = readJsonFile(path)
+            owned = data.get('owner') == replicaOwner(dataPath)
+            replica = cls.fromDict(store, data, None if owned else uuid.uuid4().hex[:12])
+            replica.reconcile(data.get('savedAt'))
+        replica.path = path
+        replica.owner = replicaOwner(dataPath)
+        return replica
+    
+    def save(self, path: Optional[str] = None):
+        data = self.toDict()
+        data['owner'] = self.owner
+        writeJsonAtomic(path or self.path, data)
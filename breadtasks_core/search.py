@@ -0,0 +1,127 @@
+from typing import Dict, Iterable, Optional, Set
+
+from .model import Task
+from .store import TaskStore
+
+class SearchIndex:
+    GRAM_SIZE = 3
+    
+    def __init__(self, store: TaskStore):
+        self.store = store
+        self.texts: Optional[Dict[int, str]] = None
+        self.grams: Optional[Dict[str, Set[int]]] = None
+        self.lastQuery = ""
+        self.lastResults: Optional[Set[int]] = None
+        store.subscribe(self.onStoreChange)
+    
+    def _gramsOf(self, text: str) -> Set[str]:
+        size = self.GRAM_SIZE
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+    
+    def rebuild(self):
+        self.texts = None
+        self.grams = None
+        self.lastQuery = ""
+        self.lastResults = None
+    
+    def _buildTexts(self):
+        self.texts = {}
+        for taskId, task in self.store.tasksById.items():
+            text = task['text'] if type(task) is dict else task.text
+            self.texts[taskId] = text.lower()
+    
+    def _buildGrams(self):
+        self.grams = {}
+        for taskId, text in self.texts.items():
+            for gram in self._gramsOf(text):
+                self.grams.setdefault(gram, set()).add(taskId)
+    
+    def add(self, task: Task):
+        if self.texts is None:
+            return
+        
+        text = task.text.lower()
+        self.texts[task.id] = text
+        
+        if self.grams is not None:
+            for gram in self._gramsOf(text):
+                self.grams.setdefault(gram, set()).add(task.id)
+        
+        if self.lastResults is not None:
+            if self.lastQuery in text:
+                self.lastResults.add(task.id)
+            else:
+                self.lastResults.discard(task.id)
+    
+    def remove(self, taskId: int):
+        if self.texts is None:
+            return
+        
+        text = self.texts.pop(taskId, None)
+        if text is None:
+            return
+        
+        if self.grams is not None:
+            for gram in self._gramsOf(text):
+                bucket = self.grams.get(gram)
+                if bucket is not None:
+                    bucket.discard(taskId)
+                    if not bucket:
+                        del self.grams[gram]
+        
+        if self.lastResults is not None:
+            self.lastResults.discard(taskId)
+    
+    def update(self, task: Task):
+        if self.texts is not None and self.texts.get(task.id) != task.text.lower():
+            self.remove(task.id)
+            self.add(task)
+    
+    def _candidates(self, query: str) -> Iterable[int]:
+        if len(query) < self.GRAM_SIZE:
+            return self.texts.keys()
+        
+        if self.grams is None:
+            self._buildGrams()
+        
+        buckets = sorted((self.grams.get(gram, set()) for gram in self._gramsOf(query)), key=len)
+        candidates = set(buckets[0])
+        for bucket in buckets[1:]:
+            if not candidates:
+                break
+            candidates &= bucket
+        return candidates
+    
+    def filter(self, query: str, taskIds: Iterable[int]) -> Set[int]:
+        query = query.lower()
+        if self.texts is None:
+            self._buildTexts()
+        texts = self.texts
+        return {taskId for taskId in taskIds if query in texts[taskId]}
+    
+    def onStoreChange(self, event: str, task: Optional[Task], changes: Optional[dict]):
+        if event == "add":
+            self.add(task)
+        elif event == "remove":
+            self.remove(task.id)
+        elif event == "update" and 'text' in changes:
+            self.update(task)
+        elif event == "reset":
+            self.rebuild()
+    
+    def search(self, query: str) -> Set[int]:
+        query = query.lower()
+        if self.texts is None:
+            self._buildTexts()
+        
+        if self.lastResults is not None and self.lastQuery in query:
+            candidates = self.lastResults
+        else:
+            candidates = self._candidates(query)
+        
+        texts = self.texts
+        results = {taskId for taskId in candidates if query in texts[taskId]}
+        
+        self.lastQuery = query
+        self.lastResults = results
+        return results
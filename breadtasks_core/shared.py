@@ -0,0 +1,129 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from contextlib import contextmanager
+
+from .model import Task, normalizeTaskDict
+from .storage import TASK_KEYS
+from .store import TaskStore
+
+FIELD_KEYS = {
+    'text': 'text',
+    'completed': 'completed',
+    'category': 'category',
+    'createdStamp': 'createdAt',
+    'modifiedStamp': 'lastModified'
+}
+
+class ChangeTracker:
+    def __init__(self, store: TaskStore):
+        self.store = store
+        self.dirty: Dict[int, Optional[Set[str]]] = {}
+        self.muted = 0
+        store.subscribe(self.onStoreChange)
+    
+    def onStoreChange(self, event: str, task: Optional[Task], changes: Optional[dict]):
+        if self.muted:
+            return
+        if event == "add":
+            self.dirty[task.id] = None
+        elif event == "update":
+            if task.id in self.dirty and self.dirty[task.id] is None:
+                return
+            fields = self.dirty.setdefault(task.id, set())
+            fields.update(FIELD_KEYS[name] for name in changes)
+        elif event == "remove":
+            self.dirty.pop(task.id, None)
+        elif event == "reset":
+            self.dirty = {}
+    
+    @contextmanager
+    def paused(self):
+        self.muted += 1
+        try:
+            yield self
+        finally:
+            self.muted -= 1
+    
+    def record(self, task: Task) -> dict:
+        if task.id not in self.dirty:
+            return task.toDict()
+        fields = self.dirty.pop(task.id)
+        if fields is None:
+            return task.toDict()
+        return task.toPatch(sorted(fields))
+    
+    def records(self, tasks: Iterable[Task]) -> List[dict]:
+        return [self.record(task) for task in tasks]
+
+def _mergeTask(store: TaskStore, taskDict: dict, pending: Set[str], changed: List[Task], create: bool = True):
+    existing = store.get(taskDict['id'])
+    if existing is None:
+        if create and not pending:
+            changed.append(store.add(Task(**normalizeTaskDict(taskDict))))
+        return
+    
+    fields = {key: value for key, value in taskDict.items() if key != 'id' and key not in pending}
+    if fields and store.update(existing, touch=False, **fields):
+        changed.append(existing)
+
+def _mergeSnapshot(store: TaskStore, data: dict, pending: Dict[int, Set[str]],
+                   changed: List[Task], removed: List[Task]):
+    taskDicts = {taskDict['id']: taskDict for taskDict in data.get('tasks', [])}
+    for taskId in [taskId for taskId in store.tasksById if taskId not in taskDicts and taskId not in pending]:
+        removed.append(store.remove(taskId))
+    
+    for taskId, taskDict in taskDicts.items():
+        current = store.get(taskId)
+        if current is None or current.toDict() != normalizeTaskDict(taskDict):
+            _mergeTask(store, normalizeTaskDict(taskDict), pending.get(taskId, set()), changed)
+
+def mergeCategories(store: TaskStore, categories: List[str], extra: Iterable[str] = ()) -> bool:
+    merged = list(categories)
+    for name in store.categories:
+        if name not in merged and store.count(name):
+            merged.append(name)
+    for name in extra:
+        if name not in merged:
+            merged.append(name)
+    return store.setCategories(merged)
+
+def mergeRemoteRecords(store: TaskStore, records: List[dict],
+                       pending: Optional[Dict[int, Set[str]]] = None) -> Tuple[List[Task], List[Task], bool]:
+    pending = pending or {}
+    changed: List[Task] = []
+    removed: List[Task] = []
+    categories = None
+    with store.transaction():
+        for record in records:
+            op = record['op']
+            if op == "put":
+                taskDict = record['task']
+                pendingFields = pending.get(taskDict['id'], set())
+                if not TASK_KEYS <= pendingFields:
+                    _mergeTask(store, taskDict, pendingFields, changed)
+            elif op == "patch":
+                pendingFields = pending.get(record['id'], set())
+                if not TASK_KEYS <= pendingFields:
+                    _mergeTask(store, {'id': record['id'], **record['fields']}, pendingFields, changed, False)
+            elif op == "del":
+                for taskId in record['ids']:
+                    if TASK_KEYS <= pending.get(taskId, set()):
+                        continue
+                    task = store.remove(taskId)
+                    if task is not None:
+                        removed.append(task)
+            elif op == "meta":
+                if 'categories' in record:
+                    categories = record['categories']
+                if 'nextId' in record:
+                    store.nextId = max(store.nextId, record['nextId'])
+            elif op == "reload":
+                _mergeSnapshot(store, record['data'], pending, changed, removed)
+                categories = record['data'].get('categories', categories)
+        
+        known = set(store.categories)
+        taskCategories = [name for name in dict.fromkeys(task.category for task in changed) if name not in known]
+        categoriesChanged = False
+        if categories is not None or taskCategories:
+            categoriesChanged = mergeCategories(store, categories if categories is not None else store.categories,
+                                                taskCategories)
+    return changed, removed, categoriesChanged
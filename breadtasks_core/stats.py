@@ -0,0 +1,83 @@
+from typing import Dict, Optional
+
+from .model import Task
+from .store import TaskStore
+
+class TaskStats:
+    def __init__(self, store: TaskStore):
+        self.store = store
+        store.subscribe(self.onStoreChange)
+        self.rebuild()
+    
+    def rebuild(self):
+        store = self.store
+        self.total = len(store)
+        self.categoryTotals = {category: len(ids) for category, ids in store.categoryIds.items()}
+        self.categoryCompleted = {category: len(ids) for category, ids in store.completedIds.items()}
+        self.completed = sum(self.categoryCompleted.values())
+        self.createdPerDay: Optional[Dict[int, int]] = None
+        self.completedPerDay: Optional[Dict[int, int]] = None
+    
+    def dailyCounts(self):
+        if self.createdPerDay is None:
+            self.createdPerDay = {}
+            self.completedPerDay = {}
+            for task in self.store:
+                self._bump(self.createdPerDay, task.createdStamp // 10000, 1)
+                if task.completed:
+                    self._bump(self.completedPerDay, task.modifiedStamp // 10000, 1)
+        return self.createdPerDay, self.completedPerDay
+    
+    def _bump(self, counts: dict, key, delta: int):
+        value = counts.get(key, 0) + delta
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+    
+    def _apply(self, category: str, completed: bool, createdStamp: Optional[int],
+               modifiedStamp: Optional[int], delta: int):
+        self.total += delta
+        self._bump(self.categoryTotals, category, delta)
+        if createdStamp is not None and self.createdPerDay is not None:
+            self._bump(self.createdPerDay, createdStamp // 10000, delta)
+        
+        if completed:
+            self.completed += delta
+            self._bump(self.categoryCompleted, category, delta)
+            if modifiedStamp is not None and self.completedPerDay is not None:
+                self._bump(self.completedPerDay, modifiedStamp // 10000, delta)
+    
+    def onStoreChange(self, event: str, task: Optional[Task], changes: Optional[dict]):
+        if event == "add":
+            self._apply(task.category, task.completed, task.createdStamp, task.modifiedStamp, 1)
+        elif event == "remove":
+            self._apply(task.category, task.completed, task.createdStamp, task.modifiedStamp, -1)
+        elif event == "update":
+            self._apply(
+                changes.get('category', task.category),
+                changes.get('completed', task.completed),
+                changes.get('createdStamp', task.createdStamp),
+                changes.get('modifiedStamp', task.modifiedStamp),
+                -1
+            )
+            self._apply(task.category, task.completed, task.createdStamp, task.modifiedStamp, 1)
+        elif event == "reset":
+            self.rebuild()
+    
+    def count(self, category: str = "All") -> int:
+        if category == "All":
+            return self.total
+        return self.categoryTotals.get(category, 0)
+    
+    def completedCount(self, category: str = "All") -> int:
+        if category == "All":
+            return self.completed
+        return self.categoryCompleted.get(category, 0)
+    
+    def summary(self) -> dict:
+        return {
+            'totalTasks': self.total,
+            'completedTasks': self.completed,
+            'categoriesCount': len([c for c in self.store.categories if c not in ["All", "Uncategorized"]])
+        }
@@ -0,0 +1,836 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import threading
+import datetime
+import sqlite3
+import socket
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .locking import FileLock
+from .model import normalizeTaskDict
+from .store import TaskStore
+
+META_KEYS = ('categories', 'nextId', 'currentCategory', 'sortMode', 'sortDescending')
+TASK_KEYS = frozenset(('id', 'text', 'completed', 'createdAt', 'category', 'lastModified'))
+
+def parseJson(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def readJsonFile(filePath: str):
+    with open(filePath, 'rb') as f:
+        return parseJson(f.read())
+
+def writeJsonAtomic(filePath: str, data: dict, indent: Optional[int] = None):
+    tempPath = filePath + ".tmp"
+    with open(tempPath, 'w', encoding='utf-8') as f:
+        if indent is None:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tempPath, filePath)
+
+def encodeRecord(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+def changeRecords(changed: List[dict], deleted: List[int], meta: Optional[dict]) -> List[dict]:
+    records = []
+    for taskDict in changed:
+        if TASK_KEYS <= taskDict.keys():
+            records.append({'op': "put", 'task': taskDict})
+        else:
+            fields = {key: value for key, value in taskDict.items() if key != 'id'}
+            records.append({'op': "patch", 'id': taskDict['id'], 'fields': fields})
+    if deleted:
+        records.append({'op': "del", 'ids': list(deleted)})
+    if meta is not None:
+        records.append({'op': "meta", **meta})
+    return records
+
+def fileState(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+def replayRecords(data: dict, records: Iterable[dict]):
+    tasksById = None
+    for record in records:
+        if tasksById is None:
+            tasksById = {taskDict.get('id'): taskDict for taskDict in data.get('tasks', [])}
+        
+        op = record['op']
+        if op == "put":
+            taskDict = record['task']
+            tasksById[taskDict['id']] = taskDict
+        elif op == "patch":
+            taskDict = tasksById.get(record['id'])
+            if taskDict is not None:
+                tasksById[record['id']] = {**taskDict, **record['fields']}
+        elif op == "del":
+            for taskId in record['ids']:
+                tasksById.pop(taskId, None)
+        elif op == "meta":
+            for key in META_KEYS:
+                if key in record and key != 'nextId':
+                    data[key] = record[key]
+            if 'nextId' in record:
+                data['nextId'] = max(data.get('nextId', 1), record['nextId'])
+        elif op == "reserve":
+            data['nextId'] = max(data.get('nextId', 1), record['nextId'])
+        elif op == "release" and data.get('nextId') == record['end']:
+            data['nextId'] = record['start']
+    
+    if tasksById is not None:
+        data['tasks'] = list(tasksById.values())
+
+def shadowRecords(records: List[dict], ownRecords: List[dict]) -> List[dict]:
+    if not ownRecords:
+        return records
+    
+    ownFields: Dict[int, Optional[Set[str]]] = {}
+    ownIndex = len(ownRecords)
+    shadowed = []
+    for record in reversed(records):
+        while ownIndex and ownRecords[ownIndex - 1]['seq'] > record['seq']:
+            ownIndex -= 1
+            own = ownRecords[ownIndex]
+            if own['op'] == "put":
+                ownFields[own['task']['id']] = None
+            elif own['op'] == "del":
+                ownFields.update(dict.fromkeys(own['ids']))
+            elif own['op'] == "patch" and ownFields.get(own['id'], ()) is not None:
+                ownFields[own['id']] = ownFields.get(own['id'], set()) | own['fields'].keys()
+        
+        op = record['op']
+        if op == "reload":
+            newer = ownRecords[ownIndex:]
+            if newer:
+                replayRecords(record['data'], newer)
+        elif op in ("put", "patch") and ownFields:
+            values = record['task'] if op == "put" else record['fields']
+            taskId = values['id'] if op == "put" else record['id']
+            if taskId in ownFields:
+                fields = ownFields[taskId]
+                if fields is None:
+                    continue
+                kept = {key: value for key, value in values.items() if key not in fields and key != 'id'}
+                if not kept:
+                    continue
+                record = {'op': "patch", 'id': taskId, 'fields': kept, 'seq': record['seq']}
+        elif op == "del" and ownFields:
+            ids = [taskId for taskId in record['ids'] if ownFields.get(taskId, ()) is not None]
+            if not ids:
+                continue
+            record = {**record, 'ids': ids}
+        shadowed.append(record)
+    
+    shadowed.reverse()
+    return shadowed
+
+class TaskStorage:
+    POLL_MS = 1000
+    
+    def load(self) -> Optional[dict]:
+        raise NotImplementedError
+    
+    def saveAll(self, data: dict):
+        raise NotImplementedError
+    
+    def applyChanges(self, changed: List[dict], deleted: List[int], meta: Optional[dict]):
+        raise NotImplementedError
+    
+    def reserveIds(self, count: int, floor: int = 1) -> int:
+        return floor
+    
+    def releaseIds(self, start: int, end: int):
+        pass
+    
+    def pollChanges(self, blocking: bool = False) -> Optional[List[dict]]:
+        return None
+    
+    def needsCompaction(self) -> bool:
+        return False
+    
+    def compact(self):
+        pass
+    
+    def close(self):
+        pass
+
+class JsonStorage(TaskStorage):
+    COMPACT_THRESHOLD = 1024 * 1024
+    
+    def __init__(self, snapshotPath: str):
+        self.snapshotPath = snapshotPath
+        basePath = os.path.splitext(snapshotPath)[0]
+        self.journalPath = basePath + ".journal"
+        self.rotatedPath = self.journalPath + ".old"
+        self.fileLock = FileLock(basePath + ".lock")
+        self.seq = 0
+        self.nextId = 1
+        self.journalOffset = 0
+        self.snapshotState: Optional[tuple] = None
+        self.journalState: Optional[tuple] = None
+        self.remoteRecords: List[dict] = []
+        self.ownRecords: List[dict] = []
+    
+    def _loadLocked(self) -> Optional[dict]:
+        self.snapshotState = fileState(self.snapshotPath)
+        if self.snapshotState is None:
+            self.seq = 0
+            self.journalOffset = 0
+            self.journalState = None
+            return None
+        
+        data = readJsonFile(self.snapshotPath)
+        baseSeq = data.get('journalSeq', 0)
+        records = [record for record in self._readRecords(self.rotatedPath) if record['seq'] > baseSeq]
+        journalRecords, self.journalOffset = self._readJournal(0)
+        records.extend(record for record in journalRecords if record['seq'] > baseSeq)
+        self.journalState = fileState(self.journalPath)
+        
+        self.seq = max([baseSeq] + [record['seq'] for record in records])
+        replayRecords(data, records)
+        self.nextId = max(self.nextId, data.get('nextId', 1))
+        return data
+    
+    def load(self) -> Optional[dict]:
+        with self.fileLock:
+            self.remoteRecords = []
+            self.ownRecords = []
+            return self._loadLocked()
+    
+    def _readRecords(self, path: str):
+        if not os.path.exists(path):
+            return
+        
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    yield parseJson(line)
+                except json.JSONDecodeError:
+                    break
+    
+    def _readJournal(self, offset: int) -> Tuple[List[dict], int]:
+        try:
+            with open(self.journalPath, 'rb') as f:
+                f.seek(offset)
+                raw = f.read()
+        except FileNotFoundError:
+            return [], 0
+        
+        end = raw.rfind(b"\n") + 1
+        records = []
+        for line in raw[:end].splitlines():
+            try:
+                records.append(parseJson(line))
+            except json.JSONDecodeError:
+                break
+        return records, offset + end
+    
+    def _reload(self):
+        data = self._loadLocked()
+        self.remoteRecords = [{'op': "reload", 'seq': self.seq, 'data': data or {}}]
+        self.ownRecords = []
+    
+    def _tail(self):
+        snapshotState = fileState(self.snapshotPath)
+        journalState = fileState(self.journalPath)
+        if snapshotState == self.snapshotState and journalState == self.journalState:
+            return
+        
+        baseSeq = 0
+        if snapshotState != self.snapshotState:
+            records, offset = self._readJournal(0)
+            if not records or records[0]['op'] != "base":
+                self._reload()
+                return
+            baseSeq = records[0]['seq']
+            if baseSeq > self.seq:
+                records = list(self._readRecords(self.rotatedPath)) + records
+            self.snapshotState = snapshotState
+        elif journalState is None or self.journalState is None or journalState[0] != self.journalState[0]:
+            records, offset = self._readJournal(0)
+        else:
+            records, offset = self._readJournal(self.journalOffset)
+        
+        self.journalOffset = offset
+        self.journalState = journalState if journalState is not None and offset == journalState[1] else None
+        fresh = [record for record in records if record['seq'] > self.seq and record['op'] != "base"]
+        contiguous = all(record['seq'] == self.seq + i + 1 for i, record in enumerate(fresh))
+        if not contiguous or self.seq + len(fresh) < baseSeq:
+            self._reload()
+            return
+        if not fresh:
+            return
+        
+        self.seq = fresh[-1]['seq']
+        self._trackIds(fresh)
+        self.remoteRecords.extend(fresh)
+    
+    def _trackIds(self, records: List[dict]):
+        for record in records:
+            op = record['op']
+            if op == "reserve" or (op == "meta" and 'nextId' in record):
+                self.nextId = max(self.nextId, record['nextId'])
+            elif op == "release" and self.nextId == record['end']:
+                self.nextId = record['start']
+            elif op == "put":
+                self.nextId = max(self.nextId, record['task']['id'] + 1)
+    
+    def _write(self, records: List[dict]):
+        lines = []
+        for record in records:
+            if record['op'] != "base":
+                self.seq += 1
+                record['seq'] = self.seq
+            lines.append(encodeRecord(record))
+        
+        with open(self.journalPath, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journalState = fileState(self.journalPath)
+        self.journalOffset = self.journalState[1]
+        self._trackIds(records)
+        if self.remoteRecords:
+            self.ownRecords.extend(records)
+    
+    def applyChanges(self, changed: List[dict], deleted: List[int], meta: Optional[dict]):
+        records = changeRecords(changed, deleted, meta)
+        if records:
+            self.append(records)
+    
+    def append(self, records: List[dict]):
+        with self.fileLock:
+            self._tail()
+            self._write(records)
+    
+    def reserveIds(self, count: int, floor: int = 1) -> int:
+        with self.fileLock:
+            self._tail()
+            start = max(self.nextId, floor)
+            self._write([{'op': "reserve", 'nextId': start + count}])
+            return start
+    
+    def releaseIds(self, start: int, end: int):
+        with self.fileLock:
+            self._tail()
+            if self.nextId == end:
+                self._write([{'op': "release", 'start': start, 'end': end}])
+    
+    def pollChanges(self, blocking: bool = False) -> Optional[List[dict]]:
+        unchanged = fileState(self.journalPath) == self.journalState
+        if unchanged and not self.remoteRecords and fileState(self.snapshotPath) == self.snapshotState:
+            return None
+        if not self.fileLock.acquire(blocking):
+            return None
+        try:
+            self._tail()
+            records = shadowRecords(self.remoteRecords, self.ownRecords)
+            self.remoteRecords = []
+            self.ownRecords = []
+            return records or None
+        finally:
+            self.fileLock.release()
+    
+    def needsCompaction(self) -> bool:
+        try:
+            return os.path.getsize(self.journalPath) > self.COMPACT_THRESHOLD
+        except OSError:
+            return False
+    
+    def compact(self):
+        with self.fileLock:
+            self._tail()
+            remoteRecords = self.remoteRecords
+            data = self._loadLocked()
+            self.remoteRecords = remoteRecords
+            if data is not None:
+                self._writeSnapshot(data)
+    
+    def _writeSnapshot(self, data: dict):
+        data['journalSeq'] = self.seq
+        writeJsonAtomic(self.snapshotPath, data)
+        if os.path.exists(self.journalPath):
+            os.replace(self.journalPath, self.rotatedPath)
+        self.snapshotState = fileState(self.snapshotPath)
+        self._write([{'op': "base", 'seq': self.seq}])
+    
+    def saveAll(self, data: dict):
+        with self.fileLock:
+            self._tail()
+            self.remoteRecords = []
+            self.ownRecords = []
+            self.seq += 1
+            self.nextId = max(self.nextId, data.get('nextId', 1))
+            self._writeSnapshot(data)
+    
+    def close(self):
+        self.fileLock.close()
+
+class SQLiteStorage(TaskStorage):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            text TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            createdAt TEXT,
+            category TEXT NOT NULL DEFAULT 'Uncategorized',
+            lastModified TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category, completed);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks(completed);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(createdAt);
+        CREATE INDEX IF NOT EXISTS idx_tasks_modified ON tasks(lastModified);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            text, content='tasks', content_rowid='id', tokenize='{tokenizer}'
+        );
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF text ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+    """
+    COLUMNS = ('id', 'text', 'completed', 'createdAt', 'category', 'lastModified')
+    
+    def __init__(self, dbPath: str, legacyJsonPath: Optional[str] = None):
+        self.dbPath = dbPath
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(dbPath, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.ftsTokenizer = self._createFts()
+        
+        if legacyJsonPath is not None:
+            self.migrateFromJson(legacyJsonPath)
+    
+    def _createFts(self) -> Optional[str]:
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self.conn.executescript(self.FTS_SCHEMA.format(tokenizer=tokenizer))
+                return tokenizer
+            except sqlite3.OperationalError:
+                continue
+        return None
+    
+    def _getMeta(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+    
+    def _setMeta(self, meta: dict):
+        self.conn.executemany(
+            "INSERT INTO meta(key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(key, json.dumps(value, ensure_ascii=False)) for key, value in meta.items()]
+        )
+    
+    def _taskRow(self, taskDict: dict) -> tuple:
+        return (
+            taskDict['id'],
+            taskDict['text'],
+            int(bool(taskDict.get('completed', False))),
+            taskDict.get('createdAt'),
+            taskDict.get('category', "Uncategorized"),
+            taskDict.get('lastModified')
+        )
+    
+    def _upsert(self, taskDicts: Iterable[dict]):
+        self.conn.executemany(
+            "INSERT INTO tasks(id, text, completed, createdAt, category, lastModified) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET text = excluded.text, completed = excluded.completed, "
+            "createdAt = excluded.createdAt, category = excluded.category, lastModified = excluded.lastModified",
+            (self._taskRow(taskDict) for taskDict in taskDicts)
+        )
+    
+    def _rowToDict(self, row) -> dict:
+        taskDict = dict(zip(self.COLUMNS, row))
+        taskDict['completed'] = bool(taskDict['completed'])
+        return taskDict
+    
+    def isEmpty(self) -> bool:
+        return self.conn.execute("SELECT COUNT(*) FROM meta").fetchone()[0] == 0
+    
+    def migrateFromJson(self, jsonPath: str) -> bool:
+        if not self.isEmpty() or not os.path.exists(jsonPath):
+            return False
+        
+        data = JsonStorage(jsonPath).load()
+        if data is None:
+            return False
+        
+        data['tasks'] = [normalizeTaskDict(taskDict) for taskDict in data.get('tasks', [])]
+        self.saveAll(data)
+        with self.lock, self.conn:
+            self._setMeta({'migratedFrom': jsonPath})
+        return True
+    
+    def load(self) -> Optional[dict]:
+        with self.lock:
+            if self.isEmpty():
+                return None
+            
+            rows = self.conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM tasks ORDER BY id")
+            return {
+                'tasks': [self._rowToDict(row) for row in rows],
+                'categories': self._getMeta('categories', ["All", "Uncategorized"]),
+                'nextId': self._getMeta('nextId', 1),
+                'currentCategory': self._getMeta('currentCategory', "Uncategorized"),
+                'sortMode': self._getMeta('sortMode', "id"),
+                'sortDescending': self._getMeta('sortDescending', False)
+            }
+    
+    def saveAll(self, data: dict):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM tasks")
+            self._upsert(data.get('tasks', []))
+            self._setMeta({key: data[key] for key in META_KEYS if key in data})
+    
+    def _patch(self, taskDict: dict):
+        fields = [key for key in self.COLUMNS if key in taskDict and key != 'id']
+        if not fields:
+            return
+        values = [int(bool(taskDict[key])) if key == 'completed' else taskDict[key] for key in fields]
+        self.conn.execute(
+            f"UPDATE tasks SET {', '.join(f'{key} = ?' for key in fields)} WHERE id = ?",
+            values + [taskDict['id']]
+        )
+    
+    def applyChanges(self, changed: List[dict], deleted: List[int], meta: Optional[dict]):
+        with self.lock, self.conn:
+            if changed:
+                self._upsert(taskDict for taskDict in changed if TASK_KEYS <= taskDict.keys())
+                for taskDict in changed:
+                    if not TASK_KEYS <= taskDict.keys():
+                        self._patch(taskDict)
+            if deleted:
+                self.conn.executemany("DELETE FROM tasks WHERE id = ?", ((taskId,) for taskId in deleted))
+            if meta is not None:
+                self._setMeta(meta)
+    
+    def reserveIds(self, count: int, floor: int = 1) -> int:
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            highest = self.conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0] or 0
+            start = max(self._getMeta('nextId', 1), highest + 1, floor)
+            self._setMeta({'nextId': start + count})
+            return start
+    
+    def releaseIds(self, start: int, end: int):
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self._getMeta('nextId', 1) == end:
+                self._setMeta({'nextId': start})
+    
+    def countByCategory(self) -> Dict[str, tuple]:
+        with self.lock:
+            rows = self.conn.execute("SELECT category, COUNT(*), SUM(completed) FROM tasks GROUP BY category")
+            return {category: (total, completed or 0) for category, total, completed in rows}
+    
+    def sortOrder(self) -> Tuple[str, bool]:
+        with self.lock:
+            return self._getMeta('sortMode', "id"), bool(self._getMeta('sortDescending', False))
+    
+    def tasksInCategory(self, category: str, completed: Optional[bool] = None) -> List[dict]:
+        conditions = []
+        params = []
+        if category != "All":
+            conditions.append("category = ?")
+            params.append(category)
+        if completed is not None:
+            conditions.append("completed = ?")
+            params.append(int(completed))
+        query = f"SELECT {', '.join(self.COLUMNS)} FROM tasks"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self.lock:
+            return [self._rowToDict(row) for row in self.conn.execute(query + " ORDER BY id", params)]
+    
+    def search(self, text: str, category: Optional[str] = None) -> List[dict]:
+        columns = ', '.join(f"tasks.{column}" for column in self.COLUMNS)
+        params = []
+        
+        if self.ftsTokenizer == "trigram" and len(text) >= 3:
+            query = f"SELECT {columns} FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid WHERE tasks_fts MATCH ?"
+            params.append('"' + text.replace('"', '""') + '"')
+        else:
+            query = f"SELECT {columns} FROM tasks WHERE instr(lower(tasks.text), ?) > 0"
+            params.append(text.lower())
+        
+        if category is not None and category != "All":
+            query += " AND tasks.category = ?"
+            params.append(category)
+        
+        with self.lock:
+            return [self._rowToDict(row) for row in self.conn.execute(query + " ORDER BY tasks.id", params)]
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class SyncStorage(TaskStorage):
+    POLL_MS = 50
+    CONNECT_TIMEOUT = 2.0
+    REPLY_TIMEOUT = 10.0
+    RETRY_SECONDS = 5.0
+    
+    def __init__(self, address: str):
+        host, _, port = address.rpartition(":")
+        self.address = (host or "127.0.0.1", int(port))
+        self.condition = threading.Condition()
+        self.sendLock = threading.Lock()
+        self.sock: Optional[socket.socket] = None
+        self.thread: Optional[threading.Thread] = None
+        self.clientId: Optional[int] = None
+        self.seq = 0
+        self.nextRef = 1
+        self.loading = False
+        self.loaded: Optional[dict] = None
+        self.loadError: Optional[Exception] = None
+        self.closing = False
+        self.replies: Dict[int, dict] = {}
+        self.remoteRecords: List[dict] = []
+        self.ownRecords: List[dict] = []
+    
+    def _send(self, sock: socket.socket, message: dict):
+        sock.sendall((encodeRecord(message) + "\n").encode('utf-8'))
+    
+    def _connect(self) -> Optional[tuple]:
+        with self.condition:
+            since = self.seq if self.clientId is not None else None
+        sock = socket.create_connection(self.address, timeout=self.CONNECT_TIMEOUT)
+        try:
+            stream = sock.makefile('rb')
+            self._send(sock, {'op': "hello", 'since': since})
+            sock.settimeout(self.REPLY_TIMEOUT)
+            line = stream.readline()
+            if not line:
+                raise ConnectionError("the sync server closed the connection")
+            welcome = parseJson(line)
+            sock.settimeout(None)
+        except (OSError, ValueError):
+            sock.close()
+            raise
+        
+        with self.condition:
+            if self.closing or (self.loading and 'data' not in welcome):
+                sock.close()
+                return None
+            if self.loading:
+                self.loaded = welcome['data']
+                self.loading = False
+            elif 'data' in welcome:
+                self.remoteRecords = [{'op': "reload", 'seq': welcome['seq'], 'data': welcome['data']}]
+                self.ownRecords = []
+            else:
+                self.remoteRecords.extend(welcome['records'])
+            self.clientId = welcome['client']
+            self.seq = welcome['seq']
+            self.sock = sock
+            self.condition.notify_all()
+        return sock, stream
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                if self.closing:
+                    return
+            try:
+                connection = self._connect()
+            except (OSError, ValueError) as e:
+                with self.condition:
+                    if self.loading:
+                        self.loadError = e
+                        self.condition.notify_all()
+                    self.condition.wait_for(lambda: self.closing or (self.loading and self.loadError is None),
+                                            self.RETRY_SECONDS)
+                continue
+            if connection is not None:
+                self._readLoop(*connection)
+    
+    def _readLoop(self, sock: socket.socket, stream):
+        try:
+            for line in stream:
+                message = parseJson(line)
+                with self.condition:
+                    if message['op'] == "batch":
+                        records = message['records']
+                        if records:
+                            self.seq = records[-1]['seq']
+                        if message['client'] == self.clientId:
+                            if self.remoteRecords:
+                                self.ownRecords.extend(records)
+                            self.replies[message['ref']] = message
+                        else:
+                            self.remoteRecords.extend(records)
+                    else:
+                        self.replies[message['ref']] = message
+                    self.condition.notify_all()
+        except (OSError, ValueError):
+            pass
+        self._disconnect(sock)
+    
+    def _disconnect(self, sock: socket.socket):
+        with self.condition:
+            if self.sock is sock:
+                self.sock = None
+            self.condition.notify_all()
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+    
+    def _request(self, message: dict) -> dict:
+        with self.condition:
+            ref = self.nextRef
+            self.nextRef += 1
+        message['ref'] = ref
+        
+        with self.sendLock:
+            sock = self.sock
+            if sock is None:
+                raise ConnectionError("not connected to the sync server")
+            try:
+                self._send(sock, message)
+            except OSError:
+                self._disconnect(sock)
+                raise
+        
+        with self.condition:
+            answered = self.condition.wait_for(lambda: ref in self.replies or self.sock is not sock, self.REPLY_TIMEOUT)
+            reply = self.replies.pop(ref, None)
+        if reply is None:
+            self._disconnect(sock)
+            if not answered:
+                raise TimeoutError("the sync server did not answer")
+            raise ConnectionError("lost the connection to the sync server")
+        if reply['op'] == "error":
+            raise ValueError(reply['message'])
+        return reply
+    
+    def load(self) -> Optional[dict]:
+        with self.condition:
+            self.clientId = None
+            self.remoteRecords = []
+            self.ownRecords = []
+            self.loaded = None
+            self.loadError = None
+            self.loading = True
+            sock = self.sock
+            self.condition.notify_all()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="SyncConnection", daemon=True)
+            self.thread.start()
+        elif sock is not None:
+            self._disconnect(sock)
+        
+        with self.condition:
+            self.condition.wait_for(lambda: not self.loading or self.loadError is not None,
+                                    self.CONNECT_TIMEOUT + self.REPLY_TIMEOUT)
+            if self.loading:
+                self.loading = False
+                raise self.loadError or TimeoutError("the sync server did not answer")
+            return self.loaded
+    
+    def saveAll(self, data: dict):
+        self._request({'op': "reset", 'data': data})
+    
+    def applyChanges(self, changed: List[dict], deleted: List[int], meta: Optional[dict]):
+        records = changeRecords(changed, deleted, meta)
+        if records:
+            self._request({'op': "batch", 'records': records})
+    
+    def reserveIds(self, count: int, floor: int = 1) -> int:
+        return self._request({'op': "reserve", 'count': count, 'floor': floor})['start']
+    
+    def releaseIds(self, start: int, end: int):
+        self._request({'op': "release", 'start': start, 'end': end})
+    
+    def pollChanges(self, blocking: bool = False) -> Optional[List[dict]]:
+        with self.condition:
+            records = shadowRecords(self.remoteRecords, self.ownRecords)
+            self.remoteRecords = []
+            self.ownRecords = []
+        return records or None
+    
+    def close(self):
+        with self.condition:
+            self.closing = True
+            sock = self.sock
+            self.condition.notify_all()
+        if sock is not None:
+            self._disconnect(sock)
+        if self.thread is not None:
+            self.thread.join(self.REPLY_TIMEOUT)
+
+DEFAULT_FILE = "breadtasks_data.json"
+SQLITE_FILE = "breadtasks_data.sqlite3"
+DEFAULT_SYNC_ADDRESS = "127.0.0.1:8765"
+
+def defaultDataPath() -> str:
+    return os.path.join(os.getenv("LOCALAPPDATA") or "", "BreadTasks", DEFAULT_FILE)
+
+def openStorage(dataPath: str, backend: Optional[str] = None, syncAddress: Optional[str] = None,
+                create: bool = True) -> Optional[TaskStorage]:
+    backend = (backend or os.getenv("BREADTASKS_STORAGE", "json")).lower()
+    if backend == "sync":
+        return SyncStorage(syncAddress or os.getenv("BREADTASKS_SYNC_ADDRESS", DEFAULT_SYNC_ADDRESS))
+    if create:
+        os.makedirs(os.path.dirname(os.path.abspath(dataPath)), exist_ok=True)
+    if backend == "sqlite":
+        dbPath = os.path.join(os.path.dirname(dataPath), SQLITE_FILE)
+        if create or os.path.exists(dbPath):
+            return SQLiteStorage(dbPath, legacyJsonPath=dataPath)
+    if not create and not os.path.exists(dataPath):
+        return None
+    return JsonStorage(dataPath)
+
+def loadStore(storage: TaskStorage, store: TaskStore) -> Optional[dict]:
+    store.idReserver = storage.reserveIds
+    data = storage.load()
+    if data is not None:
+        taskDicts = data.get('tasks', [])
+        store.loadRaw(
+            taskDicts,
+            data.get('categories', TaskStore.DEFAULT_CATEGORIES),
+            data.get('nextId', len(taskDicts) + 1)
+        )
+        try:
+            store.setSortOrder(data.get('sortMode', "id"), bool(data.get('sortDescending', False)))
+        except ValueError:
+            store.setSortOrder("id")
+    return data
+
+def snapshotData(store: TaskStore, version: str, currentCategory: str = "Uncategorized") -> dict:
+    return {
+        'version': version,
+        'lastSaved': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'tasks': [task.toDict() for task in store],
+        'categories': list(store.categories),
+        'nextId': store.nextId,
+        'currentCategory': currentCategory,
+        'sortMode': store.sortMode,
+        'sortDescending': store.sortDescending
+    }
@@ -0,0 +1,463 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from contextlib import contextmanager
+import bisect
+
+from .model import Task, currentStamp, normalizeTaskDict, parseTimestamp
+
+class OrderedIds:
+    __slots__ = ('ids', 'stale')
+    COMPACT_MIN_STALE = 1024
+    
+    def __init__(self, ids: Optional[List[int]] = None):
+        self.ids = ids if ids is not None else []
+        self.stale = 0
+    
+    def add(self, taskId: int):
+        ids = self.ids
+        if not ids or taskId > ids[-1]:
+            ids.append(taskId)
+            return
+        index = bisect.bisect_left(ids, taskId)
+        if index < len(ids) and ids[index] == taskId:
+            self.stale -= 1
+        else:
+            ids.insert(index, taskId)
+    
+    def discard(self, members):
+        self.stale += 1
+        if self.stale >= self.COMPACT_MIN_STALE and self.stale * 2 > len(self.ids):
+            self.ids = [taskId for taskId in self.ids if taskId in members]
+            self.stale = 0
+    
+    def page(self, members, afterId: Optional[int], limit: int, descending: bool = False) -> List[int]:
+        ids = self.ids
+        if descending:
+            index = (len(ids) if afterId is None else bisect.bisect_left(ids, afterId)) - 1
+            page = []
+            while index >= 0 and len(page) < limit:
+                taskId = ids[index]
+                if taskId in members:
+                    page.append(taskId)
+                index -= 1
+            return page
+        
+        if not self.stale:
+            start = 0 if afterId is None else bisect.bisect_right(ids, afterId)
+            return ids[start:start + limit]
+        
+        index = 0 if afterId is None else bisect.bisect_right(ids, afterId)
+        end = len(ids)
+        page = []
+        while index < end and len(page) < limit:
+            taskId = ids[index]
+            if taskId in members:
+                page.append(taskId)
+            index += 1
+        return page
+    
+    def all(self, members) -> List[int]:
+        if not self.stale:
+            return list(self.ids)
+        return [taskId for taskId in self.ids if taskId in members]
+
+SORT_MODES = ("id", "created", "modified", "text", "completed", "category")
+
+def sortKey(mode: str, task: Task) -> tuple:
+    if mode == "created":
+        return (task.createdStamp, task.id)
+    if mode == "modified":
+        return (task.modifiedStamp, task.id)
+    if mode == "text":
+        return (task.text.casefold(), task.id)
+    if mode == "completed":
+        return (task.completed, task.id)
+    if mode == "category":
+        return (task.category.casefold(), task.id)
+    return (task.id,)
+
+class SortedIndex:
+    __slots__ = ('keys',)
+    
+    def __init__(self, keys: List[tuple]):
+        self.keys = keys
+    
+    def add(self, key: tuple):
+        bisect.insort(self.keys, key)
+    
+    def discard(self, key: tuple):
+        keys = self.keys
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+    
+    def page(self, afterKey: Optional[tuple], limit: int, descending: bool = False) -> List[int]:
+        keys = self.keys
+        if descending:
+            end = len(keys) if afterKey is None else bisect.bisect_left(keys, afterKey)
+            return [key[-1] for key in reversed(keys[max(0, end - limit):end])]
+        start = 0 if afterKey is None else bisect.bisect_right(keys, afterKey)
+        return [key[-1] for key in keys[start:start + limit]]
+
+class TaskStore:
+    DEFAULT_CATEGORIES = ["All", "Uncategorized"]
+    
+    def __init__(self):
+        self.tasksById: Dict[int, Task] = {}
+        self.categoryIds: Dict[str, Set[int]] = {}
+        self.completedIds: Dict[str, Set[int]] = {}
+        self.orderedIds: Dict[str, OrderedIds] = {"All": OrderedIds()}
+        self.sortMode = "id"
+        self.sortDescending = False
+        self.sortedIndexes: Dict[str, SortedIndex] = {}
+        self.categories: List[str] = list(self.DEFAULT_CATEGORIES)
+        self.nextId = 1
+        self.idReserver: Optional[Callable[[int, int], int]] = None
+        self.reservedUntil = 0
+        self.listeners: List[Callable] = []
+        self.pendingIds: List[int] = []
+        self.transactionDepth = 0
+    
+    def subscribe(self, listener: Callable):
+        self.listeners.append(listener)
+    
+    def _notify(self, event: str, task: Optional[Task] = None, changes: Optional[dict] = None):
+        for listener in self.listeners:
+            listener(event, task, changes)
+    
+    @contextmanager
+    def transaction(self):
+        self.transactionDepth += 1
+        try:
+            yield self
+        finally:
+            self.transactionDepth -= 1
+            if not self.transactionDepth:
+                self._notify("commit")
+    
+    def __len__(self) -> int:
+        return len(self.tasksById)
+    
+    def __iter__(self) -> Iterator[Task]:
+        if not self.pendingIds:
+            return iter(self.tasksById.values())
+        return (self._materialize(taskId) for taskId in list(self.tasksById))
+    
+    def __contains__(self, taskId: int) -> bool:
+        return taskId in self.tasksById
+    
+    def _materialize(self, taskId: int) -> Task:
+        task = self.tasksById[taskId]
+        if type(task) is dict:
+            task = Task(**normalizeTaskDict(task))
+            self.tasksById[taskId] = task
+        return task
+    
+    def get(self, taskId: int) -> Optional[Task]:
+        if taskId not in self.tasksById:
+            return None
+        return self._materialize(taskId)
+    
+    def materializeSome(self, limit: int) -> bool:
+        pendingIds = self.pendingIds
+        tasksById = self.tasksById
+        while pendingIds and limit > 0:
+            taskId = pendingIds.pop()
+            if type(tasksById.get(taskId)) is dict:
+                self._materialize(taskId)
+                limit -= 1
+        return bool(pendingIds)
+    
+    def _index(self, task: Task):
+        bucket = self.categoryIds.get(task.category)
+        if bucket is None:
+            bucket = self.categoryIds[task.category] = set()
+            self.orderedIds[task.category] = OrderedIds()
+        if task.id not in bucket:
+            bucket.add(task.id)
+            self.orderedIds[task.category].add(task.id)
+        if task.completed:
+            self.completedIds.setdefault(task.category, set()).add(task.id)
+        if self.sortedIndexes:
+            key = sortKey(self.sortMode, task)
+            for category in (task.category, "All"):
+                index = self.sortedIndexes.get(category)
+                if index is not None:
+                    index.add(key)
+    
+    def _unindex(self, task: Task):
+        category = task.category
+        if self.sortedIndexes:
+            key = sortKey(self.sortMode, task)
+            for name in (category, "All"):
+                index = self.sortedIndexes.get(name)
+                if index is not None:
+                    index.discard(key)
+        
+        bucket = self.categoryIds.get(category)
+        if bucket is not None and task.id in bucket:
+            bucket.discard(task.id)
+            if bucket:
+                self.orderedIds[category].discard(bucket)
+            else:
+                del self.categoryIds[category]
+                del self.orderedIds[category]
+                self.sortedIndexes.pop(category, None)
+        
+        bucket = self.completedIds.get(category)
+        if bucket is not None:
+            bucket.discard(task.id)
+            if not bucket:
+                del self.completedIds[category]
+    
+    def _buildOrdered(self, idLists: Dict[str, List[int]]):
+        self.orderedIds = {}
+        for category, ids in idLists.items():
+            if len(ids) == len(self.categoryIds[category]):
+                ids.sort()
+            else:
+                ids = sorted(self.categoryIds[category])
+            self.orderedIds[category] = OrderedIds(ids)
+        self.orderedIds["All"] = OrderedIds(sorted(self.tasksById))
+        self.sortedIndexes = {}
+    
+    def reset(self, tasks: Iterable[Task], categories: List[str], nextId: int):
+        self.tasksById = {}
+        self.categoryIds = {}
+        self.completedIds = {}
+        self.pendingIds = []
+        idLists: Dict[str, List[int]] = {}
+        for task in tasks:
+            self.tasksById[task.id] = task
+            self.categoryIds.setdefault(task.category, set()).add(task.id)
+            idLists.setdefault(task.category, []).append(task.id)
+            if task.completed:
+                self.completedIds.setdefault(task.category, set()).add(task.id)
+        
+        self._buildOrdered(idLists)
+        self._resetCategories(categories, nextId)
+    
+    def loadRaw(self, taskDicts: List[dict], categories: List[str], nextId: int):
+        tasksById = {}
+        categoryIds: Dict[str, Set[int]] = {}
+        completedIds: Dict[str, Set[int]] = {}
+        idLists: Dict[str, List[int]] = {}
+        for taskDict in taskDicts:
+            taskId = taskDict['id']
+            category = taskDict.get('category', "Uncategorized")
+            tasksById[taskId] = taskDict
+            categoryIds.setdefault(category, set()).add(taskId)
+            idLists.setdefault(category, []).append(taskId)
+            if taskDict.get('completed'):
+                completedIds.setdefault(category, set()).add(taskId)
+        
+        self.tasksById = tasksById
+        self.categoryIds = categoryIds
+        self.completedIds = completedIds
+        self.pendingIds = list(reversed(tasksById))
+        self._buildOrdered(idLists)
+        self._resetCategories(categories, nextId)
+    
+    def _normalizeCategories(self, categories: List[str]) -> List[str]:
+        categories = list(categories)
+        if "All" not in categories:
+            categories.insert(0, "All")
+        if "Uncategorized" not in categories:
+            categories.append("Uncategorized")
+        seen = set()
+        return [cat for cat in categories if not (cat in seen or seen.add(cat))]
+    
+    def _resetCategories(self, categories: List[str], nextId: int):
+        self.categories = self._normalizeCategories(categories)
+        
+        self.nextId = max(nextId, max(self.tasksById, default=0) + 1)
+        self.reservedUntil = 0
+        self._notify("reset")
+    
+    def add(self, task: Task) -> Task:
+        if task.id not in self.tasksById:
+            self.orderedIds["All"].add(task.id)
+        self.tasksById[task.id] = task
+        self._index(task)
+        self.nextId = max(self.nextId, task.id + 1)
+        self._notify("add", task)
+        return task
+    
+    def allocateId(self, expected: int = 1) -> int:
+        if self.idReserver is not None and self.nextId >= self.reservedUntil:
+            self.nextId = self.idReserver(expected, self.nextId)
+            self.reservedUntil = self.nextId + expected
+        return self.nextId
+    
+    def unusedIds(self) -> Optional[Tuple[int, int]]:
+        if self.reservedUntil <= self.nextId:
+            return None
+        unused = (self.nextId, self.reservedUntil)
+        self.reservedUntil = self.nextId
+        return unused
+    
+    def createTask(self, text: str, category: str) -> Task:
+        return self.add(Task(id=self.allocateId(), text=text, category=category))
+    
+    def remove(self, taskId: int) -> Optional[Task]:
+        task = self.get(taskId)
+        if task is not None:
+            del self.tasksById[taskId]
+            self.orderedIds["All"].discard(self.tasksById)
+            self._unindex(task)
+            self._notify("remove", task)
+        return task
+    
+    def removeMany(self, taskIds: Iterable[int]) -> List[Task]:
+        removed = []
+        with self.transaction():
+            for taskId in taskIds:
+                task = self.remove(taskId)
+                if task is not None:
+                    removed.append(task)
+        return removed
+    
+    def update(self, task: Task, touch: bool = True, **fields) -> bool:
+        for name, stampName in (('createdAt', 'createdStamp'), ('lastModified', 'modifiedStamp')):
+            if name in fields:
+                fields[stampName] = parseTimestamp(fields.pop(name))
+        
+        changes = {key: getattr(task, key) for key, value in fields.items() if getattr(task, key) != value}
+        if not changes:
+            return False
+        
+        self._unindex(task)
+        for key in changes:
+            setattr(task, key, fields[key])
+        if touch and 'modifiedStamp' not in fields:
+            stamp = currentStamp()
+            if task.modifiedStamp != stamp:
+                changes['modifiedStamp'] = task.modifiedStamp
+                task.modifiedStamp = stamp
+        self._index(task)
+        
+        self._notify("update", task, changes)
+        return True
+    
+    def updateMany(self, taskIds: Iterable[int], touch: bool = True, **fields) -> List[Task]:
+        changed = []
+        with self.transaction():
+            for taskId in taskIds:
+                task = self.get(taskId)
+                if task is not None and self.update(task, touch=touch, **fields):
+                    changed.append(task)
+        return changed
+    
+    def toggle(self, taskId: int) -> Optional[Task]:
+        task = self.get(taskId)
+        if task is not None:
+            self.update(task, completed=not task.completed)
+        return task
+    
+    def _sortedTasks(self, taskIds: Iterable[int]) -> List[Task]:
+        materialize = self._materialize
+        return [materialize(taskId) for taskId in sorted(taskIds)]
+    
+    def _members(self, category: str):
+        if category == "All":
+            return self.tasksById
+        return self.categoryIds.get(category, ())
+    
+    def idsInCategory(self, category: str) -> List[int]:
+        ordered = self.orderedIds.get(category)
+        if ordered is None:
+            return []
+        return ordered.all(self._members(category))
+    
+    def setSortOrder(self, mode: str, descending: bool = False):
+        if mode not in SORT_MODES:
+            raise ValueError(f"unknown sort mode: {mode}")
+        if mode != self.sortMode:
+            self.sortedIndexes = {}
+        self.sortMode = mode
+        self.sortDescending = descending
+        self._notify("sort")
+    
+    def sortKeyOf(self, task: Task) -> tuple:
+        return sortKey(self.sortMode, task)
+    
+    def _sortedIndex(self, category: str) -> SortedIndex:
+        index = self.sortedIndexes.get(category)
+        if index is None:
+            mode = self.sortMode
+            materialize = self._materialize
+            index = SortedIndex(sorted(sortKey(mode, materialize(taskId)) for taskId in self.idsInCategory(category)))
+            self.sortedIndexes[category] = index
+        return index
+    
+    def sortIds(self, taskIds: Iterable[int]) -> List[int]:
+        if self.sortMode == "id":
+            return sorted(taskIds, reverse=self.sortDescending)
+        mode = self.sortMode
+        materialize = self._materialize
+        return sorted(taskIds, key=lambda taskId: sortKey(mode, materialize(taskId)), reverse=self.sortDescending)
+    
+    def pageIds(self, category: str, afterId: Optional[int] = None, limit: int = 200) -> List[int]:
+        ordered = self.orderedIds.get(category)
+        if ordered is None:
+            return []
+        if self.sortMode == "id":
+            return ordered.page(self._members(category), afterId, limit, self.sortDescending)
+        
+        afterTask = self.get(afterId) if afterId is not None else None
+        afterKey = sortKey(self.sortMode, afterTask) if afterTask is not None else None
+        return self._sortedIndex(category).page(afterKey, limit, self.sortDescending)
+    
+    def isInCategory(self, taskId: int, category: str) -> bool:
+        return taskId in self._members(category)
+    
+    def inCategory(self, category: str) -> List[Task]:
+        materialize = self._materialize
+        return [materialize(taskId) for taskId in self.idsInCategory(category)]
+    
+    def filterIds(self, category: str, taskIds: Set[int]) -> List[int]:
+        if category != "All":
+            bucket = self.categoryIds.get(category, set())
+            taskIds = taskIds & bucket if len(taskIds) < len(bucket) else bucket & taskIds
+        return self.sortIds(taskIds)
+    
+    def count(self, category: str = "All") -> int:
+        if category == "All":
+            return len(self.tasksById)
+        return len(self.categoryIds.get(category, ()))
+    
+    def completedTasks(self, category: str = "All") -> List[Task]:
+        if category == "All":
+            return self._sortedTasks(taskId for bucket in self.completedIds.values() for taskId in bucket)
+        return self._sortedTasks(self.completedIds.get(category, ()))
+    
+    def setCategories(self, categories: List[str]) -> bool:
+        categories = self._normalizeCategories(categories)
+        if categories == self.categories:
+            return False
+        self.categories = categories
+        self._notify("categories")
+        return True
+    
+    def addCategory(self, name: str):
+        self.categories.append(name)
+        self._notify("categories")
+    
+    def renameCategory(self, oldName: str, newName: str) -> List[Task]:
+        self.categories[self.categories.index(oldName)] = newName
+        
+        renamedTasks = self.inCategory(oldName)
+        with self.transaction():
+            self._notify("rename", None, {'category': (oldName, newName)})
+            for task in renamedTasks:
+                self.update(task, touch=False, category=newName)
+            self._notify("categories")
+        return renamedTasks
+    
+    def removeCategory(self, name: str) -> List[Task]:
+        movedTasks = self.inCategory(name)
+        with self.transaction():
+            for task in movedTasks:
+                self.update(task, category="Uncategorized")
+            self.categories.remove(name)
+            self._notify("categories")
+        return movedTasks
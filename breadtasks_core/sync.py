@@ -0,0 +1,305 @@
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+import asyncio
+
+from .model import Task
+from .shared import mergeRemoteRecords
+from .storage import DEFAULT_SYNC_ADDRESS, TASK_KEYS, TaskStorage, encodeRecord, parseJson, snapshotData
+from .store import TaskStore
+from .worker import SaveWorker
+
+RECORD_KEYS = {
+    'put': ('task',),
+    'patch': ('id', 'fields'),
+    'del': ('ids',),
+    'meta': (),
+    'reload': ('data',)
+}
+FIELD_TYPES = {
+    'id': (int,),
+    'text': (str,),
+    'completed': (bool,),
+    'createdAt': (str, type(None)),
+    'category': (str,),
+    'lastModified': (str, type(None))
+}
+SNAPSHOT_KEYS = TASK_KEYS | {'priority'}
+
+def encodeMessage(message: dict) -> bytes:
+    return (encodeRecord(message) + "\n").encode('utf-8')
+
+def parseAddress(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def isId(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def checkFields(fields, required=(), allowed=TASK_KEYS) -> bool:
+    if not isinstance(fields, dict) or not fields.keys() <= allowed or any(key not in fields for key in required):
+        return False
+    return all(isinstance(value, FIELD_TYPES[key]) and (key != 'id' or isId(value))
+               for key, value in fields.items() if key in FIELD_TYPES)
+
+def checkMeta(meta: dict) -> bool:
+    categories = meta.get('categories', [])
+    if not isinstance(categories, list) or not all(isinstance(name, str) for name in categories):
+        return False
+    return 'nextId' not in meta or isId(meta['nextId'])
+
+def checkSnapshot(data) -> bool:
+    if not isinstance(data, dict) or not checkMeta(data):
+        return False
+    tasks = data.get('tasks', [])
+    return isinstance(tasks, list) and all(checkFields(task, ('id', 'text'), SNAPSHOT_KEYS) for task in tasks)
+
+def checkRecord(record) -> bool:
+    keys = RECORD_KEYS.get(record.get('op')) if isinstance(record, dict) else None
+    if keys is None or any(key not in record for key in keys):
+        return False
+    op = record['op']
+    if op == "put":
+        return checkFields(record['task'], TASK_KEYS)
+    if op == "patch":
+        return isId(record['id']) and checkFields(record['fields'])
+    if op == "del":
+        return isinstance(record['ids'], list) and all(isId(taskId) for taskId in record['ids'])
+    if op == "meta":
+        return checkMeta(record)
+    return checkSnapshot(record['data'])
+
+def checkRecords(records) -> List[dict]:
+    if not isinstance(records, list):
+        raise ValueError("records must be a list")
+    for record in records:
+        if not checkRecord(record):
+            raise ValueError(f"malformed record: {record!r}")
+    return records
+
+class SyncServer:
+    LOG_SIZE = 10000
+    LINE_LIMIT = 1 << 24
+    MAX_BUFFER = 1 << 22
+    
+    def __init__(self, store: TaskStore, storage: Optional[TaskStorage] = None, version: str = ""):
+        self.store = store
+        self.version = version
+        self.saveWorker = SaveWorker(storage) if storage is not None else None
+        self.seq = 0
+        self.log: Deque[dict] = deque(maxlen=self.LOG_SIZE)
+        self.clients: Dict[int, asyncio.StreamWriter] = {}
+        self.nextClientId = 1
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.outbox: Dict[int, List[bytes]] = {}
+        self.snapshotCache: Tuple[int, bytes] = (-1, b"")
+        self.batches = 0
+        self.dropped = 0
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.server.sockets[0].getsockname()[:2]
+    
+    async def start(self, host: Optional[str] = None, port: Optional[int] = None) -> Tuple[str, int]:
+        defaultHost, defaultPort = parseAddress(DEFAULT_SYNC_ADDRESS)
+        self.server = await asyncio.start_server(
+            self.handleClient,
+            defaultHost if host is None else host,
+            defaultPort if port is None else port,
+            limit=self.LINE_LIMIT
+        )
+        return self.address
+    
+    async def serveForever(self, host: Optional[str] = None, port: Optional[int] = None):
+        if self.server is None:
+            await self.start(host, port)
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+    
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+        for clientId in list(self.clients):
+            self._drop(clientId)
+        if self.server is not None:
+            await self.server.wait_closed()
+            self.server = None
+        if self.saveWorker is not None:
+            self.saveWorker.close()
+            self.saveWorker = None
+    
+    def _meta(self) -> dict:
+        return {'categories': list(self.store.categories), 'nextId': self.store.nextId}
+    
+    def _recordsSince(self, since) -> Optional[List[dict]]:
+        if not isinstance(since, int) or since > self.seq:
+            return None
+        if since == self.seq:
+            return []
+        if not self.log or self.log[0]['seq'] > since + 1:
+            return None
+        return [record for record in self.log if record['seq'] > since]
+    
+    def _encodedSnapshot(self) -> bytes:
+        if self.snapshotCache[0] != self.seq:
+            self.snapshotCache = (self.seq, encodeRecord(snapshotData(self.store, self.version)).encode('utf-8'))
+        return self.snapshotCache[1]
+    
+    def _welcome(self, clientId: int, since) -> bytes:
+        records = self._recordsSince(since)
+        if records is not None:
+            return encodeMessage({'op': "welcome", 'client': clientId, 'seq': self.seq, 'records': records})
+        header = encodeRecord({'op': "welcome", 'client': clientId, 'seq': self.seq})
+        return header[:-1].encode('utf-8') + b',"data":' + self._encodedSnapshot() + b"}\n"
+    
+    def _drop(self, clientId: int):
+        self.outbox.pop(clientId, None)
+        writer = self.clients.pop(clientId, None)
+        if writer is not None:
+            writer.close()
+    
+    def _broadcast(self, message: dict):
+        if not self.outbox:
+            asyncio.get_running_loop().call_soon(self._flush)
+        data = encodeMessage(message)
+        for clientId in self.clients:
+            self.outbox.setdefault(clientId, []).append(data)
+    
+    def _flush(self):
+        outbox = self.outbox
+        self.outbox = {}
+        for clientId, chunks in outbox.items():
+            writer = self.clients.get(clientId)
+            if writer is None:
+                continue
+            if writer.transport.get_write_buffer_size() > self.MAX_BUFFER:
+                self._drop(clientId)
+                self.dropped += 1
+            else:
+                writer.write(b"".join(chunks))
+    
+    def _persist(self, records: List[dict]):
+        if self.saveWorker is None:
+            return
+        if any(record['op'] == "reload" for record in records):
+            self.saveWorker.submit(snapshot=snapshotData(self.store, self.version))
+            return
+        
+        changed = []
+        deleted = []
+        for record in records:
+            if record['op'] == "put":
+                changed.append(record['task'])
+            elif record['op'] == "patch":
+                changed.append({'id': record['id'], **record['fields']})
+            elif record['op'] == "del":
+                deleted.extend(record['ids'])
+        self.saveWorker.submit(changed, deleted, self._meta())
+    
+    def _savepoint(self, records: List[dict]) -> tuple:
+        store = self.store
+        taskIds = set()
+        for record in records:
+            if record['op'] == "put":
+                taskIds.add(record['task']['id'])
+            elif record['op'] == "patch":
+                taskIds.add(record['id'])
+            elif record['op'] == "del":
+                taskIds.update(record['ids'])
+            elif record['op'] == "reload":
+                taskIds.update(store.tasksById)
+                taskIds.update(task['id'] for task in record['data'].get('tasks', []))
+        tasks = {taskId: store.get(taskId).toDict() if taskId in store else None for taskId in taskIds}
+        return tasks, list(store.categories), store.nextId
+    
+    def _rollback(self, savepoint: tuple):
+        tasks, categories, nextId = savepoint
+        store = self.store
+        with store.transaction():
+            for taskId, taskDict in tasks.items():
+                current = store.get(taskId)
+                if taskDict is None:
+                    store.remove(taskId)
+                elif current is None:
+                    store.add(Task(**taskDict))
+                else:
+                    store.update(current, touch=False, **{key: value for key, value in taskDict.items() if key != 'id'})
+            store.setCategories(categories)
+            store.nextId = nextId
+    
+    def applyRecords(self, records: List[dict], clientId: int = 0, ref: int = 0):
+        savepoint = self._savepoint(records)
+        try:
+            mergeRemoteRecords(self.store, records)
+        except Exception:
+            self._rollback(savepoint)
+            raise
+        for record in records:
+            self.seq += 1
+            record['seq'] = self.seq
+        self.log.extend(records)
+        self.batches += 1
+        self._persist(records)
+        self._broadcast({'op': "batch", 'client': clientId, 'ref': ref, 'records': records})
+    
+    def _reserve(self, count: int, floor: int) -> int:
+        start = max(self.store.nextId, floor)
+        self.store.nextId = start + count
+        if self.saveWorker is not None:
+            self.saveWorker.submit(meta=self._meta())
+        return start
+    
+    def _release(self, start: int, end: int):
+        if self.store.nextId == end:
+            self.store.nextId = start
+    
+    def _dispatch(self, clientId: int, writer: asyncio.StreamWriter, message: dict):
+        op = message.get('op')
+        ref = message.get('ref', 0)
+        if op == "batch":
+            self.applyRecords(checkRecords(message.get('records')), clientId, ref)
+        elif op == "reset":
+            data = message.get('data')
+            if not checkSnapshot(data):
+                raise ValueError("reset needs the data to load")
+            nextId = self.store.nextId
+            self.store.nextId = max(nextId, data.get('nextId', 1))
+            try:
+                self.applyRecords([{'op': "reload", 'data': data}], clientId, ref)
+            except Exception:
+                self.store.nextId = nextId
+                raise
+        elif op == "reserve":
+            start = self._reserve(int(message['count']), int(message.get('floor', 1)))
+            writer.write(encodeMessage({'op': "reserved", 'ref': ref, 'start': start}))
+        elif op == "release":
+            self._release(int(message['start']), int(message['end']))
+            writer.write(encodeMessage({'op': "released", 'ref': ref}))
+        else:
+            raise ValueError(f"unknown request: {op!r}")
+    
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        clientId = self.nextClientId
+        self.nextClientId += 1
+        try:
+            hello = parseJson(await reader.readline())
+            writer.write(self._welcome(clientId, hello.get('since')))
+            self.clients[clientId] = writer
+            await writer.drain()
+            
+            while clientId in self.clients:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = parseJson(line)
+                try:
+                    self._dispatch(clientId, writer, message)
+                except (KeyError, TypeError, ValueError) as e:
+                    writer.write(encodeMessage({'op': "error", 'ref': message.get('ref', 0), 'message': str(e)}))
+                await writer.drain()
+        except (ConnectionError, ValueError, AttributeError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._drop(clientId)
+            writer.close()
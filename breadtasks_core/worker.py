@@ -0,0 +1,243 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import threading
+import time
+
+from .storage import TASK_KEYS, TaskStorage
+
+class SaveWorker:
+    COALESCE_SECONDS = 0.25
+    ID_BLOCK = 32
+    ID_TIMEOUT = 10.0
+    
+    def __init__(self, storage: TaskStorage):
+        self.storage = storage
+        self.condition = threading.Condition()
+        self.changed: Dict[int, dict] = {}
+        self.deleted: Set[int] = set()
+        self.meta: Optional[dict] = None
+        self.snapshot: Optional[dict] = None
+        self.inFlight: Dict[int, dict] = {}
+        self.inFlightDeleted: Set[int] = set()
+        self.busy = False
+        self.closing = False
+        self.writes = 0
+        self.lastError: Optional[Exception] = None
+        self.idBlocks: List[List[int]] = []
+        self.idWanted = 0
+        self.idFloor = 1
+        self.idError: Optional[Exception] = None
+        self.reservingIds = False
+        self.thread = threading.Thread(target=self._run, name="SaveWorker", daemon=True)
+        self.thread.start()
+    
+    def submit(self, changed: Iterable[dict] = (), deleted: Iterable[int] = (),
+               meta: Optional[dict] = None, snapshot: Optional[dict] = None):
+        with self.condition:
+            for taskDict in changed:
+                queued = self.changed.get(taskDict['id'])
+                if queued is not None and not TASK_KEYS <= taskDict.keys():
+                    queued.update(taskDict)
+                else:
+                    self.changed[taskDict['id']] = taskDict
+                self.deleted.discard(taskDict['id'])
+            for taskId in deleted:
+                self.changed.pop(taskId, None)
+                self.deleted.add(taskId)
+            if meta is not None:
+                self.meta = meta
+            if snapshot is not None:
+                self.changed = {}
+                self.deleted = set()
+                self.meta = None
+                self.snapshot = snapshot
+            self.condition.notify_all()
+    
+    def _requeue(self, changed: List[dict], deleted: List[int], meta: Optional[dict],
+                 snapshot: Optional[dict]):
+        if self.snapshot is not None:
+            return
+        
+        self.snapshot = snapshot
+        for taskDict in changed:
+            queued = self.changed.get(taskDict['id'])
+            if queued is not None and not TASK_KEYS <= queued.keys():
+                self.changed[taskDict['id']] = {**taskDict, **queued}
+            elif queued is None and taskDict['id'] not in self.deleted:
+                self.changed[taskDict['id']] = taskDict
+        for taskId in deleted:
+            if taskId not in self.changed:
+                self.deleted.add(taskId)
+        if self.meta is None:
+            self.meta = meta
+    
+    def hasPending(self) -> bool:
+        return bool(self.changed or self.deleted or self.meta is not None or self.snapshot is not None)
+    
+    def _block(self, count: int) -> Optional[List[int]]:
+        return next((block for block in self.idBlocks if block[1] - block[0] >= count), None)
+    
+    def hasIds(self, count: int = 1) -> bool:
+        with self.condition:
+            return self._block(count) is not None
+    
+    def requestIds(self, count: int = 1, floor: int = 1):
+        with self.condition:
+            if self._block(count) is None:
+                self.idWanted = max(self.idWanted, count)
+                self.idFloor = max(self.idFloor, floor)
+                self.idError = None
+                self.condition.notify_all()
+    
+    def takeIds(self, count: int = 1, floor: int = 1) -> int:
+        with self.condition:
+            block = self._block(count)
+            if block is None:
+                self.idWanted = max(self.idWanted, count)
+                self.idFloor = max(self.idFloor, floor)
+                self.idError = None
+                self.condition.notify_all()
+                self.condition.wait_for(lambda: self._block(count) is not None or self.idError is not None,
+                                        self.ID_TIMEOUT)
+                block = self._block(count)
+                if block is None:
+                    raise self.idError or TimeoutError("no task ids could be reserved")
+            
+            start = block[0]
+            block[0] += count
+            if block[0] == block[1]:
+                self.idBlocks.remove(block)
+            if not self.reservingIds and sum(end - begin for begin, end in self.idBlocks) < self.ID_BLOCK // 2:
+                self.idWanted = max(self.idWanted, 1)
+                self.condition.notify_all()
+            return start
+    
+    def returnIds(self, start: int, end: int):
+        with self.condition:
+            self.idBlocks.append([start, end])
+    
+    def _reserveIds(self, count: int, floor: int):
+        try:
+            start = self.storage.reserveIds(count, floor)
+        except Exception as e:
+            with self.condition:
+                self.reservingIds = False
+                self.idError = e
+                self.condition.notify_all()
+            return
+        with self.condition:
+            self.reservingIds = False
+            self.idBlocks.append([start, start + count])
+            self.condition.notify_all()
+    
+    def _releaseIds(self):
+        for start, end in sorted(self.idBlocks, reverse=True):
+            try:
+                self.storage.releaseIds(start, end)
+            except Exception as e:
+                self.lastError = e
+        self.idBlocks = []
+    
+    def _write(self, changed: List[dict], deleted: List[int], meta: Optional[dict]):
+        self.storage.applyChanges(changed, deleted, meta)
+        if self.storage.needsCompaction():
+            self.storage.compact()
+        self.writes += 1
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.hasPending() and not self.idWanted and not self.closing:
+                    self.condition.wait()
+                idWanted = self.idWanted
+                idFloor = self.idFloor
+                self.idWanted = 0
+                self.reservingIds = bool(idWanted)
+                if not self.hasPending() and not idWanted:
+                    self._releaseIds()
+                    return
+            
+            if idWanted:
+                self._reserveIds(max(self.ID_BLOCK, idWanted), idFloor)
+                continue
+            
+            with self.condition:
+                deadline = time.monotonic() + self.COALESCE_SECONDS
+                while not self.closing and not self.idWanted:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.idWanted:
+                    continue
+                
+                changed = list(self.changed.values())
+                deleted = sorted(self.deleted)
+                meta = self.meta
+                snapshot = self.snapshot
+                self.changed = {}
+                self.deleted = set()
+                self.meta = None
+                self.snapshot = None
+                self.inFlight = {taskDict['id']: taskDict for taskDict in changed}
+                self.inFlightDeleted = set(deleted)
+                self.busy = True
+                closing = self.closing
+            
+            try:
+                if snapshot is not None:
+                    self.storage.saveAll(snapshot)
+                    snapshot = None
+                self._write(changed, deleted, meta)
+                failed = False
+            except Exception as e:
+                self.lastError = e
+                failed = True
+            
+            with self.condition:
+                self.busy = False
+                self.inFlight = {}
+                self.inFlightDeleted = set()
+                if failed:
+                    self._requeue(changed, deleted, meta, snapshot)
+                    if closing:
+                        self._releaseIds()
+                        self.condition.notify_all()
+                        return
+                self.condition.notify_all()
+    
+    def pollChanges(self) -> Tuple[Optional[List[dict]], Dict[int, Set[str]]]:
+        with self.condition:
+            records = self.storage.pollChanges()
+            if not records:
+                return None, {}
+            
+            pending: Dict[int, Set[str]] = {}
+            for queued in (self.inFlight, self.changed):
+                for taskId, taskDict in queued.items():
+                    pending.setdefault(taskId, set()).update(taskDict)
+            for taskId in self.inFlightDeleted | self.deleted:
+                pending[taskId] = set(TASK_KEYS)
+            return records, pending
+    
+    def writePending(self):
+        with self.condition:
+            changed = list(self.changed.values())
+            deleted = sorted(self.deleted)
+            meta = self.meta
+            snapshot = self.snapshot
+        if snapshot is not None:
+            self.storage.saveAll(snapshot)
+            with self.condition:
+                self.snapshot = None
+        self._write(changed, deleted, meta)
+        with self.condition:
+            self.changed = {}
+            self.deleted = set()
+            self.meta = None
+            self.snapshot = None
+    
+    def close(self, timeout: Optional[float] = None):
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
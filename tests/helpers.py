@@ -0,0 +1,94 @@
+from typing import Optional
+import json
+import random
+
+from breadtasks_core import Replica, Task, TaskStats, TaskStore, snapshotData
+
+CATEGORIES = ["Work", "Home", "Errands", "Reading"]
+
+def randomDate(rng: random.Random) -> str:
+    return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+
+def buildStore(rng: random.Random, size: int, raw: bool = False) -> TaskStore:
+    taskDicts = [{'id': i, 'text': f"task {i}", 'completed': rng.random() < 0.3, 'createdAt': randomDate(rng),
+                  'category': rng.choice(CATEGORIES), 'lastModified': randomDate(rng)} for i in range(1, size + 1)]
+    store = TaskStore()
+    if raw:
+        store.loadRaw(taskDicts, TaskStore.DEFAULT_CATEGORIES + CATEGORIES, size + 1)
+    else:
+        store.reset([Task(**taskDict) for taskDict in taskDicts], TaskStore.DEFAULT_CATEGORIES + CATEGORIES, size + 1)
+    return store
+
+def buildBoard(rng: random.Random, size: int) -> Replica:
+    return Replica(buildStore(rng, size), "base")
+
+def fork(replica: Replica, replicaId: str) -> Replica:
+    data = json.loads(json.dumps(snapshotData(replica.store, "")))
+    store = TaskStore()
+    store.loadRaw(data['tasks'], data['categories'], data['nextId'])
+    return Replica.fromDict(store, json.loads(json.dumps(replica.toDict())), replicaId)
+
+def mutate(store: TaskStore, rng: random.Random, step: int, prefix: str = "", bulkOps: bool = True):
+    taskIds = list(store.tasksById)
+    categories = [name for name in store.categories if name != "All"]
+    names = [name for name in categories if name != "Uncategorized"]
+    action = rng.random() * (1 if bulkOps else 0.7)
+    if action < 0.25 or not taskIds:
+        store.createTask(f"{prefix}task {step}", rng.choice(categories))
+    elif action < 0.4:
+        store.toggle(rng.choice(taskIds))
+    elif action < 0.5:
+        store.update(store.get(rng.choice(taskIds)), text=f"{prefix}edit {step}")
+    elif action < 0.57:
+        store.update(store.get(rng.choice(taskIds)), category=rng.choice(categories))
+    elif action < 0.62:
+        store.update(store.get(rng.choice(taskIds)), createdAt=randomDate(rng), lastModified=randomDate(rng))
+    elif action < 0.7:
+        store.remove(rng.choice(taskIds))
+    elif action < 0.75:
+        store.removeMany(task.id for task in store.completedTasks(rng.choice(categories + ["All"])))
+    elif action < 0.83:
+        store.updateMany(rng.sample(taskIds, min(len(taskIds), 5)), completed=rng.random() < 0.5)
+    elif action < 0.91:
+        store.addCategory(f"{prefix}list {step}")
+    elif action < 0.97 and names:
+        store.renameCategory(rng.choice(names), f"{prefix}renamed {step}")
+    elif names:
+        store.removeCategory(rng.choice(names))
+
+def stateOf(store: TaskStore, replica: Optional[Replica] = None) -> tuple:
+    keyOf = replica.uidOf if replica is not None else int
+    tasks = tuple(sorted((keyOf(task.id), task.text, task.completed, task.category, task.createdAt, task.lastModified)
+                         for task in store))
+    if replica is not None:
+        return tasks, tuple(sorted(store.categories))
+    return tasks, tuple(store.categories)
+
+def recount(store: TaskStore) -> dict:
+    counts = {'total': 0, 'completed': 0, 'categoryTotals': {}, 'categoryCompleted': {},
+              'createdPerDay': {}, 'completedPerDay': {}}
+    for task in store.tasksById.values():
+        if isinstance(task, dict):
+            task = Task(**task)
+        counts['total'] += 1
+        counts['categoryTotals'][task.category] = counts['categoryTotals'].get(task.category, 0) + 1
+        day = task.createdAt[:10]
+        counts['createdPerDay'][day] = counts['createdPerDay'].get(day, 0) + 1
+        if task.completed:
+            counts['completed'] += 1
+            counts['categoryCompleted'][task.category] = counts['categoryCompleted'].get(task.category, 0) + 1
+            day = task.lastModified[:10]
+            counts['completedPerDay'][day] = counts['completedPerDay'].get(day, 0) + 1
+    return counts
+
+def maintained(stats: TaskStats) -> dict:
+    createdPerDay, completedPerDay = stats.dailyCounts()
+    formatDay = lambda key: f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+    return {
+        'total': stats.total,
+        'completed': stats.completed,
+        'categoryTotals': dict(stats.categoryTotals),
+        'categoryCompleted': dict(stats.categoryCompleted),
+        'createdPerDay': {formatDay(key): count for key, count in createdPerDay.items()},
+        'completedPerDay': {formatDay(key): count for key, count in completedPerDay.items()}
+    }
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+from breadtasks_core import cli
+from breadtasks_core.export import EXPORT_FORMATS
+from breadtasks_core.importer import DEDUPE_MODES
+
+def testParserChoicesMatchModules():
+    assert cli.EXPORT_FORMATS == EXPORT_FORMATS
+    assert cli.DEDUPE_MODES == DEDUPE_MODES
+
+def testImportStaysLight():
+    modules = ["asyncio", "breadtasks_core.sync", "breadtasks_core.replica", "breadtasks_core.export",
+               "breadtasks_core.importer"]
+    code = f"import sys, breadtasks_core.cli; print(sorted(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+def testReadOnlyCommandsCreateNothing(tmp_path, capsys):
+    dataPath = str(tmp_path / "missing" / "breadtasks_data.json")
+    for command in (["list"], ["search", "milk"], ["stats"], ["export"]):
+        assert cli.main(["--file", dataPath, *command]) == 0
+    assert not (tmp_path / "missing").exists()
+
+def testAddThenList(tmp_path, capsys):
+    dataPath = str(tmp_path / "breadtasks_data.json")
+    assert cli.main(["--file", dataPath, "add", "buy milk", "-c", "Home"]) == 0
+    assert cli.main(["--file", dataPath, "add", "write report", "-c", "Work"]) == 0
+    capsys.readouterr()
+    assert cli.main(["--file", dataPath, "list", "-c", "Home"]) == 0
+    output = capsys.readouterr().out
+    assert "buy milk" in output and "write report" not in output
+
+def testExportRejectsBadDates(tmp_path, capsys):
+    dataPath = str(tmp_path / "breadtasks_data.json")
+    assert cli.main(["--file", dataPath, "add", "buy milk"]) == 0
+    capsys.readouterr()
+    assert cli.main(["--file", dataPath, "export", "--from", "2026-13-45"]) == 1
+    captured = capsys.readouterr()
+    assert "not a date" in captured.err and not captured.out
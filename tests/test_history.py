@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from breadtasks_core import History, TaskStats
+from tests.helpers import buildStore, maintained, mutate, recount, stateOf
+
+@pytest.mark.parametrize("seed", range(60))
+def testUndoAndRedoRestoreEachStep(seed):
+    rng = random.Random(seed)
+    store = buildStore(rng, rng.randint(0, 40))
+    stats = TaskStats(store)
+    history = History(store)
+    states = [stateOf(store)]
+    for step in range(rng.randint(1, 30)):
+        mutate(store, rng, step)
+        if len(history.undoStack) == len(states):
+            states.append(stateOf(store))
+    
+    depth = rng.randint(0, len(states) - 1)
+    for index in range(len(states) - 1, len(states) - 1 - depth, -1):
+        assert stateOf(store) == states[index]
+        history.undo()
+    for index in range(len(states) - depth, len(states)):
+        history.redo()
+        assert stateOf(store) == states[index]
+    assert maintained(stats) == recount(store)
+
+def testRenameIsOneStep():
+    store = buildStore(random.Random(1), 20)
+    before = stateOf(store)
+    history = History(store)
+    store.renameCategory("Work", "Office")
+    assert len(history.undoStack) == 1
+    history.undo()
+    assert stateOf(store) == before
+    assert not history.canUndo
+
+def testNewEditClearsRedo():
+    store = buildStore(random.Random(2), 5)
+    history = History(store)
+    store.toggle(1)
+    history.undo()
+    assert history.canRedo
+    store.toggle(2)
+    assert not history.canRedo
+
+def testPausedChangesAreNotRecorded():
+    store = buildStore(random.Random(3), 5)
+    history = History(store)
+    with history.paused():
+        store.toggle(1)
+        store.remove(2)
+    assert not history.canUndo
+    store.toggle(3)
+    history.undo()
+    assert 2 not in store
+    assert store.get(3).completed == buildStore(random.Random(3), 5).get(3).completed
+
+def testHistoryIsBounded():
+    store = buildStore(random.Random(4), 5)
+    history = History(store)
+    for _ in range(History.MAX_ENTRIES + 20):
+        store.toggle(1)
+    assert len(history.undoStack) == History.MAX_ENTRIES
+    while history.canUndo:
+        history.undo()
+    assert history.size == 0
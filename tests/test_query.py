@@ -0,0 +1,27 @@
+import pytest
+
+from breadtasks_core import QueryEngine, Task, TaskStore, parseQuery
+from breadtasks_core.query import DateTerm, TextTerm
+
+def buildStore() -> TaskStore:
+    store = TaskStore()
+    store.reset([Task(id=i, text=f"task {i}", category="Work" if i % 2 else "Home") for i in range(1, 7)],
+                TaskStore.DEFAULT_CATEGORIES + ["Work", "Home"], 7)
+    return store
+
+@pytest.mark.parametrize("query", ["created:9999-12-31", "created:<=9999-12-31", "created:>9999-12-31",
+                                   "modified:<99999999w"])
+def testOutOfRangeDatesFallBackToText(query):
+    plan = parseQuery(query)
+    assert isinstance(plan, TextTerm)
+    assert QueryEngine(buildStore()).search(query) == set()
+
+def testDatesInRangeStillParse():
+    assert isinstance(parseQuery("created:2026-01-01"), DateTerm)
+
+def testCategoryResultsDoNotAliasTheStoreIndex():
+    store = buildStore()
+    results = QueryEngine(store).search("cat:work")
+    assert results == {1, 3, 5}
+    results.clear()
+    assert store.categoryIds["Work"] == {1, 3, 5}
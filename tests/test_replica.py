@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from breadtasks_core import Replica, Task, mergeRemoteRecords
+from tests.helpers import buildBoard, fork, mutate, stateOf
+
+SEEDS = range(40)
+
+def converged(replica: Replica) -> tuple:
+    return stateOf(replica.store, replica)
+
+def merged(target: Replica, *sources: Replica) -> Replica:
+    result = fork(target, "check")
+    for source in sources:
+        result.merge(source.delta(result.seen))
+    return result
+
+def offlineCopies(seed: int) -> list:
+    rng = random.Random(seed)
+    base = buildBoard(rng, rng.randint(0, 30))
+    for step in range(rng.randint(0, 10)):
+        mutate(base.store, rng, step, "base ")
+    replicas = [fork(base, name) for name in "abc"]
+    for replica in replicas:
+        for step in range(rng.randint(0, 25)):
+            mutate(replica.store, rng, step, f"{replica.replicaId} ")
+    return replicas
+
+@pytest.mark.parametrize("seed", SEEDS)
+def testMergeIsCommutative(seed):
+    a, b, _ = offlineCopies(seed)
+    assert converged(merged(a, b)) == converged(merged(b, a))
+
+@pytest.mark.parametrize("seed", SEEDS)
+def testMergeIgnoresDeliveryOrder(seed):
+    a, b, c = offlineCopies(seed)
+    assert converged(merged(a, b, c)) == converged(merged(a, c, b))
+
+@pytest.mark.parametrize("seed", SEEDS)
+def testMergeIsAssociative(seed):
+    a, b, c = offlineCopies(seed)
+    assert converged(merged(merged(a, b), c)) == converged(merged(a, merged(b, c)))
+
+@pytest.mark.parametrize("seed", SEEDS)
+def testMergeIsIdempotent(seed):
+    a, b, _ = offlineCopies(seed)
+    target = merged(a, b)
+    before = converged(target)
+    changed, removed, _ = target.merge(b.delta({}))
+    assert converged(target) == before
+    assert not changed and not removed
+
+@pytest.mark.parametrize("seed", SEEDS)
+def testCopiesConverge(seed):
+    replicas = offlineCopies(seed)
+    rng = random.Random(seed)
+    for _ in range(rng.randint(0, 6)):
+        target, source = rng.sample(replicas, 2)
+        target.merge(source.delta(target.seen))
+    for _ in range(2):
+        for target in replicas:
+            for source in replicas:
+                if source is not target:
+                    target.merge(source.delta(target.seen))
+    assert len({converged(replica) for replica in replicas}) == 1
+
+def testDeleteWinsOverLaterEdit():
+    base = buildBoard(random.Random(0), 3)
+    a = fork(base, "a")
+    b = fork(base, "b")
+    a.store.remove(2)
+    for step in range(5):
+        b.store.update(b.store.get(2), text=f"edited {step}")
+    for target, source in ((a, b), (b, a)):
+        target.merge(source.delta(target.seen))
+        assert 2 not in target.store
+        assert len(target.store) == 2
+
+def testFieldsMergeIndependently():
+    base = buildBoard(random.Random(0), 1)
+    a = fork(base, "a")
+    b = fork(base, "b")
+    a.store.update(a.store.get(1), text="renamed on a")
+    b.store.toggle(1)
+    result = merged(a, b)
+    task = result.store.get(1)
+    assert task.text == "renamed on a"
+    assert task.completed != base.store.get(1).completed
+
+def testNewTaskFollowsRenamedCategory():
+    base = buildBoard(random.Random(0), 0)
+    a = fork(base, "a")
+    b = fork(base, "b")
+    a.store.renameCategory("Work", "Office")
+    task = b.store.createTask("added offline", "Work")
+    result = merged(a, b)
+    [mergedTask] = [item for item in result.store if item.text == task.text]
+    assert mergedTask.category == "Office"
+    assert "Work" not in result.store.categories
+
+def testDeltaOnlyCarriesNewChanges():
+    base = buildBoard(random.Random(0), 50)
+    base.store.update(base.store.get(1), text="before the fork")
+    a = fork(base, "a")
+    b = fork(base, "b")
+    b.store.update(b.store.get(7), text="offline edit")
+    delta = b.delta(a.seen)
+    assert len(delta['tasks']) == 1
+    a.merge(delta)
+    assert a.store.get(7).text == "offline edit"
+
+def testPausedRemoteChangesAreNotStamped():
+    replica = buildBoard(random.Random(0), 3)
+    counter = replica.counter
+    logged = len(replica.log.get("base", []))
+    records = [
+        {'op': "put", 'task': Task(id=9, text="from another process").toDict()},
+        {'op': "patch", 'id': 1, 'fields': {'text': "remote edit"}},
+        {'op': "meta", 'categories': list(replica.store.categories) + ["Remote"]},
+    ]
+    with replica.paused():
+        mergeRemoteRecords(replica.store, records)
+    assert replica.counter == counter
+    assert len(replica.log.get("base", [])) == logged
+    replica.store.addCategory("Local")
+    assert [name for name, register in replica.categories.items() if register[1] == replica.replicaId] == ["Local"]
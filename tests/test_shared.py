@@ -0,0 +1,90 @@
+import multiprocessing
+
+from breadtasks_core import ChangeTracker, JsonStorage, Task, TaskStore, loadStore, mergeRemoteRecords, snapshotData
+from tests.helpers import stateOf
+
+WRITERS = 3
+OPS = 120
+
+def writer(path: str, index: int, barrier, results):
+    storage = JsonStorage(path)
+    storage.COMPACT_THRESHOLD = 8 * 1024
+    store = TaskStore()
+    loadStore(storage, store)
+    tracker = ChangeTracker(store)
+    category = f"Writer {index}"
+    store.addCategory(category)
+    ownTexts = {}
+    toggles = 0
+    
+    def poll(blocking=False):
+        records = storage.pollChanges(blocking)
+        if records:
+            with tracker.paused():
+                mergeRemoteRecords(store, records)
+        return records
+    
+    barrier.wait()
+    for step in range(OPS):
+        if step % 3 == 0 or not ownTexts:
+            task = store.createTask(f"{category} task {step}", category)
+            storage.applyChanges(tracker.records([task]), [],
+                                 {'categories': list(store.categories), 'nextId': store.nextId})
+        elif step % 3 == 1:
+            task = store.get(max(ownTexts))
+            store.update(task, text=f"{category} edited at {step}")
+            storage.applyChanges(tracker.records([task]), [], None)
+        elif index == 0:
+            task = store.toggle(1)
+            toggles += 1
+            storage.applyChanges(tracker.records([task]), [], None)
+        else:
+            task = store.get(1)
+            store.update(task, text=f"shared by {index} at {step}")
+            storage.applyChanges(tracker.records([task]), [], None)
+        if task.category == category:
+            ownTexts[task.id] = task.text
+        if step % 5 == 0:
+            poll()
+        if storage.needsCompaction():
+            storage.compact()
+    
+    barrier.wait()
+    while poll(blocking=True):
+        pass
+    results.put({'index': index, 'ownTexts': ownTexts, 'toggles': toggles, 'state': stateOf(store)})
+    storage.close()
+
+def testConcurrentWritersLoseNoUpdates(tmp_path):
+    path = str(tmp_path / "breadtasks_data.json")
+    seedStore = TaskStore()
+    seedStore.reset([Task(id=1, text="shared")], TaskStore.DEFAULT_CATEGORIES, 2)
+    seedStorage = JsonStorage(path)
+    seedStorage.saveAll(snapshotData(seedStore, "test"))
+    seedStorage.close()
+    
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(WRITERS, timeout=60)
+    results = context.Queue()
+    processes = [context.Process(target=writer, args=(path, index, barrier, results), daemon=True)
+                 for index in range(WRITERS)]
+    for process in processes:
+        process.start()
+    reports = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+    
+    storage = JsonStorage(path)
+    store = TaskStore()
+    loadStore(storage, store)
+    storage.close()
+    
+    for report in reports:
+        for taskId, text in report['ownTexts'].items():
+            assert store.get(taskId).text == text
+        assert report['state'] == stateOf(store)
+    toggles = next(report['toggles'] for report in reports if report['index'] == 0)
+    assert store.get(1).completed == bool(toggles % 2)
+    assert store.get(1).text.startswith("shared by ")
+    assert len(store) == 1 + sum(len(report['ownTexts']) for report in reports)
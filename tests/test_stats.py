@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from breadtasks_core import Task, TaskStats, TaskStore
+from tests.helpers import buildStore, maintained, mutate, recount
+
+@pytest.mark.parametrize("seed", range(20))
+def testMaintainedCountsMatchRecount(seed):
+    rng = random.Random(seed)
+    store = buildStore(rng, rng.randint(0, 50), raw=True)
+    stats = TaskStats(store)
+    for batch in range(30):
+        for step in range(rng.randint(1, 20)):
+            mutate(store, rng, batch * 20 + step)
+        assert maintained(stats) == recount(store)
+
+def testCountsSurviveReset():
+    rng = random.Random(1)
+    store = buildStore(rng, 100, raw=True)
+    stats = TaskStats(store)
+    for step in range(50):
+        mutate(store, rng, step)
+    store.reset([Task(id=1, text="task", category="Home", createdAt="2026-01-02 10:00", completed=True)],
+                TaskStore.DEFAULT_CATEGORIES + ["Home"], 2)
+    assert maintained(stats) == recount(store)
+    assert stats.count("Home") == 1
+    assert stats.completedCount("Home") == 1
+    assert stats.count("Work") == 0
+
+def testDailyCountsFollowEditsAfterFirstUse():
+    rng = random.Random(2)
+    store = buildStore(rng, 30, raw=True)
+    stats = TaskStats(store)
+    stats.dailyCounts()
+    for step in range(200):
+        mutate(store, rng, step)
+    assert maintained(stats) == recount(store)
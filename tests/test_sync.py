@@ -0,0 +1,50 @@
+import pytest
+
+from breadtasks_core import Task, TaskStore
+from breadtasks_core import sync
+from breadtasks_core.sync import SyncServer, checkRecords, checkSnapshot
+
+def buildServer() -> SyncServer:
+    store = TaskStore()
+    store.reset([Task(id=1, text="first", category="Work")], TaskStore.DEFAULT_CATEGORIES + ["Work"], 2)
+    return SyncServer(store)
+
+@pytest.mark.parametrize("record", [
+    {'op': "put", 'task': {'id': 2}},
+    {'op': "put", 'task': {**Task(id=2, text="x").toDict(), 'completed': "yes"}},
+    {'op': "put", 'task': {**Task(id=2, text="x").toDict(), 'id': True}},
+    {'op': "patch", 'id': 1, 'fields': {'text': 3}},
+    {'op': "patch", 'id': "1", 'fields': {'text': "x"}},
+    {'op': "del", 'ids': [1, "2"]},
+    {'op': "meta", 'categories': "Work"},
+    {'op': "meta", 'categories': ["Work", 4]},
+    {'op': "reload", 'data': {'tasks': [{'id': 2}]}},
+])
+def testMalformedRecordsAreRejected(record):
+    valid = {'op': "put", 'task': Task(id=3, text="valid").toDict()}
+    with pytest.raises(ValueError):
+        checkRecords([valid, record])
+
+def testSnapshotsAcceptLegacyTasks():
+    assert checkSnapshot({'tasks': [{'id': 1, 'text': "old", 'priority': "high"}], 'categories': ["All"]})
+    assert not checkSnapshot({'tasks': [], 'categories': None})
+
+def testFailedBatchLeavesTheStoreUntouched(monkeypatch):
+    server = buildServer()
+    before = [task.toDict() for task in server.store], list(server.store.categories), server.store.nextId
+    merge = sync.mergeRemoteRecords
+    
+    def failingMerge(store, records):
+        merge(store, records)
+        raise TypeError("merge failed")
+    
+    monkeypatch.setattr(sync, "mergeRemoteRecords", failingMerge)
+    records = [
+        {'op': "put", 'task': Task(id=5, text="new", category="Home").toDict()},
+        {'op': "patch", 'id': 1, 'fields': {'text': "edited", 'completed': True}},
+        {'op': "meta", 'categories': ["All", "Uncategorized", "Work", "Home"], 'nextId': 6},
+    ]
+    with pytest.raises(TypeError):
+        server.applyRecords(records)
+    assert ([task.toDict() for task in server.store], list(server.store.categories), server.store.nextId) == before
+    assert server.seq == 0 and not server.log
@@ -0,0 +1,39 @@
+from breadtasks_core import SaveWorker, Task, TaskStorage
+
+class FlakyStorage(TaskStorage):
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.tasks = {}
+        self.meta = {}
+    
+    def applyChanges(self, changed, deleted, meta):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        for taskDict in changed:
+            self.tasks.setdefault(taskDict['id'], {}).update(taskDict)
+        for taskId in deleted:
+            self.tasks.pop(taskId, None)
+        self.meta.update(meta or {})
+
+def testFailedWriteOnCloseKeepsTheBatch():
+    storage = FlakyStorage(failures=1)
+    worker = SaveWorker(storage)
+    worker.submit([Task(id=1, text="last edit").toDict()], meta={'nextId': 2})
+    worker.close()
+    assert worker.hasPending()
+    assert isinstance(worker.lastError, OSError)
+    assert not storage.tasks
+    
+    worker.writePending()
+    assert not worker.hasPending()
+    assert storage.tasks[1]['text'] == "last edit"
+    assert storage.meta == {'nextId': 2}
+
+def testCloseWritesEverythingQueued():
+    storage = FlakyStorage(failures=0)
+    worker = SaveWorker(storage)
+    worker.submit([Task(id=taskId, text=f"task {taskId}").toDict() for taskId in range(1, 4)], [2])
+    worker.close()
+    assert not worker.hasPending()
+    assert sorted(storage.tasks) == [1, 3]